@@ -0,0 +1,192 @@
+# batch_localizer.py
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from delta import carry_over
+from file_contents import FileContents
+from mod_scanner import list_mods, scan_mod
+from pair_matching import exact_pair_updates, fuzzy_pair_updates
+from pairs_parser import load_pairs_file
+from parse_cache import ParseCache, load_records
+from translation_memory import TranslationMemory, MEMORY_FILE_NAME
+from xml_writer import russian_output_path, write_translated_file
+
+
+class BatchOptions:
+    """Настройки пакетной локализации (передаются в процессы-обработчики)."""
+
+    def __init__(self, main_folder: str, use_levenshtein: bool = False,
+                 max_distance: int = 3, use_memory: bool = True,
+                 use_parse_cache: bool = True, dry_run: bool = False,
+                 carry_over: bool = True):
+        self.main_folder = main_folder
+        self.use_levenshtein = use_levenshtein
+        self.max_distance = max_distance
+        self.use_memory = use_memory
+        self.use_parse_cache = use_parse_cache
+        self.dry_run = dry_run
+        # Переносить переводы неизменённых записей из существующего russian.xml
+        self.carry_over = carry_over
+
+
+def load_pairs_files(paths: List[str]) -> Dict[str, str]:
+    """
+    Читает файлы пар `Оригинал|Перевод` (или CSV/TSV) потоково, без
+    загрузки текста целиком; более поздние файлы важнее.
+    """
+    pairs = {}
+    for path in paths:
+        load_pairs_file(path, pairs=pairs)
+    return pairs
+
+
+# ---------- Обработчик одного мода (выполняется в дочернем процессе) ----------
+_worker_pairs: Dict[str, str] = {}
+_worker_options: Optional[BatchOptions] = None
+_worker_parse_cache: Optional[ParseCache] = None
+_worker_memory: Optional[TranslationMemory] = None
+
+
+def _init_worker(pairs: Dict[str, str], options: BatchOptions):
+    """Пары и настройки передаются процессу один раз, а не с каждым модом."""
+    global _worker_pairs, _worker_options, _worker_parse_cache, _worker_memory
+    _worker_pairs = pairs
+    _worker_options = options
+    if options.use_parse_cache:
+        try:
+            _worker_parse_cache = ParseCache.for_main_folder(options.main_folder)
+        except Exception:
+            _worker_parse_cache = None
+    if options.use_memory and os.path.exists(os.path.join(options.main_folder, MEMORY_FILE_NAME)):
+        try:
+            _worker_memory = TranslationMemory.for_main_folder(options.main_folder)
+        except Exception:
+            _worker_memory = None
+
+
+def localize_mod(mod_path: str) -> dict:
+    """
+    Локализует один мод: english.xml → перенос из прежнего russian.xml →
+    пары (точно и, по желанию, нечётко) → память переводов → russian.xml.
+    Возвращает сводку для отчёта.
+    """
+    started = time.perf_counter()
+    options = _worker_options
+    summary = {
+        "mod": os.path.basename(mod_path),
+        "status": "ok",
+        "source": None,
+        "output": None,
+        "strings": 0,
+        "translated": 0,
+        "from_pairs": 0,
+        "from_levenshtein": 0,
+        "from_memory": 0,
+        "carried_over": 0,
+        "pending": 0,
+        "error": None,
+    }
+    try:
+        manifest = scan_mod(mod_path)
+        if manifest.english is None:
+            summary["status"] = "skipped"
+            summary["error"] = "english.xml не найден"
+            return summary
+
+        source = manifest.english.path
+        contents = FileContents(source, load_records(source, _worker_parse_cache))
+        summary["source"] = source
+        summary["strings"] = len(contents)
+
+        if options.carry_over:
+            delta = carry_over(contents, _worker_parse_cache)
+            if delta is not None:
+                summary["carried_over"] = len(delta.carried)
+
+        exact = exact_pair_updates(contents, _worker_pairs)
+        contents.set_translations(exact)
+        summary["from_pairs"] = len(exact)
+
+        if options.use_levenshtein and _worker_pairs:
+            fuzzy = fuzzy_pair_updates(contents, _worker_pairs, options.max_distance)
+            contents.set_translations(fuzzy)
+            summary["from_levenshtein"] = len(fuzzy)
+
+        if _worker_memory is not None:
+            missing = {i: orig for i, (orig, trans) in enumerate(contents) if orig and not trans.strip()}
+            known = _worker_memory.lookup_many(missing.values())
+            for row, orig in missing.items():
+                if orig in known:
+                    contents.set_translation(row, known[orig])
+                    summary["from_memory"] += 1
+
+        translations = contents.translations_by_key()
+        summary["translated"] = len(translations)
+        summary["pending"] = sum(1 for orig, trans in contents if orig and not trans.strip())
+        output = russian_output_path(source)
+        summary["output"] = output
+        if not options.dry_run:
+            write_translated_file(source, output, translations)
+    except Exception as e:
+        summary["status"] = "error"
+        summary["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        summary["elapsed"] = round(time.perf_counter() - started, 4)
+    return summary
+
+
+# ---------- Запуск по всему UnpackedMods ----------
+def localize_all(options: BatchOptions, pairs: Dict[str, str], workers: int = None,
+                 mod_names: List[str] = None, on_mod_done=None) -> dict:
+    """
+    Локализует все (или перечисленные) моды в ProcessPoolExecutor
+    и возвращает отчёт: сводки по модам и итоги.
+    """
+    started = time.perf_counter()
+    unpacked_mods_path = os.path.join(options.main_folder, "UnpackedMods")
+    names = list_mods(unpacked_mods_path)
+    if mod_names:
+        wanted = set(mod_names)
+        names = [n for n in names if n in wanted]
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(pairs, options)) as pool:
+        futures = [pool.submit(localize_mod, os.path.join(unpacked_mods_path, n)) for n in names]
+        for future in as_completed(futures):
+            summary = future.result()
+            results.append(summary)
+            if on_mod_done is not None:
+                on_mod_done(summary)
+
+    results.sort(key=lambda r: r["mod"])
+    totals = {
+        "mods": len(results),
+        "ok": sum(r["status"] == "ok" for r in results),
+        "skipped": sum(r["status"] == "skipped" for r in results),
+        "errors": sum(r["status"] == "error" for r in results),
+        "strings": sum(r["strings"] for r in results),
+        "translated": sum(r["translated"] for r in results),
+        "carried_over": sum(r["carried_over"] for r in results),
+        "pending": sum(r["pending"] for r in results),
+    }
+    elapsed = time.perf_counter() - started
+    return {
+        "main_folder": options.main_folder,
+        "workers": workers,
+        "dry_run": options.dry_run,
+        "elapsed": round(elapsed, 3),
+        "strings_per_second": round(totals["strings"] / elapsed, 1) if elapsed > 0 else 0.0,
+        "totals": totals,
+        "mods": results,
+    }
+
+
+def write_report(report: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
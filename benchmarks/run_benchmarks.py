@@ -0,0 +1,281 @@
+# benchmarks/run_benchmarks.py
+#
+# Запуск из корня репозитория:
+#     python -m benchmarks.run_benchmarks --mods 50 --strings 5000
+#     python -m benchmarks.run_benchmarks --save-baseline
+#     python -m benchmarks.run_benchmarks --threshold 0.25   # сравнение с базой
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.synthetic_mods import SyntheticConfig, generate_pairs_text, generate_unpacked_mods
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _english_files(root: str) -> list:
+    from mod_scanner import scan_unpacked_mods
+    scan = scan_unpacked_mods(os.path.join(root, "UnpackedMods"))
+    return [m.english.path for m in scan.mods if m.english]
+
+
+def _peak_rss_bytes():
+    """Пиковый RSS процесса (Unix); на Windows модуля resource нет."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт килобайты, macOS — байты
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ---------- Этапы ----------
+# Каждый этап готовит данные (не входит в замер) и возвращает
+# (функция для замера, число единиц работы, название единиц).
+
+def stage_scan(root: str):
+    from mod_scanner import scan_unpacked_mods
+    unpacked = os.path.join(root, "UnpackedMods")
+    mods = len(os.listdir(unpacked))
+    return (lambda: scan_unpacked_mods(unpacked)), mods, "mods"
+
+
+def stage_quick_index(root: str):
+    from mod_scanner import scan_unpacked_mods
+    from quick_index import quick_index_mods
+    scan = scan_unpacked_mods(os.path.join(root, "UnpackedMods"))
+    return (lambda: quick_index_mods(scan.mods)), scan.stats.bytes_found, "bytes"
+
+
+def stage_extract(root: str):
+    from xml_extractor import iter_contents
+    files = _english_files(root)
+
+    def run():
+        count = 0
+        for path in files:
+            for _ in iter_contents(path):
+                count += 1
+        return count
+    return run, sum(os.path.getsize(p) for p in files), "bytes"
+
+
+def stage_import_pairs(root: str):
+    from file_contents import FileContents
+    from pair_matching import exact_pair_updates
+    from pairs_parser import parse_translation_pairs
+    from xml_extractor import iter_contents
+
+    path = _english_files(root)[0]
+    contents = FileContents(path, iter_contents(path))
+    text = generate_pairs_text(contents.originals, typo_fraction=0.0)
+
+    def run():
+        return exact_pair_updates(contents, parse_translation_pairs(text))
+    return run, len(contents), "rows"
+
+
+def stage_levenshtein(root: str):
+    from file_contents import FileContents
+    from pair_matching import fuzzy_pair_updates
+    from xml_extractor import iter_contents
+
+    path = _english_files(root)[0]
+    contents = FileContents(path, iter_contents(path))
+    pairs = {}
+    for line in generate_pairs_text(contents.originals, typo_fraction=1.0).split("\n"):
+        if "|" in line:
+            original, translation = line.split("|", 1)
+            pairs[original] = translation
+    return (lambda: fuzzy_pair_updates(contents, pairs)), len(pairs), "pairs"
+
+
+def stage_save(root: str):
+    from file_contents import FileContents
+    from xml_extractor import iter_contents
+    from xml_writer import write_translated_xml
+
+    files = _english_files(root)
+    jobs = []
+    for path in files:
+        contents = FileContents(path, iter_contents(path))
+        contents.set_translations({i: f"Перевод {i}" for i in range(len(contents))})
+        output = os.path.join(os.path.dirname(path), "..", "BenchOutput", "russian.xml")
+        jobs.append((path, output, contents.translations_by_key()))
+
+    def run():
+        for path, output, translations in jobs:
+            write_translated_xml(path, output, translations)
+    return run, sum(os.path.getsize(p) for p in files), "bytes"
+
+
+def stage_auto_translate(root: str):
+    from file_contents import FileContents
+    from translation_engine import FakeTranslateBackend, TranslationEngine
+    from xml_extractor import iter_contents
+
+    path = _english_files(root)[0]
+    contents = FileContents(path, iter_contents(path))
+    segments = [(i, orig) for i, orig in enumerate(contents.originals) if orig]
+    engine = TranslationEngine(FakeTranslateBackend(request_latency=0.02), max_concurrency=8)
+    return (lambda: engine.run(segments, lambda results: None)), len(segments), "segments"
+
+
+def stage_suggest(root: str):
+    from suggestion_service import SuggestionService
+    from xml_extractor import iter_contents
+
+    service = SuggestionService()
+    originals = []
+    for path in _english_files(root):
+        texts = [r.text for r in iter_contents(path) if r.text]
+        service.add_pairs((text, f"Перевод {i}") for i, text in enumerate(texts))
+        originals.extend(texts)
+    # Запросы — оригиналы с переставленными словами: точных совпадений нет
+    queries = [" ".join(reversed(text.split())) for text in originals[::max(1, len(originals) // 500)]]
+
+    def run():
+        for query in queries:
+            service.suggest(query)
+    return run, len(queries), "queries"
+
+
+STAGES = {
+    "scan": stage_scan,
+    "quick_index": stage_quick_index,
+    "extract": stage_extract,
+    "import_pairs": stage_import_pairs,
+    "levenshtein": stage_levenshtein,
+    "save": stage_save,
+    "auto_translate": stage_auto_translate,
+    "suggest": stage_suggest,
+}
+
+
+def run_stage(name: str, root: str, repeat: int) -> dict:
+    """Выполняется в отдельном процессе, чтобы пиковая память этапа была честной."""
+    run, units, unit_name = STAGES[name](root)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    best = min(times)
+    return {
+        "stage": name,
+        "wall_time": round(best, 4),
+        "throughput": round(units / best, 1) if best > 0 else None,
+        "unit": f"{unit_name}/s",
+        "units": units,
+        "peak_rss": _peak_rss_bytes(),
+    }
+
+
+def compare_with_baseline(results: list, baseline: dict, threshold: float) -> list:
+    """Этапы, время которых выросло больше чем на threshold относительно базы."""
+    regressions = []
+    base_by_stage = {r["stage"]: r for r in baseline.get("results", [])}
+    for result in results:
+        base = base_by_stage.get(result["stage"])
+        if "error" in result or not base or not base.get("wall_time"):
+            continue
+        ratio = result["wall_time"] / base["wall_time"]
+        result["vs_baseline"] = round(ratio, 3)
+        if ratio > 1 + threshold:
+            regressions.append(result["stage"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки этапов локализатора на синтетических модах.")
+    parser.add_argument("--mods", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--strings", type=int, default=2000, help="Строк в english.xml")
+    parser.add_argument("--length-mean", type=int, default=80)
+    parser.add_argument("--length-sigma", type=float, default=0.6)
+    parser.add_argument("--markup-density", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help="Этапы через запятую: " + ", ".join(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Повторов на этап (берётся лучший)")
+    parser.add_argument("--workdir", help="Где создать синтетический UnpackedMods (по умолчанию — temp)")
+    parser.add_argument("--keep", action="store_true", help="Не удалять сгенерированные файлы")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Допустимое замедление относительно базы (0.2 = 20%%)")
+    parser.add_argument("--output", help="Сохранить результаты в JSON")
+    args = parser.parse_args()
+
+    config = SyntheticConfig(
+        mods=args.mods, depth=args.depth, strings_per_file=args.strings,
+        length_mean=args.length_mean, length_sigma=args.length_sigma,
+        markup_density=args.markup_density, seed=args.seed,
+    )
+    root = args.workdir or tempfile.mkdtemp(prefix="bg3loc-bench-")
+    try:
+        started = time.perf_counter()
+        summary = generate_unpacked_mods(root, config)
+        print(f"Сгенерировано: {summary['mods']} модов, {summary['files']} XML, "
+              f"{summary['strings']} строк, {summary['bytes'] / 1048576:.1f} МБ "
+              f"за {time.perf_counter() - started:.1f} с")
+
+        results = []
+        for name in [s.strip() for s in args.stages.split(",") if s.strip()]:
+            # Упавший этап не прерывает остальные: он попадает в отчёт с ошибкой
+            try:
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    result = pool.submit(run_stage, name, root, args.repeat).result()
+            except Exception as e:
+                result = {"stage": name, "error": f"{type(e).__name__}: {e}"}
+            results.append(result)
+            if "error" in result:
+                print(f"{name:>15}: ошибка — {result['error']}")
+                continue
+            rss = f"{result['peak_rss'] / 1048576:.0f} МБ" if result["peak_rss"] else "н/д"
+            print(f"{name:>15}: {result['wall_time']:8.3f} с  "
+                  f"{result['throughput']:>12} {result['unit']:<12} пик RSS {rss}")
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {"config": config.as_dict(), "results": results}
+    failed = [r["stage"] for r in results if "error" in r]
+    exit_code = 0
+    if failed:
+        print(f"Этапы с ошибкой: {', '.join(failed)}")
+        exit_code = 1
+    if args.save_baseline and failed:
+        print("База не сохранена: не все этапы выполнены.")
+    elif args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"База сохранена: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config.as_dict():
+            print("Внимание: параметры генерации отличаются от базовых, сравнение неточное.")
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        for result in results:
+            if "vs_baseline" in result:
+                print(f"{result['stage']:>15}: ×{result['vs_baseline']} от базы")
+        if regressions:
+            print(f"Замедление больше {args.threshold:.0%}: {', '.join(regressions)}")
+            exit_code = 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
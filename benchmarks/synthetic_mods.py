@@ -0,0 +1,134 @@
+# benchmarks/synthetic_mods.py
+
+import os
+import random
+from xml.sax.saxutils import escape
+
+# Словарь для псевдотекста в духе описаний BG3
+WORDS = (
+    "attack bonus action spell slot target creature saving throw damage "
+    "radiant necrotic fire cold lightning thunder poison psychic force "
+    "advantage disadvantage concentration ritual cantrip weapon armour shield "
+    "strength dexterity constitution intelligence wisdom charisma turn round "
+    "proficiency resistance vulnerable immune condition prone blinded charmed "
+    "frightened paralysed restrained stunned unconscious the a of to and on with"
+).split()
+
+ASSET_DIRS = ("Public", "Generated", "Mods", "Assets")
+
+
+class SyntheticConfig:
+    """Параметры синтетического UnpackedMods."""
+
+    def __init__(self, mods: int = 20, depth: int = 4, strings_per_file: int = 2000,
+                 length_mean: int = 80, length_sigma: float = 0.6,
+                 markup_density: float = 0.2, assets_per_dir: int = 5,
+                 russian_fraction: float = 0.5, seed: int = 0):
+        self.mods = mods
+        # Глубина дерева ассетов вне Localization (нагружает обход)
+        self.depth = depth
+        self.strings_per_file = strings_per_file
+        # Длина строк — логнормальное распределение вокруг length_mean символов
+        self.length_mean = length_mean
+        self.length_sigma = length_sigma
+        # Доля строк с разметкой <LSTag> (в файле она хранится экранированной)
+        self.markup_density = markup_density
+        self.assets_per_dir = assets_per_dir
+        # Доля модов, у которых уже есть Localization/Russian/russian.xml
+        self.russian_fraction = russian_fraction
+        self.seed = seed
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def _sentence(rng: random.Random, config: SyntheticConfig) -> str:
+    target = max(3, int(rng.lognormvariate(0, config.length_sigma) * config.length_mean))
+    words = []
+    length = 0
+    while length < target:
+        word = rng.choice(WORDS)
+        if rng.random() < config.markup_density / 4:
+            word = f'<LSTag Tooltip="{word.capitalize()}">{word}</LSTag>'
+        words.append(word)
+        length += len(word) + 1
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + "."
+
+
+def _content_uid(rng: random.Random) -> str:
+    return "h" + "".join(rng.choice("0123456789abcdef") for _ in range(8)) + \
+        "g" + "".join(rng.choice("0123456789abcdef") for _ in range(27))
+
+
+def write_localization_xml(path: str, entries) -> int:
+    """Пишет XML в формате BG3 (contentList/content); возвращает размер в байтах."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<contentList>\n')
+        for uid, version, text in entries:
+            f.write(f'  <content contentuid="{uid}" version="{version}">{escape(text)}</content>\n')
+        f.write("</contentList>\n")
+    return os.path.getsize(path)
+
+
+def _write_assets(rng: random.Random, directory: str, depth: int, config: SyntheticConfig):
+    if depth <= 0:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for i in range(config.assets_per_dir):
+        with open(os.path.join(directory, f"asset_{i}.lsf"), "wb") as f:
+            f.write(rng.randbytes(64))
+    _write_assets(rng, os.path.join(directory, f"Level{depth}"), depth - 1, config)
+
+
+def generate_unpacked_mods(root: str, config: SyntheticConfig) -> dict:
+    """
+    Создаёт root/UnpackedMods с config.mods модами: english.xml,
+    при необходимости russian.xml и дерево ассетов глубины config.depth.
+    Возвращает сводку: число файлов, строк и байт.
+    """
+    rng = random.Random(config.seed)
+    unpacked = os.path.join(root, "UnpackedMods")
+    summary = {"mods": config.mods, "files": 0, "strings": 0, "bytes": 0}
+
+    for m in range(config.mods):
+        mod_path = os.path.join(unpacked, f"SyntheticMod{m:04d}")
+        entries = [
+            (_content_uid(rng), str(rng.randint(1, 3)), _sentence(rng, config))
+            for _ in range(config.strings_per_file)
+        ]
+        english = os.path.join(mod_path, "Localization", "English", "english.xml")
+        summary["bytes"] += write_localization_xml(english, entries)
+        summary["files"] += 1
+        summary["strings"] += len(entries)
+
+        if rng.random() < config.russian_fraction:
+            translated = [(uid, version, f"Перевод: {text}") for uid, version, text in entries]
+            russian = os.path.join(mod_path, "Localization", "Russian", "russian.xml")
+            summary["bytes"] += write_localization_xml(russian, translated)
+            summary["files"] += 1
+
+        for asset_dir in ASSET_DIRS:
+            _write_assets(rng, os.path.join(mod_path, asset_dir, f"SyntheticMod{m:04d}"),
+                          config.depth, config)
+    return summary
+
+
+def generate_pairs_text(originals, fraction: float = 0.5, typo_fraction: float = 0.3,
+                        seed: int = 0) -> str:
+    """
+    Текст пар `Оригинал|Перевод` для части строк; в typo_fraction
+    из них оригинал искажён опечаткой (для сопоставления по Левенштейну).
+    """
+    rng = random.Random(seed)
+    lines = []
+    for original in originals:
+        if not original or rng.random() >= fraction:
+            continue
+        source = original
+        if rng.random() < typo_fraction and len(source) > 4:
+            i = rng.randrange(len(source))
+            source = source[:i] + rng.choice("abcdefghij") + source[i + 1:]
+        lines.append(f"{source}|Перевод {len(lines)}")
+    return "\n".join(lines)
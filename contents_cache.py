@@ -0,0 +1,113 @@
+# contents_cache.py
+
+from collections import OrderedDict
+
+from file_contents import FileContents
+
+# Грубая оценка накладных расходов FileContents на одну строку: указатели
+# в параллельных списках originals/uids/versions и заголовки str оригинала
+# и contentuid.
+ROW_OVERHEAD_BYTES = 125
+# На каждый перевод: запись словаря translations, ключ int и заголовок str
+TRANSLATION_OVERHEAD_BYTES = 110
+
+
+def estimate_size(contents: FileContents) -> int:
+    """
+    Приблизительный объём памяти, занимаемый содержимым файла. Оригиналы
+    интернированы и могут делиться между файлами, поэтому оценка сверху.
+    """
+    total = ROW_OVERHEAD_BYTES * len(contents)
+    total += sum(map(len, contents.originals))
+    total += sum(len(uid) for uid in contents.uids if uid)
+    # Кириллица в str занимает 2 байта на символ
+    total += sum(TRANSLATION_OVERHEAD_BYTES + 2 * len(trans) for trans in contents.translations.values())
+    return total
+
+
+class ContentsCache:
+    """
+    LRU-кэш разобранного содержимого файлов локализации (путь → FileContents).
+    Ограничен числом записей и суммарным объёмом; закреплённые (pinned)
+    записи с несохранёнными правками никогда не вытесняются.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (contents, size)
+        self._pinned = set()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str):
+        entry = self._entries.get(path)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(path)
+        return entry[0]
+
+    def put(self, path: str, contents):
+        self.discard(path, force=True)
+        size = estimate_size(contents)
+        self._entries[path] = (contents, size)
+        self.total_bytes += size
+        self._evict()
+
+    def update_size(self, path: str):
+        """Пересчитывает объём записи после правок на месте."""
+        entry = self._entries.get(path)
+        if entry is None:
+            return
+        size = estimate_size(entry[0])
+        self.total_bytes += size - entry[1]
+        self._entries[path] = (entry[0], size)
+        self._evict()
+
+    def discard(self, path: str, force: bool = False):
+        if path in self._pinned and not force:
+            return
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+        self._pinned.discard(path)
+
+    def clear(self):
+        self._entries.clear()
+        self._pinned.clear()
+        self.total_bytes = 0
+
+    # ---------- Закрепление записей с несохранёнными правками ----------
+    def pin(self, path: str):
+        if path in self._entries:
+            self._pinned.add(path)
+
+    def unpin(self, path: str):
+        self._pinned.discard(path)
+        self._evict()
+
+    def is_pinned(self, path: str) -> bool:
+        return path in self._pinned
+
+    def _evict(self):
+        """Вытесняет самые давние незакреплённые записи сверх бюджета."""
+        if len(self._entries) <= self.max_entries and self.total_bytes <= self.max_bytes:
+            return
+        newest = next(reversed(self._entries))
+        for path in list(self._entries):
+            if len(self._entries) <= self.max_entries and self.total_bytes <= self.max_bytes:
+                break
+            # Самую свежую запись не трогаем, даже если она одна больше бюджета
+            if path in self._pinned or path == newest:
+                continue
+            contents, size = self._entries.pop(path)
+            self.total_bytes -= size
@@ -0,0 +1,131 @@
+# delta.py
+
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from file_contents import FileContents
+from parse_cache import ParseCache, load_records
+from xml_writer import russian_output_path
+
+
+class DeltaResult:
+    """
+    Сравнение нового исходного файла с уже существующим russian.xml
+    по ключу contentuid и атрибуту version. Номера строк — строки
+    исходного файла.
+    """
+
+    def __init__(self):
+        # Запись не менялась — перевод переносится как есть
+        self.carried: Dict[int, str] = {}
+        # Версия поднялась: {строка: прежний перевод или ""}
+        self.changed: Dict[int, str] = {}
+        # Ключа ещё нет в russian.xml
+        self.new: List[int] = []
+        # Запись есть, но так и не была переведена (текст совпадает с оригиналом)
+        self.untranslated: List[int] = []
+        # Ключи, которых в новом исходнике уже нет
+        self.removed: List[str] = []
+
+    @property
+    def pending(self) -> List[int]:
+        """Строки, которые нужно перевести заново."""
+        return sorted(self.new + self.untranslated + list(self.changed))
+
+    @property
+    def structure_changed(self) -> bool:
+        """russian.xml разошёлся с исходником: точечного патча недостаточно."""
+        return bool(self.new or self.changed or self.removed)
+
+    def summary(self) -> str:
+        return (
+            f"перенесено {len(self.carried)}, новых {len(self.new)}, "
+            f"изменённых {len(self.changed)}, без перевода {len(self.untranslated)}, "
+            f"удалённых {len(self.removed)}"
+        )
+
+
+def is_translation(source_text: str, target_text: str) -> bool:
+    """
+    Похож ли текст russian.xml на перевод, а не на оставшийся оригинал.
+    Незаполненные строки при сохранении получают английский текст,
+    поэтому переводом считается любой непустой текст, отличный от исходника:
+    имена, числа, плейсхолдеры вроде [1] и строки из одной разметки
+    законно остаются без кириллицы.
+    """
+    target = target_text.strip()
+    return bool(target) and target != source_text.strip()
+
+
+def iter_translated_rows(source_records, russian_records) -> Iterator[Tuple[int, str, str]]:
+    """
+    Строки исходного файла, у которых в russian.xml есть настоящий перевод:
+    (строка, оригинал, перевод). Записи сопоставляются по contentuid (без
+    него — по позиции, как при записи); version не сравнивается.
+    """
+    existing = {}
+    for index, record in enumerate(russian_records):
+        existing[record.contentuid or f"#{index}"] = record.text or ""
+    for row, record in enumerate(source_records):
+        original = record.text or ""
+        target = existing.get(record.contentuid or f"#{row}")
+        if target and is_translation(original, target):
+            yield row, original, target
+
+
+def compute_delta(source: FileContents, russian_records) -> DeltaResult:
+    """
+    Сопоставляет строки исходного файла с записями russian.xml.
+    Перевод переносится, только если совпали contentuid и version;
+    строки без contentuid сопоставляются по позиции (как при записи).
+    Правка английского текста без смены version не распознаётся: текст,
+    отличный от нового оригинала, считается переводом.
+    """
+    result = DeltaResult()
+    existing = {}
+    for index, record in enumerate(russian_records):
+        key = record.contentuid if record.contentuid else f"#{index}"
+        existing[key] = record
+
+    for row in range(len(source)):
+        key = source.key(row)
+        record = existing.pop(key, None)
+        if record is None:
+            result.new.append(row)
+            continue
+        original = source.original(row)
+        target = record.text or ""
+        if record.version != source.versions[row]:
+            # Прежний перевод (если был) остаётся подсказкой; version в файле надо обновить
+            result.changed[row] = target if is_translation(original, target) else ""
+        elif is_translation(original, target):
+            result.carried[row] = target
+        else:
+            result.untranslated.append(row)
+    result.removed = list(existing)
+    return result
+
+
+def apply_delta(source: FileContents, delta: DeltaResult):
+    """
+    Заполняет пустые переводы перенесёнными из russian.xml. Строки не
+    помечаются изменёнными: эти переводы уже лежат в файле.
+    """
+    source.set_translations({
+        row: text for row, text in delta.carried.items() if not source.translation(row).strip()
+    })
+    source.previous = {row: text for row, text in delta.changed.items() if text}
+    source.needs_full_write = delta.structure_changed
+
+
+def carry_over(source: FileContents, parse_cache: Optional[ParseCache] = None) -> Optional[DeltaResult]:
+    """
+    Переносит переводы из существующего russian.xml для исходного файла.
+    Возвращает DeltaResult или None, если переносить не из чего.
+    """
+    output = russian_output_path(source.path)
+    if output == os.path.normpath(source.path) or not os.path.exists(output):
+        return None
+    delta = compute_delta(source, load_records(output, parse_cache))
+    apply_delta(source, delta)
+    return delta
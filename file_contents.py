@@ -0,0 +1,158 @@
+# file_contents.py
+
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def content_key(contentuid: Optional[str], index: int) -> str:
+    """
+    Ключ записи <content>: её contentuid, а для записей без него —
+    позиция в файле ("#12"). Одинаково считается при чтении и записи.
+    """
+    return contentuid if contentuid else f"#{index}"
+
+
+def _intern(text: Optional[str]) -> Optional[str]:
+    return sys.intern(text) if text else text
+
+
+class RowView:
+    """
+    Строка таблицы в старом виде [оригинал, перевод]: row[0], row[1],
+    row[1] = текст, распаковка `orig, trans = row`. Ничего не хранит сама.
+    """
+    __slots__ = ("_contents", "_row")
+
+    def __init__(self, contents: "FileContents", row: int):
+        self._contents = contents
+        self._row = row
+
+    def __len__(self) -> int:
+        return 2
+
+    def __iter__(self):
+        yield self._contents.originals[self._row]
+        yield self._contents.translation(self._row)
+
+    def __getitem__(self, column):
+        if isinstance(column, slice):
+            return list(self)[column]
+        if column in (0, -2):
+            return self._contents.originals[self._row]
+        if column in (1, -1):
+            return self._contents.translation(self._row)
+        raise IndexError(column)
+
+    def __setitem__(self, column, value: str):
+        if column not in (1, -1):
+            raise TypeError("Оригинал строки только для чтения")
+        self._contents.set_translation(self._row, value)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class FileContents:
+    """
+    Строки одного файла локализации. Хранится компактно: параллельные
+    списки оригиналов (интернированных — одинаковые строки разных модов
+    занимают память один раз), contentuid и version, а переводы — только
+    для строк, где они есть ({номер строки: перевод}).
+
+    Снаружи по-прежнему выглядит как список [orig, trans]: contents[row]
+    возвращает RowView, итерация даёт кортежи (orig, trans).
+    """
+
+    def __init__(self, path: str, records: Iterable = ()):
+        self.path = path
+        self.originals: List[str] = []
+        self.uids: List[Optional[str]] = []
+        self.versions: List[Optional[str]] = []
+        for record in records:
+            self.originals.append(_intern(record.text))
+            self.uids.append(record.contentuid)
+            self.versions.append(_intern(record.version))
+        self.translations: Dict[int, str] = {}
+        self.dirty = set()
+        # Прежние переводы строк, изменившихся в новой версии исходника (см. delta.py)
+        self.previous: Dict[int, str] = {}
+        # russian.xml разошёлся с исходником по составу/версиям записей:
+        # следующее сохранение переписывает его целиком, а не патчит
+        self.needs_full_write = False
+        # Исходный файл изменился на диске, пока здесь были несохранённые правки:
+        # строки таблицы относятся к прежней версии
+        self.source_changed = False
+        self._row_by_key = None
+
+    # ---------- Интерфейс списка ----------
+    def __len__(self) -> int:
+        return len(self.originals)
+
+    def __getitem__(self, row: int) -> RowView:
+        if row < 0:
+            row += len(self.originals)
+        if not 0 <= row < len(self.originals):
+            raise IndexError(row)
+        return RowView(self, row)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        get = self.translations.get
+        for i, orig in enumerate(self.originals):
+            yield orig, get(i, "")
+
+    # ---------- Доступ к ячейкам ----------
+    def original(self, row: int) -> str:
+        return self.originals[row]
+
+    def translation(self, row: int) -> str:
+        return self.translations.get(row, "")
+
+    def set_translation(self, row: int, text: str):
+        if text:
+            self.translations[row] = text
+        else:
+            self.translations.pop(row, None)
+
+    def set_translations(self, updates: Dict[int, str]):
+        for row, text in updates.items():
+            self.set_translation(row, text)
+
+    # ---------- Ключи contentuid ----------
+    def key(self, row: int) -> str:
+        return content_key(self.uids[row], row)
+
+    def row_for_key(self, key: str) -> Optional[int]:
+        if self._row_by_key is None:
+            self._row_by_key = {self.key(i): i for i in range(len(self.originals))}
+        return self._row_by_key.get(key)
+
+    # ---------- Отслеживание изменений ----------
+    def mark_dirty(self, rows: Iterable[int]):
+        self.dirty.update(rows)
+
+    def clear_dirty(self):
+        self.dirty.clear()
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.dirty)
+
+    def translations_by_key(self) -> Dict[str, str]:
+        """Все непустые переводы файла: {ключ: перевод}."""
+        return {self.key(i): trans for i, trans in sorted(self.translations.items()) if trans.strip()}
+
+    def dirty_updates(self) -> Dict[str, str]:
+        """
+        Правки с последнего сохранения: {ключ: текст для записи}.
+        Очищенный перевод возвращает строке оригинальный текст.
+        """
+        updates = {}
+        for row in sorted(self.dirty):
+            trans = self.translation(row)
+            text = trans if trans.strip() else self.originals[row]
+            if text:
+                updates[self.key(row)] = text
+        return updates
@@ -0,0 +1,147 @@
+# fuzzy_index.py
+
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from tracing import span
+
+# Порог по умолчанию, как в исходном сопоставлении по Левенштейну
+DEFAULT_MAX_DISTANCE = 3
+
+# python-Levenshtein импортируется при первом сопоставлении, а не при старте
+_lev_distance = None
+
+
+def _distance_function():
+    global _lev_distance
+    if _lev_distance is None:
+        from Levenshtein import distance
+        _lev_distance = distance
+    return _lev_distance
+
+
+def _bounded_distance(a: str, b: str, max_distance: int) -> int:
+    """Расстояние Левенштейна с отсечкой (если версия библиотеки её умеет)."""
+    lev_distance = _distance_function()
+    try:
+        return lev_distance(a, b, score_cutoff=max_distance)
+    except TypeError:
+        return lev_distance(a, b)
+
+
+def similarity(a: str, b: str) -> float:
+    """Нормированное сходство строк по Левенштейну: 1.0 — совпадают, 0.0 — ничего общего."""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    return 1.0 - _distance_function()(a, b) / longest
+
+
+def qgrams(text: str, q: int = 2) -> Counter:
+    return Counter(text[i:i + q] for i in range(len(text) - q + 1))
+
+
+class FuzzyIndex:
+    """
+    Индекс строк для поиска похожих по расстоянию Левенштейна.
+    Кандидаты отбираются по длине и по числу общих q-грамм
+    (лемма о q-граммах: при расстоянии ≤ k у строк не меньше
+    max(|a|, |b|) - q + 1 - k*q общих q-грамм), и только они
+    проверяются точным расстоянием с отсечкой.
+    """
+
+    def __init__(self, strings: Sequence[str], q: int = 2):
+        self.q = q
+        self.strings = list(strings)
+        self._lengths = sorted(set(len(s) for s in self.strings))
+        self._by_length = defaultdict(list)
+        # q-грамма → параллельные списки (длина строки, id, число вхождений),
+        # отсортированные по длине — чтобы быстро отрезать диапазон длин.
+        postings = defaultdict(list)
+        for sid, s in enumerate(self.strings):
+            self._by_length[len(s)].append(sid)
+            for gram, count in qgrams(s, q).items():
+                postings[gram].append((len(s), sid, count))
+        self._postings = {}
+        for gram, entries in postings.items():
+            entries.sort()
+            self._postings[gram] = ([e[0] for e in entries], entries)
+
+    def _length_range(self, length: int, max_distance: int) -> Iterable[int]:
+        lo = bisect_left(self._lengths, length - max_distance)
+        hi = bisect_right(self._lengths, length + max_distance)
+        return self._lengths[lo:hi]
+
+    def candidates(self, text: str, max_distance: int) -> Iterable[int]:
+        length = len(text)
+        q = self.q
+        # Для коротких строк q-граммный фильтр ничего не отсекает
+        if length - q + 1 - max_distance * q <= 0:
+            for l in self._length_range(length, max_distance):
+                yield from self._by_length[l]
+            return
+
+        shared = defaultdict(int)
+        for gram, count in qgrams(text, q).items():
+            entry = self._postings.get(gram)
+            if entry is None:
+                continue
+            lengths, entries = entry
+            lo = bisect_left(lengths, length - max_distance)
+            hi = bisect_right(lengths, length + max_distance)
+            for _, sid, other_count in entries[lo:hi]:
+                shared[sid] += min(count, other_count)
+
+        strings = self.strings
+        for sid, common in shared.items():
+            needed = max(length, len(strings[sid])) - q + 1 - max_distance * q
+            if common >= needed:
+                yield sid
+
+    def query(self, text: str, max_distance: int = DEFAULT_MAX_DISTANCE) -> List[Tuple[int, int]]:
+        """Список (расстояние, id строки) для всех строк на расстоянии ≤ max_distance."""
+        result = []
+        for sid in self.candidates(text, max_distance):
+            d = _bounded_distance(text, self.strings[sid], max_distance)
+            if d <= max_distance:
+                result.append((d, sid))
+        result.sort()
+        return result
+
+
+def match_rows(pairs: Dict[str, str], rows: Dict[int, str],
+               max_distance: int = DEFAULT_MAX_DISTANCE) -> Dict[int, str]:
+    """
+    Для строк таблицы {номер: оригинал} подбирает ключ из pairs с минимальным
+    расстоянием ≤ max_distance. При равенстве побеждает пара, идущая в pairs
+    раньше; пары с пустым переводом не участвуют. Возвращает {номер строки: ключ пары}.
+    """
+    with span("import.levenshtein", pairs=len(pairs), rows=len(rows)) as s:
+        result = _match_rows(pairs, rows, max_distance)
+        s.set("matched", len(result))
+    return result
+
+
+def _match_rows(pairs: Dict[str, str], rows: Dict[int, str], max_distance: int) -> Dict[int, str]:
+    unique = list(dict.fromkeys(rows.values()))
+    index = FuzzyIndex(unique)
+    rows_by_string = defaultdict(list)
+    for row, text in rows.items():
+        rows_by_string[text].append(row)
+
+    best = {}  # id строки индекса -> (расстояние, порядок пары, ключ)
+    for order, (original, translation) in enumerate(pairs.items()):
+        # Пустой перевод ничего не даст, но занял бы строку вместо настоящей пары
+        if not translation.strip():
+            continue
+        for d, sid in index.query(original, max_distance):
+            current = best.get(sid)
+            if current is None or (d, order) < current[:2]:
+                best[sid] = (d, order, original)
+
+    result = {}
+    for sid, (_, _, original) in best.items():
+        for row in rows_by_string[unique[sid]]:
+            result[row] = original
+    return result
@@ -0,0 +1,245 @@
+# glossary.py
+
+import re
+import time
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from delta import iter_translated_rows
+from pairs_parser import load_pairs_file
+from parse_cache import ParseCache, load_records
+from tracing import span
+
+# Несколько допустимых переводов термина пишутся через ";":
+#     Fireball|Огненный шар; огненного шара
+# Перевод ищется как подстрока без учёта регистра, поэтому вместо всех
+# падежных форм можно указать общую основу («огненн»).
+ALTERNATIVES_SEPARATOR = ";"
+
+# Разметка (&lt;LSTag ...&gt;) заменяется пробелами той же длины: слова внутри
+# тегов не считаются терминами, а позиции остальных слов не сдвигаются
+_MARKUP_RE = re.compile(r"&lt;.*?&gt;|&[a-z]+;|<[^>]*>")
+_WORD_RE = re.compile(r"\w+")
+
+GlossaryTerm = namedtuple("GlossaryTerm", ["source", "translations"])
+# Строка, где термин оригинала есть, а его утверждённого перевода нет
+GlossaryIssue = namedtuple(
+    "GlossaryIssue", ["path", "mod", "row", "term", "expected", "original", "translation"]
+)
+# Файл для проверки: contents — открытое содержимое (с несохранёнными
+# правками) или None, тогда переводы берутся из russian_path
+GlossaryJob = namedtuple("GlossaryJob", ["path", "mod", "russian_path", "contents"])
+
+
+def _strip_markup(text: str) -> str:
+    if "&" in text or "<" in text:
+        return _MARKUP_RE.sub(lambda m: " " * len(m.group()), text)
+    return text
+
+
+def _word_spans(text: str) -> List[Tuple[str, int, int]]:
+    """Слова текста в нижнем регистре с позициями в исходной строке."""
+    return [(m.group(), m.start(), m.end()) for m in _WORD_RE.finditer(_strip_markup(text).lower())]
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(_strip_markup(text).lower())
+
+
+class Glossary:
+    """
+    Глоссарий терминов, скомпилированный в автомат Ахо — Корасик.
+    Алфавит автомата — слова, а не символы: термины находятся только
+    целыми словами («Rage» не находится в «Courage»), а строка проходится
+    за один линейный проход по её словам, сколько бы терминов ни было.
+    Из пересекающихся совпадений берётся самое левое и самое длинное
+    («Magic Missile», а не «Missile»).
+    """
+
+    def __init__(self, terms: Dict[str, str]):
+        self.terms: List[GlossaryTerm] = []
+        self._lengths: List[int] = []       # длина термина в словах
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for source, translation in terms.items():
+            words = [w for w, _, _ in _word_spans(source)]
+            alternatives = tuple(
+                a.strip() for a in translation.split(ALTERNATIVES_SEPARATOR) if a.strip()
+            )
+            if not words or not alternatives:
+                continue
+            self._insert(words, len(self.terms))
+            self.terms.append(GlossaryTerm(source.strip(), alternatives))
+            self._lengths.append(len(words))
+        self._expected = [tuple(a.lower() for a in t.translations) for t in self.terms]
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path: str) -> "Glossary":
+        """Глоссарий из файла пар `Термин|Перевод` (или CSV/TSV, см. pairs_parser)."""
+        return cls(load_pairs_file(path))
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    # ---------- Построение автомата ----------
+    def _insert(self, words: List[str], term_id: int):
+        state = 0
+        for word in words:
+            nxt = self._goto[state].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        # Повтор термина в глоссарии: действует последний
+        self._out[state] = (term_id,)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Совпадения суффиксов достаются по ссылке неудачи один раз, при построении
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    # ---------- Поиск ----------
+    def _match(self, words: List[str]) -> List[Tuple[int, int, int]]:
+        """
+        Один проход автомата по словам: (первое слово, последнее слово, id
+        термина) без пересечений, слева направо.
+        """
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        matches = []  # (первое слово, −длина, id термина)
+        state = 0
+        for index, word in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for term_id in out[state]:
+                matches.append((index - lengths[term_id] + 1, -lengths[term_id], term_id))
+        if not matches:
+            return []
+
+        matches.sort()
+        result = []
+        next_free = 0
+        for first, negative_length, term_id in matches:
+            if first < next_free:
+                continue
+            last = first - negative_length - 1
+            result.append((first, last, term_id))
+            next_free = last + 1
+        return result
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """Термины в тексте: (id термина, начало, конец) в позициях строки."""
+        spans = _word_spans(text)
+        return [(term_id, spans[first][1], spans[last][2])
+                for first, last, term_id in self._match([w for w, _, _ in spans])]
+
+    def missing_terms(self, original: str, translation: str) -> List[GlossaryTerm]:
+        """Термины оригинала, ни один утверждённый перевод которых не встречается в переводе."""
+        found = self._match(_words(original))
+        if not found:
+            return []
+        target = translation.lower()
+        missing = []
+        seen = set()
+        for _, _, term_id in found:
+            if term_id in seen:
+                continue
+            seen.add(term_id)
+            if not any(expected in target for expected in self._expected[term_id]):
+                missing.append(self.terms[term_id])
+        return missing
+
+    def pretranslate(self, text: str) -> str:
+        """
+        Заменяет термины оригинала их первым утверждённым переводом — перед
+        машинным переводом, чтобы переводчик не подобрал свой вариант.
+        """
+        found = self.find(text)
+        if not found:
+            return text
+        parts = []
+        position = 0
+        for term_id, start, end in found:
+            parts.append(text[position:start])
+            parts.append(self.terms[term_id].translations[0])
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
+
+    # ---------- Проверка ----------
+    def check_rows(self, path: str, mod: str,
+                   rows: Iterable[Tuple[int, str, str]]) -> List[GlossaryIssue]:
+        """Проверяет строки (строка, оригинал, перевод); непереведённые пропускаются."""
+        issues = []
+        for row, original, translation in rows:
+            if not translation.strip():
+                continue
+            for term in self.missing_terms(original, translation):
+                issues.append(GlossaryIssue(path, mod, row, term.source, term.translations[0],
+                                            original, translation))
+        return issues
+
+
+class GlossaryReport:
+    """Итог проверки всех модов."""
+
+    def __init__(self):
+        self.issues: List[GlossaryIssue] = []
+        self.files = 0
+        self.rows = 0
+        self.cancelled = False
+        self.error = None  # проверка прервана исключением
+        self.elapsed = 0.0
+
+    def summary(self) -> str:
+        return (f"файлов {self.files}, строк с переводом {self.rows}, "
+                f"нарушений глоссария {len(self.issues)} за {self.elapsed:.1f} с")
+
+
+def _job_rows(job: GlossaryJob, parse_cache: Optional[ParseCache]) -> List[Tuple[int, str, str]]:
+    if job.contents is not None:
+        return [(row, original, translation) for row, (original, translation) in enumerate(job.contents)
+                if translation.strip()]
+    if not job.russian_path:
+        return []
+    return list(iter_translated_rows(load_records(job.path, parse_cache),
+                                     load_records(job.russian_path, parse_cache)))
+
+
+def check_workspace(glossary: Glossary, jobs: List[GlossaryJob],
+                    parse_cache: Optional[ParseCache] = None,
+                    on_progress: Optional[Callable[[int, int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None) -> GlossaryReport:
+    """Проверяет переводы всех файлов; битые файлы пропускаются."""
+    started = time.perf_counter()
+    report = GlossaryReport()
+    with span("glossary.check_workspace", files=len(jobs), terms=len(glossary)) as s:
+        for done, job in enumerate(jobs, 1):
+            if is_cancelled is not None and is_cancelled():
+                report.cancelled = True
+                break
+            try:
+                rows = _job_rows(job, parse_cache)
+            except Exception:
+                continue
+            report.files += 1
+            report.rows += len(rows)
+            report.issues.extend(glossary.check_rows(job.path, job.mod, rows))
+            if on_progress is not None:
+                on_progress(done, len(jobs))
+        s.set("issues", len(report.issues))
+    report.elapsed = time.perf_counter() - started
+    return report
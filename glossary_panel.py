@@ -0,0 +1,71 @@
+# glossary_panel.py
+
+import os
+
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+
+# Сколько нарушений показывать в списке (всего найденных может быть больше)
+MAX_ISSUES = 5000
+
+
+class GlossaryPanel(QDockWidget):
+    """
+    Результаты проверки глоссария: строки, где термин оригинала переведён
+    не утверждённым переводом. Двойной клик/Enter переходит к строке.
+    """
+
+    # путь к файлу, номер строки
+    issue_activated = pyqtSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__("Глоссарий", parent)
+        self.setObjectName("glossary_panel")
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.status_label = QLabel("Загрузите глоссарий и запустите проверку (меню «Глоссарий»).")
+        layout.addWidget(self.status_label)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderLabels(["Мод", "Файл", "Строка", "Термин", "Ожидается", "Перевод"])
+        self.results.setRootIsDecorated(False)
+        self.results.setUniformRowHeights(True)
+        self.results.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.results.header().setStretchLastSection(True)
+        self.results.itemActivated.connect(self.on_item_activated)
+        layout.addWidget(self.results)
+        self.setWidget(widget)
+
+    def set_status(self, text: str):
+        self.status_label.setText(text)
+
+    def show_report(self, report):
+        self.results.clear()
+        items = []
+        for issue in report.issues[:MAX_ISSUES]:
+            item = QTreeWidgetItem([
+                issue.mod or "", os.path.basename(issue.path), str(issue.row + 1),
+                issue.term, issue.expected, issue.translation,
+            ])
+            item.setData(0, Qt.UserRole, (issue.path, issue.row))
+            item.setToolTip(1, issue.path)
+            item.setToolTip(5, f"{issue.original}\n\n{issue.translation}")
+            items.append(item)
+        self.results.addTopLevelItems(items)
+
+        shown = f" (показано {MAX_ISSUES})" if len(report.issues) > MAX_ISSUES else ""
+        if report.error:
+            prefix = f"Проверка прервана ошибкой ({report.error}): "
+        elif report.cancelled:
+            prefix = "Проверка остановлена: "
+        else:
+            prefix = "Проверено: "
+        self.status_label.setText(prefix + report.summary() + shown)
+
+    def on_item_activated(self, item: QTreeWidgetItem, column: int = 0):
+        path, row = item.data(0, Qt.UserRole)
+        self.issue_activated.emit(path, row)
@@ -0,0 +1,139 @@
+# loca_format.py
+#
+# Бинарный формат локализации BG3 (.loca), как его пишет LSLib:
+#
+#   заголовок:  char[4] "LOCA", uint32 число записей, uint32 смещение текстов
+#   записи:     char[64] ключ (contentuid, дополнен нулями), uint16 version,
+#               uint32 длина текста в байтах вместе с завершающим нулём
+#   тексты:     подряд с указанного смещения, UTF-8 с нулём в конце
+#
+# Все числа little-endian, без выравнивания.
+
+import mmap
+import os
+import struct
+import time
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from file_contents import content_key
+from tracing import record_span
+from utils import escape_xml, unescape_xml
+from xml_extractor import ContentRecord
+
+LOCA_SIGNATURE = b"LOCA"
+LOCA_EXTENSION = ".loca"
+HEADER = struct.Struct("<4sII")
+ENTRY = struct.Struct("<64sHI")
+KEY_SIZE = 64
+
+
+class LocaFormatError(ValueError):
+    """Файл не похож на .loca или повреждён."""
+
+
+def is_loca(path: str) -> bool:
+    return path.lower().endswith(LOCA_EXTENSION)
+
+
+def _read_table(buffer) -> List[Tuple[bytes, int, int, int]]:
+    """Таблица записей: (ключ, version, смещение текста, длина без нуля)."""
+    if len(buffer) < HEADER.size:
+        raise LocaFormatError("Файл короче заголовка .loca")
+    signature, count, texts_offset = HEADER.unpack_from(buffer, 0)
+    if signature != LOCA_SIGNATURE:
+        raise LocaFormatError(f"Неверная сигнатура: {signature!r}")
+    if HEADER.size + count * ENTRY.size > len(buffer) or texts_offset > len(buffer):
+        raise LocaFormatError("Таблица записей выходит за пределы файла")
+
+    table = []
+    offset = texts_offset
+    for i in range(count):
+        key, version, length = ENTRY.unpack_from(buffer, HEADER.size + i * ENTRY.size)
+        if offset + length > len(buffer):
+            raise LocaFormatError(f"Текст записи {i} выходит за пределы файла")
+        # Длина включает завершающий ноль
+        table.append((key.rstrip(b"\0"), version, offset, max(length - 1, 0)))
+        offset += length
+    return table
+
+
+def iter_loca_contents(path: str) -> Iterator[ContentRecord]:
+    """
+    Читает .loca через mmap: заголовок и таблица разбираются struct.unpack_from
+    прямо из отображения, тексты декодируются из срезов memoryview без
+    промежуточных копий. Текст экранируется так же, как при чтении XML.
+    """
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise LocaFormatError("Пустой файл")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                table = _read_table(mm)
+                for key, version, offset, length in table:
+                    text = str(view[offset:offset + length], "utf-8", "replace")
+                    yield ContentRecord(key.decode("utf-8") or None, str(version), escape_xml(text))
+            finally:
+                view.release()
+    record_span("extract.loca", started, path=path, rows=len(table))
+
+
+def _encode_key(key: Optional[str]) -> bytes:
+    raw = (key or "").encode("utf-8")
+    if len(raw) >= KEY_SIZE:
+        raise LocaFormatError(f"Ключ длиннее {KEY_SIZE - 1} байт: {key}")
+    return raw
+
+
+def _write_loca(f, entries: List[Tuple[bytes, int, bytes]]):
+    """entries: (ключ, version, текст в UTF-8 без завершающего нуля)."""
+    texts_offset = HEADER.size + ENTRY.size * len(entries)
+    f.write(HEADER.pack(LOCA_SIGNATURE, len(entries), texts_offset))
+    for key, version, text in entries:
+        f.write(ENTRY.pack(key, version, len(text) + 1))
+    for _, _, text in entries:
+        f.write(text)
+        f.write(b"\0")
+
+
+def write_loca(output_path: str, records: Iterable[ContentRecord]):
+    """Записывает записи (текст — в экранированном виде, как в таблице) в .loca."""
+    from xml_writer import atomic_output
+
+    entries = [
+        (_encode_key(r.contentuid), int(r.version or 1), unescape_xml(r.text or "").encode("utf-8"))
+        for r in records
+    ]
+    with atomic_output(output_path) as f:
+        _write_loca(f, entries)
+
+
+def write_translated_loca(source_path: str, output_path: str,
+                          translations: Mapping[str, str]) -> int:
+    """
+    Пересобирает source_path в output_path, подставляя непустые
+    translations[ключ] (ключ как в file_contents.content_key).
+    Тексты без перевода копируются байтами из исходника.
+    Возвращает число подставленных переводов.
+    """
+    from xml_writer import atomic_output
+
+    started = time.perf_counter()
+    replaced = 0
+    with open(source_path, "rb") as f:
+        data = f.read()
+    view = memoryview(data)
+    entries = []
+    for index, (key, version, offset, length) in enumerate(_read_table(data)):
+        text = translations.get(content_key(key.decode("utf-8") or None, index))
+        if text:
+            encoded = unescape_xml(text).encode("utf-8")
+            replaced += 1
+        else:
+            encoded = view[offset:offset + length]
+        entries.append((key, version, encoded))
+    with atomic_output(output_path) as f:
+        _write_loca(f, entries)
+    record_span("save.loca", started, path=output_path, rows=len(entries), replaced=replaced)
+    return replaced
@@ -0,0 +1,69 @@
+# main_batch.py
+
+import argparse
+import sys
+
+from batch_localizer import BatchOptions, load_pairs_files, localize_all, write_report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Пакетная локализация всех модов в UnpackedMods без графического интерфейса."
+    )
+    parser.add_argument("main_folder", help="Папка, в которой находится UnpackedMods")
+    parser.add_argument("-p", "--pairs", action="append", default=[],
+                        help="Файл пар Оригинал|Перевод, CSV или TSV (можно указать несколько раз)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Число процессов (по умолчанию — число ядер)")
+    parser.add_argument("-m", "--mod", action="append", dest="mods",
+                        help="Обработать только указанный мод (можно несколько раз)")
+    parser.add_argument("--levenshtein", action="store_true",
+                        help="Дополнительно сопоставлять похожие строки по Левенштейну")
+    parser.add_argument("--max-distance", type=int, default=3,
+                        help="Порог расстояния Левенштейна (по умолчанию 3)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Не использовать память переводов")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Не использовать кэш разбора XML")
+    parser.add_argument("--no-carry-over", action="store_true",
+                        help="Не переносить переводы из существующих russian.xml")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Ничего не записывать, только посчитать")
+    parser.add_argument("--report", help="Путь для JSON-отчёта")
+    args = parser.parse_args()
+
+    options = BatchOptions(
+        args.main_folder,
+        use_levenshtein=args.levenshtein,
+        max_distance=args.max_distance,
+        use_memory=not args.no_memory,
+        use_parse_cache=not args.no_cache,
+        dry_run=args.dry_run,
+        carry_over=not args.no_carry_over,
+    )
+    pairs = load_pairs_files(args.pairs)
+
+    def print_summary(summary: dict):
+        line = (f"[{summary['status']}] {summary['mod']}: "
+                f"{summary['translated']}/{summary['strings']} строк "
+                f"(перенесено: {summary['carried_over']}, пары: {summary['from_pairs']}, "
+                f"Левенштейн: {summary['from_levenshtein']}, память: {summary['from_memory']}; "
+                f"осталось: {summary['pending']}) за {summary['elapsed']:.2f} с")
+        if summary["error"]:
+            line += f" — {summary['error']}"
+        print(line, flush=True)
+
+    report = localize_all(options, pairs, workers=args.workers, mod_names=args.mods,
+                          on_mod_done=print_summary)
+    totals = report["totals"]
+    print(f"Итого: модов {totals['mods']} (ok {totals['ok']}, пропущено {totals['skipped']}, "
+          f"ошибок {totals['errors']}), переведено {totals['translated']}/{totals['strings']} строк "
+          f"за {report['elapsed']:.1f} с на {report['workers']} процессах")
+
+    if args.report:
+        write_report(report, args.report)
+    sys.exit(1 if totals["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,32 @@
 # main_translator.py
 
+import time
+_started = time.perf_counter()
+
 import sys
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
+from tracing import StartupTimer, configure_from_env
 from translator_app import TranslatorApp
 
 def main():
+    # BG3LOC_TRACE=trace.json / BG3LOC_PROFILE=app.prof включают диагностику с запуска
+    configure_from_env()
+    # BG3LOC_STARTUP_REPORT=- (или путь к файлу) печатает время до первого окна
+    startup = StartupTimer(_started)
+    startup.mark("imports")
     app = QApplication(sys.argv)
+    startup.mark("qapplication")
     translator_app = TranslatorApp()
+    startup.mark("main_window")
     translator_app.show()
+
+    def on_first_window():
+        startup.mark("first_show")
+        startup.write_report_from_env()
+
+    # Срабатывает, когда цикл событий обработал показ и первую отрисовку
+    QTimer.singleShot(0, on_first_window)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
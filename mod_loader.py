@@ -0,0 +1,216 @@
+# mod_loader.py
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, List, Optional
+
+from mod_scanner import ModManifest, ScanStats, list_mods, scan_mod
+from parse_cache import ParseCache, load_records
+from quick_index import quick_index_mod
+from search_index import SearchIndex
+from suggestion_service import SuggestionService, translated_pairs
+from tracing import record_span
+
+
+class LoadProgress:
+    """Состояние загрузки: моды обнаружены/всего, байты разобраны/всего."""
+
+    def __init__(self, mods_total: int):
+        self.mods_total = mods_total
+        self.mods_done = 0
+        self.files_total = 0
+        self.files_done = 0
+        self.bytes_total = 0
+        self.bytes_done = 0
+
+
+class ModLoader:
+    """
+    Конвейер загрузки UnpackedMods: производители (пул потоков) обходят
+    моды и разбирают их XML в постоянный кэш (и в поисковый индекс, если
+    он задан), потребитель получает манифесты пачками через on_manifests.
+    Каждый мод сразу получает быструю сводку (quick_index): число строк
+    и долю перевода без разбора XML. Если задан сервис подсказок, в конце
+    в него добавляются пары из english/russian каждого мода. Поддерживает
+    отмену.
+    """
+
+    def __init__(self, unpacked_mods_path: str, parse_cache: Optional[ParseCache] = None,
+                 max_workers: int = None, prefetch: bool = True,
+                 batch_size: int = 32, batch_interval: float = 0.05,
+                 search_index: Optional[SearchIndex] = None,
+                 suggestions: Optional[SuggestionService] = None,
+                 quick_index: bool = True):
+        self.unpacked_mods_path = unpacked_mods_path
+        self.parse_cache = parse_cache
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 1) * 2)
+        # Разбирать ли XML заранее (в кэш разбора) или только обнаруживать
+        self.prefetch = prefetch and parse_cache is not None
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        # Для индекса читаются все файлы, свежие — из кэша разбора
+        self.search_index = search_index
+        self.suggestions = suggestions
+        self.quick_index = quick_index
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _scan(self, mod_path: str, name: str) -> ModManifest:
+        manifest = scan_mod(mod_path, name)
+        if self.quick_index and not self._cancel.is_set():
+            quick_index_mod(manifest)
+        return manifest
+
+    def _parse(self, path: str, size: int, mod_name: str) -> int:
+        """Разбирает файл в кэш; битые файлы пропускаются (их покажет выбор в дереве)."""
+        if not self._cancel.is_set():
+            try:
+                records = load_records(path, self.parse_cache)
+                # Файл, уже открытый в GUI, проиндексирован вместе с переводами — не затираем
+                if self.search_index is not None and path not in self.search_index:
+                    self.search_index.add_file(path, mod_name, [r.text for r in records], replace=False)
+            except Exception:
+                pass
+        return size
+
+    def _index_pairs(self, manifest: ModManifest) -> int:
+        """Добавляет готовые переводы мода в подсказки; файлы к этому времени уже в кэше разбора."""
+        if self._cancel.is_set():
+            return 0
+        try:
+            pairs = translated_pairs(
+                load_records(manifest.english.path, self.parse_cache),
+                load_records(manifest.russian.path, self.parse_cache),
+            )
+        except Exception:
+            return 0
+        return self.suggestions.add_pairs(pairs)
+
+    def run(self, on_manifests: Callable[[List[ModManifest]], None],
+            on_progress: Callable[[LoadProgress], None] = None) -> ScanStats:
+        started = time.perf_counter()
+        names = list_mods(self.unpacked_mods_path)
+        progress = LoadProgress(len(names))
+        stats = ScanStats()
+        batch = []
+        translated = []  # моды, где есть и english, и russian
+        last_flush = time.perf_counter()
+
+        def flush(force: bool = False):
+            """Отдаёт накопленные манифесты и прогресс не чаще batch_interval."""
+            nonlocal batch, last_flush
+            now = time.perf_counter()
+            if not force and len(batch) < self.batch_size and now - last_flush < self.batch_interval:
+                return
+            if batch:
+                on_manifests(batch)
+                batch = []
+            last_flush = now
+            if on_progress is not None:
+                on_progress(progress)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            scans = {
+                pool.submit(self._scan, os.path.join(self.unpacked_mods_path, n), n): n for n in names
+            }
+            parses = set()
+            while scans or parses:
+                if self._cancel.is_set():
+                    break
+                done, _ = wait(list(scans) + list(parses), timeout=self.batch_interval,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in scans:
+                        del scans[future]
+                        manifest = future.result()
+                        progress.mods_done += 1
+                        stats.mods += 1
+                        stats.dirs_visited += manifest.dirs_visited
+                        if manifest.quick is not None:
+                            stats.strings_found += manifest.quick.strings
+                        if manifest.elapsed > stats.slowest_mod_time:
+                            stats.slowest_mod = manifest.name
+                            stats.slowest_mod_time = manifest.elapsed
+                        for f in manifest.files:
+                            stats.files_found += 1
+                            stats.bytes_found += f.size
+                            progress.files_total += 1
+                            progress.bytes_total += f.size
+                            stale = self.prefetch and not self.parse_cache.is_fresh(
+                                f.path, f.size, f.mtime_ns)
+                            if stale or self.search_index is not None:
+                                parses.add(pool.submit(self._parse, f.path, f.size, manifest.name))
+                            else:
+                                progress.files_done += 1
+                                progress.bytes_done += f.size
+                        batch.append(manifest)
+                        if manifest.english is not None and manifest.russian is not None:
+                            translated.append(manifest)
+                    else:
+                        parses.discard(future)
+                        progress.files_done += 1
+                        progress.bytes_done += future.result()
+                flush()
+            flush(force=True)
+            # Пары собираются после разбора: оба файла берутся из кэша, а не парсятся дважды
+            if self.suggestions is not None and translated and not self._cancel.is_set():
+                pairs_started = time.perf_counter()
+                added = sum(pool.map(self._index_pairs, translated))
+                record_span("load.suggestions", pairs_started, mods=len(translated), added=added)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        stats.elapsed = time.perf_counter() - started
+        record_span("load.pipeline", started, mods=stats.mods, files=progress.files_total,
+                    bytes=progress.bytes_done, cancelled=self.cancelled)
+        return stats
+
+
+def reindex_mod(manifest: ModManifest, paths: List[str], removed: List[str],
+                parse_cache: Optional[ParseCache] = None,
+                search_index: Optional[SearchIndex] = None,
+                suggestions: Optional[SuggestionService] = None,
+                is_cancelled: Optional[Callable[[], bool]] = None) -> ModManifest:
+    """
+    Обновляет индексы мода после изменений на диске (см. ModsWatcher):
+    paths (добавленные и изменённые файлы) разбираются в кэш и поисковый
+    индекс, removed снимаются с индекса. Если среди paths есть english или
+    russian, пары мода заново добавляются в подсказки. Быстрая сводка
+    пересчитывается. Битые файлы пропускаются.
+    """
+    started = time.perf_counter()
+    if search_index is not None:
+        for path in removed:
+            search_index.remove_file(path)
+    for path in paths:
+        if is_cancelled is not None and is_cancelled():
+            return manifest
+        try:
+            records = load_records(path, parse_cache)
+        except Exception:
+            if search_index is not None:
+                search_index.remove_file(path)
+            continue
+        if search_index is not None:
+            search_index.add_file(path, manifest.name, [r.text for r in records])
+
+    pair_files = {f.path for f in (manifest.english, manifest.russian) if f is not None}
+    if (suggestions is not None and len(pair_files) == 2 and pair_files.intersection(paths)):
+        try:
+            suggestions.add_pairs(translated_pairs(
+                load_records(manifest.english.path, parse_cache),
+                load_records(manifest.russian.path, parse_cache),
+            ))
+        except Exception:
+            pass
+    quick_index_mod(manifest)
+    record_span("watch.reindex_mod", started, mod=manifest.name, files=len(paths), removed=len(removed))
+    return manifest
@@ -0,0 +1,206 @@
+# mod_scanner.py
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional
+
+from tracing import record_span, span
+
+if TYPE_CHECKING:
+    # quick_index сам импортирует этот модуль
+    from quick_index import ModQuickStats
+
+# Папка локализации ищется не глубже этого уровня от корня мода
+# (SomeMod/Localization — уровень 1, SomeMod/Mods/SomeMod/Localization — 3).
+# Всё, что глубже и не лежит внутри Localization, не обходится вовсе:
+# это отсекает тяжёлые деревья ассетов (Public, Generated и т.п.).
+LOCALIZATION_SEARCH_DEPTH = 4
+
+# Форматы файлов локализации: XML после Multitool и родной бинарный .loca
+LOCALIZATION_EXTENSIONS = (".xml", ".loca")
+
+
+@dataclass
+class LocalizationFile:
+    """Найденный файл локализации и его метаданные из одного stat()."""
+    path: str
+    size: int
+    mtime_ns: int
+    kind: str  # 'english' | 'russian' | 'other'
+
+    @property
+    def is_loca(self) -> bool:
+        return self.path.lower().endswith(".loca")
+
+
+@dataclass
+class ModManifest:
+    """Результат обхода одного мода."""
+    name: str
+    path: str
+    english: Optional[LocalizationFile] = None
+    russian: Optional[LocalizationFile] = None
+    others: List[LocalizationFile] = field(default_factory=list)
+    dirs_visited: int = 0
+    elapsed: float = 0.0
+    # Быстрая сводка (число строк, доля перевода) — заполняет quick_index.quick_index_mod
+    quick: Optional["ModQuickStats"] = None
+
+    @property
+    def files(self) -> List[LocalizationFile]:
+        """Все файлы мода в порядке: english, russian, прочие."""
+        result = [f for f in (self.english, self.russian) if f is not None]
+        result.extend(self.others)
+        return result
+
+    def find(self, path: str) -> Optional[LocalizationFile]:
+        for f in self.files:
+            if f.path == path:
+                return f
+        return None
+
+
+@dataclass
+class ScanStats:
+    """Сводная статистика сканирования UnpackedMods."""
+    mods: int = 0
+    dirs_visited: int = 0
+    files_found: int = 0
+    bytes_found: int = 0
+    strings_found: int = 0  # по быстрой сводке, если она строилась
+    elapsed: float = 0.0
+    slowest_mod: str = ""
+    slowest_mod_time: float = 0.0
+    error: str = ""  # сканирование прервано исключением
+
+    def summary(self) -> str:
+        return (
+            f"Модов: {self.mods}, папок обойдено: {self.dirs_visited}, "
+            f"XML: {self.files_found} ({self.bytes_found / 1048576:.1f} МБ), "
+            + (f"строк: {self.strings_found}, " if self.strings_found else "")
+            + f"время: {self.elapsed:.2f} с "
+            f"(самый долгий мод: {self.slowest_mod} — {self.slowest_mod_time:.2f} с)"
+        )
+
+
+@dataclass
+class ScanResult:
+    mods: List[ModManifest]
+    stats: ScanStats
+
+
+def _make_file(entry: os.DirEntry, kind: str) -> LocalizationFile:
+    st = entry.stat()
+    return LocalizationFile(entry.path, st.st_size, st.st_mtime_ns, kind)
+
+
+def _assign(manifest: ModManifest, kind: str, found: LocalizationFile):
+    """
+    Ставит файл основным english/russian. Если у мода есть и .xml, и .loca
+    одного языка, основным остаётся XML (как раньше), второй идёт в прочие.
+    """
+    current = getattr(manifest, kind)
+    if current is None:
+        setattr(manifest, kind, found)
+    elif current.is_loca and not found.is_loca:
+        current.kind = "other"
+        manifest.others.append(current)
+        setattr(manifest, kind, found)
+    else:
+        found.kind = "other"
+        manifest.others.append(found)
+
+
+def scan_mod(mod_path: str, name: str = None) -> ModManifest:
+    """
+    Обходит мод один раз через os.scandir и классифицирует файлы локализации
+    (.xml и .loca) в папках Localization: english, russian
+    (Localization/Russian) и прочие.
+    """
+    started = time.perf_counter()
+    manifest = ModManifest(name or os.path.basename(mod_path), mod_path)
+    russian_dir = os.path.join(mod_path, "Localization", "Russian")
+
+    # Стек: (путь, глубина, находимся ли внутри Localization)
+    stack = [(mod_path, 0, False)]
+    while stack:
+        dir_path, depth, in_localization = stack.pop()
+        manifest.dirs_visited += 1
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                inside = in_localization or "Localization" in entry.name
+                if inside or depth + 1 < LOCALIZATION_SEARCH_DEPTH:
+                    subdirs.append((entry.path, depth + 1, inside))
+                continue
+            if not in_localization:
+                continue
+
+            lower = entry.name.lower()
+            stem, ext = os.path.splitext(lower)
+            if ext not in LOCALIZATION_EXTENSIONS:
+                continue
+            try:
+                if stem == "russian" and dir_path == russian_dir:
+                    _assign(manifest, "russian", _make_file(entry, "russian"))
+                elif stem == "english":
+                    _assign(manifest, "english", _make_file(entry, "english"))
+                else:
+                    manifest.others.append(_make_file(entry, "other"))
+            except OSError:
+                continue
+
+        # Обратный порядок, чтобы обход шёл по алфавиту сверху вниз
+        stack.extend(reversed(subdirs))
+
+    manifest.elapsed = time.perf_counter() - started
+    record_span("scan.mod", started, mod=manifest.name,
+                dirs=manifest.dirs_visited, files=len(manifest.files))
+    return manifest
+
+
+def list_mods(unpacked_mods_path: str) -> List[str]:
+    """Имена папок модов внутри UnpackedMods."""
+    with os.scandir(unpacked_mods_path) as it:
+        return sorted(e.name for e in it if e.is_dir())
+
+
+def scan_unpacked_mods(unpacked_mods_path: str, max_workers: int = None) -> ScanResult:
+    """
+    Параллельно сканирует все моды в UnpackedMods на пуле потоков.
+    Порядок модов в результате совпадает с алфавитным.
+    """
+    started = time.perf_counter()
+    names = list_mods(unpacked_mods_path)
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+
+    with span("scan.unpacked_mods", mods=len(names)), \
+            ThreadPoolExecutor(max_workers=max_workers) as pool:
+        mods = list(pool.map(
+            lambda n: scan_mod(os.path.join(unpacked_mods_path, n), n), names
+        ))
+
+    stats = ScanStats(mods=len(mods))
+    for m in mods:
+        stats.dirs_visited += m.dirs_visited
+        for f in m.files:
+            stats.files_found += 1
+            stats.bytes_found += f.size
+        if m.elapsed > stats.slowest_mod_time:
+            stats.slowest_mod = m.name
+            stats.slowest_mod_time = m.elapsed
+    stats.elapsed = time.perf_counter() - started
+    return ScanResult(mods, stats)
@@ -0,0 +1,152 @@
+# mods_watcher.py
+
+import os
+from typing import Dict
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from mod_scanner import ModManifest, list_mods, scan_mod
+
+
+def diff_manifests(old: ModManifest, new: ModManifest):
+    """
+    Сравнивает два манифеста одного мода.
+    Возвращает (добавленные, удалённые, изменённые) пути файлов.
+    """
+    old_files = {f.path: f for f in old.files}
+    new_files = {f.path: f for f in new.files}
+    added = [p for p in new_files if p not in old_files]
+    removed = [p for p in old_files if p not in new_files]
+    modified = [
+        p for p, f in new_files.items()
+        if p in old_files and (f.size, f.mtime_ns, f.kind) != (
+            old_files[p].size, old_files[p].mtime_ns, old_files[p].kind)
+    ]
+    return added, removed, modified
+
+
+class ModsWatcher(QObject):
+    """
+    Следит за UnpackedMods через QFileSystemWatcher (inotify и аналоги):
+    корневой папкой, папками модов, папками и файлами локализации.
+    События копятся и после паузы пересканируются только затронутые моды.
+    """
+
+    mod_added = pyqtSignal(object)               # ModManifest
+    mod_removed = pyqtSignal(str)                # имя мода
+    # ModManifest, добавленные, удалённые, изменённые пути
+    mod_changed = pyqtSignal(object, list, list, list)
+
+    def __init__(self, unpacked_mods_path: str, manifests: Dict[str, ModManifest],
+                 debounce_ms: int = 700, parent=None):
+        super().__init__(parent)
+        self.unpacked_mods_path = os.path.normpath(unpacked_mods_path)
+        # Ссылка на словарь приложения: изменения видны обеим сторонам
+        self.manifests = manifests
+        self._pending = set()
+        self._root_changed = False
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._process_pending)
+
+        self._watch_path(self.unpacked_mods_path)
+        for manifest in manifests.values():
+            self._watch_manifest(manifest)
+
+    def stop(self):
+        self._timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    # ---------- Регистрация путей ----------
+    def _watch_path(self, path: str):
+        if os.path.exists(path) and path not in self._watcher.files() + self._watcher.directories():
+            self._watcher.addPath(path)
+
+    def _watch_manifest(self, manifest: ModManifest):
+        paths = {manifest.path}
+        localizations = set()
+        for f in manifest.files:
+            paths.add(f.path)
+            paths.add(os.path.dirname(f.path))
+            # Localization/<язык>/файл: папка Localization мода может лежать и глубже корня
+            localizations.add(os.path.dirname(os.path.dirname(f.path)))
+        localization = os.path.join(manifest.path, "Localization")
+        if os.path.isdir(localization):
+            localizations.add(localization)
+        # Папки языков следятся и без файлов: Russian, созданная первым сохранением
+        # (или вручную), сообщит о появлении russian.xml
+        for localization in localizations:
+            paths.add(localization)
+            try:
+                with os.scandir(localization) as entries:
+                    paths.update(e.path for e in entries if e.is_dir(follow_symlinks=False))
+            except OSError:
+                pass
+        existing = set(self._watcher.files()) | set(self._watcher.directories())
+        new_paths = [p for p in paths if p not in existing and os.path.exists(p)]
+        if new_paths:
+            self._watcher.addPaths(new_paths)
+
+    def _unwatch_mod(self, mod_path: str):
+        prefix = mod_path + os.sep
+        stale = [p for p in self._watcher.files() + self._watcher.directories()
+                 if p == mod_path or p.startswith(prefix)]
+        if stale:
+            self._watcher.removePaths(stale)
+
+    # ---------- Обработка событий ----------
+    def _on_path_changed(self, path: str):
+        path = os.path.normpath(path)
+        if path == self.unpacked_mods_path:
+            self._root_changed = True
+        else:
+            rel = os.path.relpath(path, self.unpacked_mods_path)
+            mod_name = rel.split(os.sep, 1)[0]
+            if mod_name and mod_name != os.pardir:
+                self._pending.add(mod_name)
+        self._timer.start()
+
+    def _process_pending(self):
+        pending, self._pending = self._pending, set()
+
+        if self._root_changed:
+            self._root_changed = False
+            try:
+                current = set(list_mods(self.unpacked_mods_path))
+            except OSError:
+                current = set()
+            for name in list(self.manifests):
+                if name not in current:
+                    pending.discard(name)
+                    self._remove_mod(name)
+            pending.update(name for name in current if name not in self.manifests)
+
+        for name in sorted(pending):
+            mod_path = os.path.join(self.unpacked_mods_path, name)
+            if not os.path.isdir(mod_path):
+                if name in self.manifests:
+                    self._remove_mod(name)
+                continue
+            manifest = scan_mod(mod_path, name)
+            old = self.manifests.get(name)
+            self.manifests[name] = manifest
+            self._watch_manifest(manifest)
+            if old is None:
+                self.mod_added.emit(manifest)
+                continue
+            added, removed, modified = diff_manifests(old, manifest)
+            if added or removed or modified:
+                self.mod_changed.emit(manifest, added, removed, modified)
+
+    def _remove_mod(self, name: str):
+        manifest = self.manifests.pop(name)
+        self._unwatch_mod(manifest.path)
+        self.mod_removed.emit(name)
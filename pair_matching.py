@@ -0,0 +1,91 @@
+# pair_matching.py
+
+import sqlite3
+import time
+from typing import Callable, Dict, Optional
+
+from fuzzy_index import DEFAULT_MAX_DISTANCE, match_rows
+from pairs_parser import PairsReadProgress, load_pairs_file
+from tracing import span
+from translation_memory import ORIGIN_IMPORT, TranslationMemory
+from utils import remove_amp
+
+
+def exact_pair_updates(contents, pairs: Dict[str, str]) -> Dict[int, str]:
+    """Переводы для строк без перевода, оригинал которых точно есть в pairs с непустым переводом."""
+    updates = {}
+    for i, (original, translation) in enumerate(contents):
+        if not translation.strip() and pairs.get(original, "").strip():
+            updates[i] = remove_amp(pairs[original]).strip()
+    return updates
+
+
+def fuzzy_pair_updates(contents, pairs: Dict[str, str],
+                       max_distance: int = DEFAULT_MAX_DISTANCE,
+                       skip_rows=()) -> Dict[int, str]:
+    """
+    Переводы для строк без перевода, похожих на оригинал из pairs
+    (расстояние Левенштейна ≤ max_distance, см. fuzzy_index.match_rows).
+    """
+    skip_rows = set(skip_rows)
+    rows = {
+        i: orig.strip() for i, (orig, trans) in enumerate(contents)
+        if not trans.strip() and i not in skip_rows
+    }
+    matches = match_rows(pairs, rows, max_distance)
+    return {row: remove_amp(pairs[original]).strip() for row, original in matches.items()}
+
+
+class PairsImportResult:
+    """Итог импорта пар из файла: найденные пары и переводы для строк таблицы."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pairs = 0
+        self.exact: Dict[int, str] = {}
+        self.fuzzy: Dict[int, str] = {}
+        self.cancelled = False
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def updates(self) -> Dict[int, str]:
+        return {**self.fuzzy, **self.exact}
+
+
+def import_pairs_file(path: str, contents, use_levenshtein: bool = False,
+                      max_distance: int = DEFAULT_MAX_DISTANCE,
+                      memory: Optional[TranslationMemory] = None,
+                      on_progress: Optional[Callable[[PairsReadProgress], None]] = None,
+                      is_cancelled: Optional[Callable[[], bool]] = None) -> PairsImportResult:
+    """
+    Потоково читает файл пар и подбирает переводы для пустых строк
+    contents (точно, затем по Левенштейну). В памяти — только словарь пар,
+    сам текст файла целиком не загружается. Пары сохраняются в память переводов.
+    """
+    started = time.perf_counter()
+    result = PairsImportResult(path)
+    with span("import.pairs_file", path=path) as s:
+        try:
+            pairs = load_pairs_file(path, on_chunk=on_progress, is_cancelled=is_cancelled)
+        except (OSError, ValueError) as e:
+            result.error = str(e)
+            return result
+        result.pairs = len(pairs)
+        s.set("pairs", len(pairs))
+        if is_cancelled is not None and is_cancelled():
+            result.cancelled = True
+            return result
+
+        result.exact = exact_pair_updates(contents, pairs)
+        if use_levenshtein:
+            result.fuzzy = fuzzy_pair_updates(contents, pairs, max_distance, skip_rows=result.exact)
+        if memory is not None:
+            try:
+                memory.store_many(((orig, remove_amp(trans)) for orig, trans in pairs.items()), ORIGIN_IMPORT)
+            except sqlite3.Error as e:
+                result.error = f"не удалось записать пары в память переводов: {e}"
+                return result
+        s.set("matched", len(result.exact) + len(result.fuzzy))
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,148 @@
+# pairs_parser.py
+
+import csv
+import os
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Несколько пар "English | Русский" в одной строке (см. parse_pair_line)
+PAIR_PATTERN = re.compile(
+    r'([a-zA-Z0-9\s\.\,\!\?\'\(\)]+)\s*\|\s*([\u0400-\u04FF\s\.\,\!\?\'\(\)]+)'
+)
+
+# Форматы файлов пар
+FORMAT_PIPE = "pipe"  # Оригинал|Перевод, как в диалоге импорта
+FORMAT_CSV = "csv"
+FORMAT_TSV = "tsv"
+
+# Файл читается порциями строк примерно такого объёма
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+def find_pairs(text: str) -> List[Tuple[str, str]]:
+    """Пары `english|russian` по регулярке PAIR_PATTERN, без крайних пробелов."""
+    return [(english.strip(), russian.strip()) for english, russian in PAIR_PATTERN.findall(text)]
+
+
+def parse_pair_line(line: str) -> List[Tuple[str, str]]:
+    """
+    Пары из одной строки. Строка с одним '|' делится по нему. Если '|'
+    несколько (пары вставлены одной строкой), пары ищутся регуляркой
+    PAIR_PATTERN, а если она ничего не нашла — строка делится по первому '|'.
+    Строки без '|', с пустым оригиналом или пустым переводом (`Original|`,
+    как у непереведённых строк в диалоге импорта) пар не дают.
+    """
+    separators = line.count("|")
+    if not separators:
+        return []
+    if separators > 1:
+        pairs = [(original, translated) for original, translated in find_pairs(line)
+                 if original and translated]
+        if pairs:
+            return pairs
+    original, translated = line.split("|", 1)
+    original, translated = original.strip(), translated.strip()
+    return [(original, translated)] if original and translated else []
+
+
+def iter_text_pairs(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    for line in lines:
+        yield from parse_pair_line(line)
+
+
+def split_text_pairs(text: str) -> List[Tuple[str, str]]:
+    """
+    Все пары текста по порядку, по правилам parse_pair_line (в отличие от
+    parse_translation_pairs повторы не схлопываются). Этим разбором
+    пользуются «разделители» текста, чтобы их вывод совпадал с импортом.
+    """
+    return list(iter_text_pairs(text.splitlines()))
+
+
+def parse_translation_pairs(text_input: str) -> Dict[str, str]:
+    """
+    Собирает пары (оригинал|перевод) из текста; повторный оригинал заменяет
+    перевод, пары с пустым переводом пропускаются.
+    """
+    return dict(iter_text_pairs(text_input.split("\n")))
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return FORMAT_CSV
+    if ext in (".tsv", ".tab"):
+        return FORMAT_TSV
+    return FORMAT_PIPE
+
+
+class PairsReadProgress:
+    """Ход чтения файла пар: прочитано байт из общего размера, найдено пар."""
+
+    def __init__(self, bytes_total: int):
+        self.bytes_total = bytes_total
+        self.bytes_done = 0
+        self.pairs = 0
+
+
+def _iter_lines(f, progress: PairsReadProgress,
+                on_chunk: Optional[Callable[[PairsReadProgress], None]],
+                is_cancelled: Optional[Callable[[], bool]]) -> Iterator[str]:
+    """Строки файла порциями по READ_CHUNK_BYTES; между порциями — прогресс и проверка отмены."""
+    first = True
+    while True:
+        if is_cancelled is not None and is_cancelled():
+            return
+        chunk = f.readlines(READ_CHUNK_BYTES)
+        if not chunk:
+            return
+        for raw in chunk:
+            progress.bytes_done += len(raw)
+            line = raw.decode("utf-8", "replace")
+            if first:
+                line = line.lstrip("\ufeff")
+                first = False
+            yield line
+        if on_chunk is not None:
+            on_chunk(progress)
+
+
+def iter_file_pairs(path: str, fmt: Optional[str] = None,
+                    on_chunk: Optional[Callable[[PairsReadProgress], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Потоково читает пары из файла: `Оригинал|Перевод` построчно (правила
+    parse_pair_line) или первые две колонки CSV/TSV. Пары с пустым
+    оригиналом или переводом пропускаются. В памяти держится только
+    текущая порция строк.
+    """
+    fmt = fmt or detect_format(path)
+    progress = PairsReadProgress(os.path.getsize(path))
+    with open(path, "rb") as f:
+        lines = _iter_lines(f, progress, on_chunk, is_cancelled)
+        if fmt == FORMAT_PIPE:
+            for pair in iter_text_pairs(lines):
+                progress.pairs += 1
+                yield pair
+            return
+        delimiter = "\t" if fmt == FORMAT_TSV else ","
+        for row in csv.reader(lines, delimiter=delimiter):
+            if len(row) < 2:
+                continue
+            original, translated = row[0].strip(), row[1].strip()
+            if original and translated:
+                progress.pairs += 1
+                yield original, translated
+
+
+def load_pairs_file(path: str, fmt: Optional[str] = None,
+                    on_chunk: Optional[Callable[[PairsReadProgress], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None,
+                    pairs: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Словарь {оригинал: перевод} из файла (пары — как в iter_file_pairs).
+    Если передан pairs, он дополняется (поздние пары важнее).
+    """
+    pairs = {} if pairs is None else pairs
+    pairs.update(iter_file_pairs(path, fmt, on_chunk, is_cancelled))
+    return pairs
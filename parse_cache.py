@@ -0,0 +1,133 @@
+# parse_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+from loca_format import is_loca, iter_loca_contents
+from tracing import span
+from xml_extractor import ContentRecord, iter_contents
+
+# Имя файла кэша; лежит рядом с папкой UnpackedMods
+CACHE_FILE_NAME = "bg3localith_cache.sqlite"
+
+# Версия формата записей: при изменении логики извлечения старый кэш
+# становится недействительным целиком.
+CACHE_FORMAT_VERSION = 1
+
+
+def file_hash(path: str) -> str:
+    """BLAKE2b-хэш содержимого файла (для строгой проверки)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    Постоянный кэш разобранных <content> в одном SQLite-файле.
+    Запись действительна, пока совпадают (path, size, mtime_ns),
+    а при verify_hash=True — ещё и хэш содержимого.
+    """
+
+    def __init__(self, db_path: str, verify_hash: bool = False):
+        self.db_path = db_path
+        self.verify_hash = verify_hash
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " hash TEXT,"
+            " format INTEGER NOT NULL,"
+            " records TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def for_main_folder(cls, main_folder: str, **kwargs) -> "ParseCache":
+        return cls(os.path.join(main_folder, CACHE_FILE_NAME), **kwargs)
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[List[ContentRecord]]:
+        """Записи файла из кэша или None, если ключ изменился."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, hash, format, records FROM files WHERE path = ?",
+                (path,),
+            ).fetchone()
+        if (row is None or row[0] != size or row[1] != mtime_ns
+                or row[3] != CACHE_FORMAT_VERSION):
+            self.misses += 1
+            return None
+        if self.verify_hash and row[2] != file_hash(path):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [ContentRecord(*r) for r in json.loads(row[4])]
+
+    def put(self, path: str, size: int, mtime_ns: int, records: List[ContentRecord]):
+        digest = file_hash(path) if self.verify_hash else None
+        data = json.dumps([tuple(r) for r in records], ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, hash, format, records)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, digest, CACHE_FORMAT_VERSION, data),
+            )
+            self._conn.commit()
+
+    def is_fresh(self, path: str, size: int, mtime_ns: int) -> bool:
+        """Быстрая проверка ключа без чтения самих записей."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, format FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        return row is not None and tuple(row) == (size, mtime_ns, CACHE_FORMAT_VERSION)
+
+    def discard(self, path: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def read_records(path: str) -> List[ContentRecord]:
+    """Полный разбор файла локализации: .loca читается напрямую, остальное — как XML."""
+    if is_loca(path):
+        return list(iter_loca_contents(path))
+    return list(iter_contents(path))
+
+
+def load_records(path: str, cache: Optional[ParseCache] = None) -> List[ContentRecord]:
+    """
+    Записи <content> файла: из кэша, если ключ не изменился,
+    иначе полным разбором с последующим сохранением в кэш.
+    """
+    with span("extract.load_records", path=path) as s:
+        if cache is None:
+            records = read_records(path)
+            s.set("rows", len(records))
+            return records
+        st = os.stat(path)
+        s.set("bytes", st.st_size)
+        records = cache.get(path, st.st_size, st.st_mtime_ns)
+        s.set("cache_hit", records is not None)
+        if records is None:
+            records = read_records(path)
+            cache.put(path, st.st_size, st.st_mtime_ns, records)
+        s.set("rows", len(records))
+        return records
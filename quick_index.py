@@ -0,0 +1,127 @@
+# quick_index.py
+
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from loca_format import ENTRY, HEADER, LOCA_SIGNATURE, is_loca
+from mod_scanner import ModManifest
+from tracing import record_span
+
+# Побайтовый поиск по отображению файла, без разбора XML. Текст записи
+# берётся до первого «<» — для строк с вложенной разметкой это начало текста.
+_CONTENT_RE = re.compile(rb"<content\b")
+_UID_RE = re.compile(rb"\scontentuid=")
+# Кириллица U+0400–U+04FF в UTF-8: ведущий байт D0–D3 и байт продолжения
+_CYRILLIC = rb"[\xd0-\xd3][\x80-\xbf]"
+_TRANSLATED_RE = re.compile(rb"<content\b[^>]*>[^<]*?" + _CYRILLIC)
+_CYRILLIC_RE = re.compile(_CYRILLIC)
+
+
+@dataclass
+class QuickFileStats:
+    """Быстрая оценка файла локализации без полного разбора."""
+    path: str
+    size: int
+    entries: int = 0
+    uids: int = 0          # записи с contentuid (остальные сопоставляются по позиции)
+    translated: int = 0    # записи с кириллицей в тексте (считаются только по запросу)
+    error: Optional[str] = None
+
+
+@dataclass
+class ModQuickStats:
+    """Сводка по моду: строки english, байты всех файлов, доля переведённого в russian."""
+    strings: int = 0
+    bytes: int = 0
+    translated: int = 0
+    has_english: bool = False
+    files: Dict[str, QuickFileStats] = field(default_factory=dict)
+
+    @property
+    def percent(self) -> Optional[float]:
+        """Процент переведённых строк; None, если у мода нет english."""
+        if not self.has_english:
+            return None
+        if not self.strings:
+            return 100.0
+        return min(self.translated, self.strings) * 100.0 / self.strings
+
+
+def _scan_loca(mm, stats: QuickFileStats, count_translated: bool):
+    if len(mm) < HEADER.size:
+        raise ValueError("Файл короче заголовка .loca")
+    signature, count, texts_offset = HEADER.unpack_from(mm, 0)
+    if signature != LOCA_SIGNATURE or HEADER.size + count * ENTRY.size > len(mm):
+        raise ValueError("Неверный заголовок .loca")
+    stats.entries = count
+    offset = texts_offset
+    table = memoryview(mm)[HEADER.size:HEADER.size + count * ENTRY.size]
+    try:
+        for key, _, length in ENTRY.iter_unpack(table):
+            if key[:1] != b"\0":
+                stats.uids += 1
+            if count_translated and _CYRILLIC_RE.search(mm, offset, offset + length):
+                stats.translated += 1
+            offset += length
+    finally:
+        table.release()
+    if offset > len(mm):
+        raise ValueError("Тексты записей выходят за пределы файла")
+
+
+def quick_scan_file(path: str, size: int = None, count_translated: bool = False) -> QuickFileStats:
+    """
+    Считает записи файла (.xml — по `<content`, .loca — по заголовку),
+    записи с contentuid и (если count_translated) записи с кириллицей
+    в тексте, просматривая отображённый в память файл регулярками по байтам.
+    Подсчёт кириллицы — самый дорогой проход, он нужен только для russian.
+    """
+    stats = QuickFileStats(path, size if size is not None else 0)
+    try:
+        with open(path, "rb") as f:
+            stats.size = os.fstat(f.fileno()).st_size
+            if not stats.size:
+                return stats
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if is_loca(path):
+                    _scan_loca(mm, stats, count_translated)
+                else:
+                    stats.entries = len(_CONTENT_RE.findall(mm))
+                    stats.uids = len(_UID_RE.findall(mm))
+                    if count_translated:
+                        stats.translated = len(_TRANSLATED_RE.findall(mm))
+    except (OSError, ValueError) as e:
+        stats.error = str(e)
+    return stats
+
+
+def quick_index_mod(manifest: ModManifest) -> ModQuickStats:
+    """Быстрая сводка по моду; результат сохраняется в manifest.quick."""
+    started = time.perf_counter()
+    result = ModQuickStats()
+    for f in manifest.files:
+        stats = quick_scan_file(f.path, f.size, count_translated=f is manifest.russian)
+        result.files[f.path] = stats
+        result.bytes += stats.size
+    if manifest.english is not None:
+        result.has_english = True
+        result.strings = result.files[manifest.english.path].entries
+    if manifest.russian is not None:
+        result.translated = result.files[manifest.russian.path].translated
+    manifest.quick = result
+    record_span("scan.quick_index", started, mod=manifest.name,
+                files=len(result.files), strings=result.strings)
+    return result
+
+
+def quick_index_mods(manifests: List[ModManifest], max_workers: int = None) -> List[ModQuickStats]:
+    """Параллельная быстрая сводка по модам (чтение файлов идёт в пуле потоков)."""
+    if max_workers is None:
+        max_workers = min(16, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(quick_index_mod, manifests))
@@ -0,0 +1,101 @@
+# rate_control.py
+
+import random
+import threading
+import time
+
+# Состояния предохранителя
+BREAKER_CLOSED = "closed"        # запросы идут как обычно
+BREAKER_OPEN = "open"            # пауза после серии ошибок
+BREAKER_HALF_OPEN = "half_open"  # пробный одиночный запрос
+
+
+class AdaptiveRateController:
+    """
+    Подстраивает число одновременных запросов к переводчику под то,
+    что он выдерживает (AIMD): после каждого «круга» успешных ответов
+    лимит растёт на 1, на ошибке — делится пополам, а следующий запрос
+    откладывается с экспоненциальной задержкой и случайным разбросом.
+    Если ответ медленнее target_latency в два раза, лимит уменьшается.
+
+    Серия из failure_threshold ошибок подряд размыкает предохранитель:
+    запросы не отправляются cooldown секунд (каждое повторное размыкание
+    удваивает паузу до max_cooldown), затем уходит один пробный запрос.
+    """
+
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1,
+                 target_latency: float = None, base_backoff: float = 1.0,
+                 max_backoff: float = 60.0, failure_threshold: int = 5,
+                 cooldown: float = 30.0, max_cooldown: float = 600.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.target_latency = target_latency
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.limit = self.max_concurrency
+        self.latency = None  # скользящее среднее задержки ответа
+        self.state = BREAKER_CLOSED
+        self.consecutive_failures = 0
+        self.breaker_trips = 0
+        self._successes = 0
+        self._cooldown = cooldown
+        self._not_before = 0.0
+        self._lock = threading.Lock()
+
+    # ---------- Решение об отправке ----------
+    def delay(self) -> float:
+        """Сколько секунд ждать до следующей отправки (0 — можно сейчас)."""
+        with self._lock:
+            remaining = self._not_before - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if self.state == BREAKER_OPEN:
+                self.state = BREAKER_HALF_OPEN
+            return 0.0
+
+    def can_submit(self, in_flight: int) -> bool:
+        if self.delay() > 0:
+            return False
+        with self._lock:
+            if self.state == BREAKER_HALF_OPEN:
+                return in_flight == 0
+            return in_flight < self.limit
+
+    # ---------- Обратная связь ----------
+    def on_success(self, latency: float):
+        with self._lock:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.consecutive_failures = 0
+            if self.state != BREAKER_CLOSED:
+                self.state = BREAKER_CLOSED
+                self._cooldown = self.base_cooldown
+            if self.target_latency and latency > 2 * self.target_latency:
+                self.limit = max(self.min_concurrency, self.limit - 1)
+                self._successes = 0
+                return
+            self._successes += 1
+            if self._successes >= self.limit:
+                self._successes = 0
+                if not self.target_latency or self.latency <= self.target_latency:
+                    self.limit = min(self.max_concurrency, self.limit + 1)
+
+    def on_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self.consecutive_failures += 1
+            self._successes = 0
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.consecutive_failures - 1))
+            self._not_before = max(self._not_before, now + backoff * random.uniform(0.5, 1.0))
+            reopen = self.state == BREAKER_HALF_OPEN
+            if reopen or self.consecutive_failures >= self.failure_threshold:
+                if self.state != BREAKER_OPEN:
+                    self.breaker_trips += 1
+                if reopen:
+                    self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self.state = BREAKER_OPEN
+                self._not_before = max(self._not_before, now + self._cooldown)
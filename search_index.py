@@ -0,0 +1,229 @@
+# search_index.py
+
+import re
+import sys
+import threading
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from tracing import span
+
+COLUMN_ORIGINAL = 0
+COLUMN_TRANSLATION = 1
+
+# Документ — ячейка таблицы, закодированная одним int:
+# (id файла << ROW_BITS + 1) | (строка << 1) | колонка
+ROW_BITS = 24
+_ROW_MASK = (1 << ROW_BITS) - 1
+
+# Префиксный поиск включается с этой длины терма: короче — только точное слово
+MIN_PREFIX_LENGTH = 2
+
+# Экранированная разметка (&lt;LSTag ...&gt;) и сущности в текст не входят
+_MARKUP_RE = re.compile(r"&lt;.*?&gt;|&[a-z]+;|<[^>]*>")
+_TOKEN_RE = re.compile(r"\w+")
+
+SearchHit = namedtuple("SearchHit", ["path", "mod", "row", "column", "text"])
+
+
+def tokenize(text: str) -> List[str]:
+    """Слова текста в нижнем регистре, без разметки."""
+    if not text:
+        return []
+    if "&" in text or "<" in text:
+        text = _MARKUP_RE.sub(" ", text)
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _encode(file_id: int, row: int, column: int) -> int:
+    return (file_id << (ROW_BITS + 1)) | (row << 1) | column
+
+
+def _decode(doc: int):
+    return doc >> (ROW_BITS + 1), (doc >> 1) & _ROW_MASK, doc & 1
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс по строкам всех загруженных файлов:
+    слово → множество ячеек (файл, строка, колонка). Термы запроса
+    объединяются по И, каждый терм ищется как префикс слова (по
+    отсортированному словарю через bisect). Потокобезопасен: файлы
+    добавляются из фонового загрузчика, запросы идут из GUI.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._postings: Dict[str, set] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+        self._paths: List[Optional[str]] = []
+        self._mods: List[Optional[str]] = []
+        self._texts: List[Optional[Sequence[str]]] = []
+        self._file_ids: Dict[str, int] = {}
+        # Слова каждого файла — чтобы снять его из индекса без повторного разбора
+        self._file_tokens: Dict[int, set] = {}
+        # Переводы хранятся разреженно: {документ: текст}
+        self._translations: Dict[int, str] = {}
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._file_ids
+
+    @property
+    def file_count(self) -> int:
+        return len(self._file_ids)
+
+    @property
+    def token_count(self) -> int:
+        return len(self._postings)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    # ---------- Наполнение ----------
+    def add_file(self, path: str, mod: str, originals: Sequence[str], replace: bool = True):
+        """
+        Индексирует оригиналы файла. Повторное добавление заменяет файл
+        (вместе с его переводами); с replace=False уже проиндексированный
+        файл остаётся как есть.
+        """
+        if not replace and path in self._file_ids:
+            return
+        originals = [sys.intern(t) if t else "" for t in originals]
+        with span("search.index_file", path=path, rows=len(originals)):
+            # Постинги файла собираются без блокировки (относительные номера ячеек),
+            # под блокировкой они только сдвигаются на id файла и сливаются
+            local = defaultdict(list)
+            for row, text in enumerate(originals):
+                doc = row << 1
+                for token in set(tokenize(text)):
+                    local[token].append(doc)
+            with self._lock:
+                if not replace and path in self._file_ids:
+                    return
+                self._remove_file_locked(path)
+                file_id = len(self._paths)
+                self._paths.append(path)
+                self._mods.append(mod)
+                self._texts.append(originals)
+                self._file_ids[path] = file_id
+                base = file_id << (ROW_BITS + 1)
+                for token, docs in local.items():
+                    existing = self._postings.get(token)
+                    if existing is None:
+                        self._postings[token] = {base | d for d in docs}
+                        self._sorted_tokens = None
+                    else:
+                        existing.update([base | d for d in docs])
+                self._file_tokens[file_id] = set(local)
+
+    def remove_file(self, path: str):
+        with self._lock:
+            self._remove_file_locked(path)
+
+    def update_translations(self, path: str, updates: Dict[int, str]):
+        """Переиндексирует колонку перевода для изменённых строк {строка: текст}."""
+        with self._lock:
+            file_id = self._file_ids.get(path)
+            if file_id is None:
+                return
+            file_tokens = self._file_tokens[file_id]
+            for row, text in updates.items():
+                doc = _encode(file_id, row, COLUMN_TRANSLATION)
+                old = self._translations.pop(doc, "")
+                for token in set(tokenize(old)):
+                    self._discard_posting(token, doc)
+                if text:
+                    self._translations[doc] = text
+                    for token in tokenize(text):
+                        self._add_posting(token, doc)
+                        file_tokens.add(token)
+
+    def _add_posting(self, token: str, doc: int):
+        docs = self._postings.get(token)
+        if docs is None:
+            self._postings[token] = {doc}
+            self._sorted_tokens = None
+        else:
+            docs.add(doc)
+
+    def _discard_posting(self, token: str, doc: int):
+        docs = self._postings.get(token)
+        if docs is None:
+            return
+        docs.discard(doc)
+        if not docs:
+            del self._postings[token]
+            self._sorted_tokens = None
+
+    def _remove_file_locked(self, path: str):
+        file_id = self._file_ids.pop(path, None)
+        if file_id is None:
+            return
+        lo = file_id << (ROW_BITS + 1)
+        hi = (file_id + 1) << (ROW_BITS + 1)
+        for token in self._file_tokens.pop(file_id):
+            docs = self._postings.get(token)
+            if docs is None:
+                continue
+            docs.difference_update([d for d in docs if lo <= d < hi])
+            if not docs:
+                del self._postings[token]
+                self._sorted_tokens = None
+        for doc in [d for d in self._translations if lo <= d < hi]:
+            del self._translations[doc]
+        # id файла не переиспользуется, освобождаем только данные
+        self._paths[file_id] = None
+        self._mods[file_id] = None
+        self._texts[file_id] = None
+
+    # ---------- Запросы ----------
+    def _docs_for_term(self, term: str) -> set:
+        if len(term) < MIN_PREFIX_LENGTH:
+            return self._postings.get(term, set())
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+        i = bisect_left(tokens, term)
+        matched = []
+        while i < len(tokens) and tokens[i].startswith(term):
+            matched.append(self._postings[tokens[i]])
+            i += 1
+        if len(matched) == 1:
+            return matched[0]
+        return set().union(*matched)
+
+    def search(self, query: str, limit: int = 500,
+               columns: Iterable[int] = (COLUMN_ORIGINAL, COLUMN_TRANSLATION)):
+        """
+        Ячейки, содержащие все слова запроса (как префиксы слов).
+        Возвращает (первые limit попаданий по порядку файлов и строк, всего попаданий).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+        columns = set(columns)
+        with span("search.query", terms=len(terms)) as s, self._lock:
+            sets = sorted((self._docs_for_term(t) for t in terms), key=len)
+            docs = sets[0]
+            for other in sets[1:]:
+                if not docs:
+                    break
+                docs = docs & other
+            if len(columns) < 2:
+                docs = [d for d in docs if (d & 1) in columns]
+            total = len(docs)
+            hits = []
+            for doc in sorted(docs)[:limit]:
+                file_id, row, column = _decode(doc)
+                if column == COLUMN_ORIGINAL:
+                    text = self._texts[file_id][row]
+                else:
+                    text = self._translations.get(doc, "")
+                hits.append(SearchHit(self._paths[file_id], self._mods[file_id], row, column, text))
+            s.set("hits", total)
+        return hits, total
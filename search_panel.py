@@ -0,0 +1,110 @@
+# search_panel.py
+
+import os
+import time
+
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QLabel,
+    QTreeWidget, QTreeWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+
+from search_index import COLUMN_ORIGINAL, COLUMN_TRANSLATION, SearchIndex
+
+# Сколько попаданий показывать в списке (всего найденных может быть больше)
+MAX_RESULTS = 500
+
+
+class SearchPanel(QDockWidget):
+    """
+    Панель поиска по всем загруженным модам: результаты (мод, файл,
+    строка, текст) из SearchIndex, двойной клик/Enter переходит к строке.
+    """
+
+    # путь к файлу, номер строки, колонка
+    result_activated = pyqtSignal(str, int, int)
+
+    SCOPES = [
+        ("Везде", (COLUMN_ORIGINAL, COLUMN_TRANSLATION)),
+        ("Оригинал", (COLUMN_ORIGINAL,)),
+        ("Перевод", (COLUMN_TRANSLATION,)),
+    ]
+
+    def __init__(self, index: SearchIndex, parent=None):
+        super().__init__("Поиск по модам", parent)
+        self.setObjectName("search_panel")
+        self.index = index
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        query_layout = QHBoxLayout()
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Слова или начала слов (все должны встретиться в строке)...")
+        self.query_edit.setClearButtonEnabled(True)
+        query_layout.addWidget(self.query_edit)
+        self.scope_combo = QComboBox()
+        for title, _ in self.SCOPES:
+            self.scope_combo.addItem(title)
+        query_layout.addWidget(self.scope_combo)
+        layout.addLayout(query_layout)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderLabels(["Мод", "Файл", "Строка", "Текст"])
+        self.results.setRootIsDecorated(False)
+        self.results.setUniformRowHeights(True)
+        self.results.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.results.header().setStretchLastSection(True)
+        self.results.itemActivated.connect(self.on_item_activated)
+        layout.addWidget(self.results)
+        self.setWidget(widget)
+
+        # Поиск по мере ввода, но не на каждую клавишу
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(lambda _: self.search_timer.start())
+        self.query_edit.returnPressed.connect(self.run_search)
+        self.scope_combo.currentIndexChanged.connect(lambda _: self.run_search())
+
+    def focus_query(self):
+        self.show()
+        self.raise_()
+        self.query_edit.setFocus()
+        self.query_edit.selectAll()
+
+    def run_search(self):
+        self.search_timer.stop()
+        query = self.query_edit.text().strip()
+        self.results.clear()
+        if not query:
+            self.status_label.clear()
+            return
+
+        started = time.perf_counter()
+        columns = self.SCOPES[self.scope_combo.currentIndex()][1]
+        hits, total = self.index.search(query, limit=MAX_RESULTS, columns=columns)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        items = []
+        for hit in hits:
+            text = hit.text if hit.column == COLUMN_ORIGINAL else f"[перевод] {hit.text}"
+            item = QTreeWidgetItem([hit.mod or "", os.path.basename(hit.path), str(hit.row + 1), text])
+            item.setData(0, Qt.UserRole, (hit.path, hit.row, hit.column))
+            item.setToolTip(1, hit.path)
+            items.append(item)
+        self.results.addTopLevelItems(items)
+
+        shown = f" (показано {len(hits)})" if total > len(hits) else ""
+        self.status_label.setText(
+            f"Найдено: {total}{shown} за {elapsed_ms:.1f} мс; "
+            f"в индексе файлов: {self.index.file_count}"
+        )
+
+    def on_item_activated(self, item: QTreeWidgetItem, column: int = 0):
+        path, row, table_column = item.data(0, Qt.UserRole)
+        self.result_activated.emit(path, row, table_column)
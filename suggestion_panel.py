@@ -0,0 +1,76 @@
+# suggestion_panel.py
+
+import time
+
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+
+from suggestion_service import DEFAULT_LIMIT, SuggestionService
+
+
+class SuggestionPanel(QDockWidget):
+    """
+    Панель подсказок для текущей строки таблицы: похожие оригиналы из
+    всех загруженных модов и их переводы со степенью сходства.
+    Двойной клик/Enter подставляет перевод в текущую строку.
+    """
+
+    # текст перевода выбранной подсказки
+    suggestion_chosen = pyqtSignal(str)
+
+    def __init__(self, service: SuggestionService, parent=None):
+        super().__init__("Подсказки переводов", parent)
+        self.setObjectName("suggestion_panel")
+        self.service = service
+        self.limit = DEFAULT_LIMIT
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderLabels(["%", "Оригинал", "Перевод"])
+        self.results.setRootIsDecorated(False)
+        self.results.setUniformRowHeights(True)
+        self.results.setWordWrap(False)
+        self.results.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.results.header().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.results.header().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.results.itemActivated.connect(self.on_item_activated)
+        layout.addWidget(self.results)
+        self.setWidget(widget)
+
+    def show_for(self, text: str):
+        """Подсказки для оригинала text; запрос укладывается в миллисекунды, фон не нужен."""
+        self.results.clear()
+        if not text or not text.strip() or not self.isVisible():
+            self.status_label.clear()
+            return
+
+        started = time.perf_counter()
+        suggestions = self.service.suggest(text, limit=self.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        items = []
+        for suggestion in suggestions:
+            item = QTreeWidgetItem([f"{suggestion.score * 100:.0f}", suggestion.source, suggestion.target])
+            item.setData(0, Qt.UserRole, suggestion.target)
+            item.setToolTip(1, suggestion.source)
+            item.setToolTip(2, suggestion.target)
+            items.append(item)
+        self.results.addTopLevelItems(items)
+        self.status_label.setText(
+            f"Подсказок: {len(suggestions)} за {elapsed_ms:.1f} мс; "
+            f"известных пар: {len(self.service)}"
+        )
+
+    def clear(self):
+        self.results.clear()
+        self.status_label.clear()
+
+    def on_item_activated(self, item: QTreeWidgetItem, column: int = 0):
+        self.suggestion_chosen.emit(item.data(0, Qt.UserRole))
@@ -0,0 +1,197 @@
+# suggestion_service.py
+
+import threading
+import time
+from array import array
+from collections import Counter, namedtuple
+from typing import Dict, Iterable, List, Tuple
+
+from delta import iter_translated_rows
+from fuzzy_index import similarity
+from search_index import tokenize
+from tracing import record_span
+from translation_memory import normalize_source
+
+# Подсказки ниже этого сходства не показываются
+DEFAULT_MIN_SCORE = 0.5
+DEFAULT_LIMIT = 5
+
+# Сколько записей постингов разрешено просмотреть за запрос. Редкие
+# слова просматриваются всегда, частые («the», «of») — пока хватает
+# бюджета: они почти ничего не отсекают, а стоят дороже всего.
+POSTINGS_BUDGET = 20000
+# Сколько строк с наибольшим числом общих слов проходит фильтр по длине
+# и сколько лучших из них проверяется точным расстоянием
+CANDIDATE_LIMIT = 400
+RERANK_LIMIT = 100
+# Пары добавляются порциями, чтобы не держать блокировку и временные
+# множества слов для сотен тысяч строк разом
+ADD_CHUNK = 2000
+
+Suggestion = namedtuple("Suggestion", ["source", "target", "score"])
+
+
+def translated_pairs(source_records, russian_records) -> List[Tuple[str, str]]:
+    """Пары (оригинал, перевод) из исходного файла и его russian.xml (см. delta.iter_translated_rows)."""
+    return [(original, target) for _, original, target in iter_translated_rows(source_records, russian_records)]
+
+
+class SuggestionService:
+    """
+    Подсказки переводов для редактируемой строки: инвертированный индекс
+    всех известных пар (оригинал, перевод) по словам оригинала. Запрос
+    отбирает кандидатов по числу общих слов (от редких к частым, в пределах
+    бюджета), лучшие из них переоцениваются точным сходством по Левенштейну.
+
+    Индекс только пополняется: повторный оригинал заменяет перевод.
+    Потокобезопасен: пары добавляются из фонового загрузчика, запросы
+    и сохранения идут из GUI.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._ids: Dict[str, int] = {}    # нормализованный оригинал → id
+        self._sources: List[str] = []
+        self._targets: List[str] = []
+        self._keys: List[str] = []        # слова оригинала через пробел — с ними сравнивается запрос
+        self._word_counts = array("I")
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    # ---------- Наполнение ----------
+    def add_pairs(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """Добавляет пары (оригинал, перевод); возвращает число новых оригиналов."""
+        started = time.perf_counter()
+        total = added = 0
+        chunk = []
+        for pair in pairs:
+            chunk.append(pair)
+            if len(chunk) >= ADD_CHUNK:
+                added += self._add_chunk(chunk)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            added += self._add_chunk(chunk)
+            total += len(chunk)
+        record_span("suggest.add_pairs", started, pairs=total, added=added)
+        return added
+
+    def _add_chunk(self, pairs: List[Tuple[str, str]]) -> int:
+        # Слова считаются без блокировки, под ней — только вставка
+        prepared = []
+        for source, target in pairs:
+            normalized = normalize_source(source or "")
+            target = (target or "").strip()
+            if not normalized or not target:
+                continue
+            words = tokenize(normalized)
+            prepared.append((normalized, source, target, " ".join(words), set(words)))
+
+        added = 0
+        with self._lock:
+            for normalized, source, target, key, words in prepared:
+                sid = self._ids.get(normalized)
+                if sid is not None:
+                    self._targets[sid] = target
+                    continue
+                sid = len(self._sources)
+                self._ids[normalized] = sid
+                self._sources.append(source)
+                self._targets.append(target)
+                self._keys.append(key)
+                self._word_counts.append(len(words))
+                for word in words:
+                    posting = self._postings.get(word)
+                    if posting is None:
+                        self._postings[word] = array("I", (sid,))
+                    else:
+                        posting.append(sid)
+                added += 1
+        return added
+
+    # ---------- Запросы ----------
+    def suggest(self, text: str, limit: int = DEFAULT_LIMIT,
+                min_score: float = DEFAULT_MIN_SCORE) -> List[Suggestion]:
+        """До limit самых похожих оригиналов с переводами, по убыванию сходства."""
+        started = time.perf_counter()
+        words = tokenize(text or "")
+        if not words:
+            return []
+        key = " ".join(words)
+
+        with self._lock:
+            exact = self._ids.get(normalize_source(text))
+            candidates = self._candidates(set(words), min_score)
+            scored = []
+            if exact is not None:
+                scored.append((1.0, exact))
+            for sid in candidates:
+                if sid == exact:
+                    continue
+                score = similarity(key, self._keys[sid])
+                if score >= min_score:
+                    scored.append((score, sid))
+            scored.sort(key=lambda item: (-item[0], item[1]))
+            result = [
+                Suggestion(self._sources[sid], self._targets[sid], round(score, 3))
+                for score, sid in scored[:limit]
+            ]
+        record_span("suggest.query", started, candidates=len(candidates), results=len(result))
+        return result
+
+    def _candidates(self, words: set, min_score: float) -> List[int]:
+        """
+        Кандидаты по числу общих слов с запросом. Из строк с наибольшим
+        числом общих слов отбрасываются заведомо непохожие по длине,
+        остальные упорядочиваются по коэффициенту Дайса. Порог по Дайсу
+        мягче min_score: одно исправленное слово сходство по Левенштейну
+        почти не меняет, а по словам — заметно.
+        """
+        size = len(words)
+        postings = sorted(
+            (p for p in (self._postings.get(w) for w in words) if p is not None), key=len
+        )
+        if not postings:
+            return []
+
+        counts = Counter()
+        scanned = 0
+        for posting in postings:
+            if scanned and scanned + len(posting) > POSTINGS_BUDGET:
+                break
+            counts.update(posting)
+            scanned += len(posting)
+
+        if not counts:
+            return []
+        # Порог числа общих слов подбирается по гистограмме так, чтобы
+        # дальше прошло около CANDIDATE_LIMIT строк; из равных на пороге
+        # берутся первые, чтобы запрос из одних частых слов не тормозил
+        histogram = sorted(Counter(counts.values()).items(), reverse=True)
+        above = 0
+        for cutoff, number in histogram:
+            if above + number >= CANDIDATE_LIMIT:
+                break
+            above += number
+        selected = [sid for sid, common in counts.items() if common > cutoff]
+        selected += [sid for sid, common in counts.items() if common == cutoff][:CANDIDATE_LIMIT - above]
+
+        t = max(min(min_score / 2, 0.99), 0.01)
+        min_words, max_words = t * size / (2 - t), (2 - t) * size / t
+        word_counts = self._word_counts
+        ranked = []
+        for sid in selected:
+            other = word_counts[sid]
+            if min_words <= other <= max_words:
+                ranked.append((2 * counts[sid] / (size + other), sid))
+        ranked.sort(reverse=True)
+        return [sid for _, sid in ranked[:RERANK_LIMIT]]
@@ -0,0 +1,104 @@
+# tests/test_contents_cache.py
+
+import sys
+
+import pytest
+
+from contents_cache import ContentsCache, estimate_size
+from file_contents import FileContents
+from xml_extractor import ContentRecord
+
+
+def _contents(path, rows=10):
+    return FileContents(path, [ContentRecord(f"{path}-{i}", "1", f"{path} text {i}") for i in range(rows)])
+
+
+def _measured_size(contents):
+    """Объём списков, словаря переводов и строк по sys.getsizeof."""
+    strings = [t for t in contents.originals if t] + [u for u in contents.uids if u]
+    total = sum(map(sys.getsizeof, (contents.originals, contents.uids, contents.versions)))
+    total += sum(map(sys.getsizeof, strings))
+    if contents.translations:
+        total += sys.getsizeof(contents.translations)
+        total += sum(sys.getsizeof(row) + sys.getsizeof(text) for row, text in contents.translations.items())
+    return total
+
+
+def test_estimate_tracks_real_memory():
+    contents = FileContents("english.xml", [
+        ContentRecord(f"h{i:08x}g{i:024x}", "1", f"Original text number {i} with some words")
+        for i in range(5000)
+    ])
+    loaded = estimate_size(contents)
+    assert loaded == pytest.approx(_measured_size(contents), rel=0.25)
+
+    before = _measured_size(contents)
+    contents.set_translations(
+        {i: f"Перевод строки номер {i} с несколькими словами" for i in range(0, 5000, 2)}
+    )
+    assert estimate_size(contents) - loaded == pytest.approx(_measured_size(contents) - before, rel=0.25)
+
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    cache = ContentsCache(max_entries=2)
+    cache.put("a", _contents("a"))
+    cache.put("b", _contents("b"))
+    cache.get("a")
+    cache.put("c", _contents("c"))
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_byte_budget_and_total_accounting():
+    one = estimate_size(_contents("a"))
+    cache = ContentsCache(max_entries=10, max_bytes=2 * one + one // 2)
+    for path in "abc":
+        cache.put(path, _contents(path))
+    assert list(cache._entries) == ["b", "c"]
+    assert cache.total_bytes == 2 * one
+
+    cache.put("c", _contents("c", rows=1))  # замена записи не удваивает учёт
+    assert cache.total_bytes == one + estimate_size(_contents("c", rows=1))
+    cache.discard("b")
+    cache.discard("c")
+    assert cache.total_bytes == 0 and len(cache) == 0
+
+
+def test_update_size_after_edits_can_evict_others():
+    cache = ContentsCache(max_entries=10)
+    cache.put("a", _contents("a"))
+    big = _contents("b")
+    cache.put("b", big)
+    cache.max_bytes = cache.total_bytes + 100
+    big.set_translations({i: "Длинный перевод " * 10 for i in range(10)})
+    cache.update_size("b")
+    assert "a" not in cache and "b" in cache
+    assert cache.total_bytes == estimate_size(big)
+
+
+def test_pinned_entries_survive_until_unpinned():
+    cache = ContentsCache(max_entries=1)
+    cache.put("a", _contents("a"))
+    cache.pin("a")
+    cache.put("b", _contents("b"))
+    cache.put("c", _contents("c"))
+    # Закреплённая и самая свежая запись остаются даже сверх лимита
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+    cache.discard("a")
+    assert "a" in cache and cache.is_pinned("a")
+
+    cache.get("c")
+    cache.unpin("a")
+    assert "a" not in cache and len(cache) == 1
+
+
+def test_pin_of_evicted_path_is_ignored_and_forced_discard_unpins():
+    cache = ContentsCache(max_entries=1)
+    cache.pin("missing")
+    assert not cache.is_pinned("missing")
+
+    cache.put("a", _contents("a"))
+    cache.pin("a")
+    cache.discard("a", force=True)
+    assert "a" not in cache and not cache.is_pinned("a")
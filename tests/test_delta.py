@@ -0,0 +1,68 @@
+# tests/test_delta.py
+
+import os
+
+from benchmarks.synthetic_mods import write_localization_xml
+from delta import carry_over, compute_delta, is_translation
+from file_contents import FileContents
+from xml_extractor import ContentRecord
+
+
+def _source(*records):
+    return FileContents("english.xml", [ContentRecord(*r) for r in records])
+
+
+def test_is_translation_accepts_non_cyrillic_targets():
+    assert is_translation("Fireball", "Огненный шар")
+    assert is_translation("Gale", "Гейл")
+    assert is_translation("[1] damage", "[1]")
+    assert not is_translation("Withers", "Withers ")
+    assert not is_translation("Hello", "")
+    assert not is_translation("Hello", " Hello ")
+
+
+def test_compute_delta_classifies_rows():
+    source = _source(
+        ("h1", "1", "Same"),
+        ("h2", "2", "Bumped"),
+        ("h3", "1", "Added"),
+        ("h4", "1", "Untranslated"),
+        ("h5", "1", "Astarion"),
+    )
+    russian = [
+        ContentRecord("h1", "1", "Тот же"),
+        ContentRecord("h2", "1", "Старый перевод"),
+        ContentRecord("h4", "1", "Untranslated"),
+        ContentRecord("h5", "1", "Astarion [1]"),
+        ContentRecord("h9", "1", "Удалённая"),
+    ]
+    delta = compute_delta(source, russian)
+
+    assert delta.carried == {0: "Тот же", 4: "Astarion [1]"}
+    assert delta.changed == {1: "Старый перевод"}
+    assert delta.new == [2]
+    assert delta.untranslated == [3]
+    assert delta.removed == ["h9"]
+    assert delta.pending == [1, 2, 3]
+
+
+def test_carry_over_keeps_non_cyrillic_translations(tmp_path):
+    english = tmp_path / "Localization" / "English" / "english.xml"
+    russian = tmp_path / "Localization" / "Russian" / "russian.xml"
+    rows = [("h1", "1", "Gale"), ("h2", "1", "Hello"), ("h3", "1", "[1] gold")]
+    write_localization_xml(str(english), rows)
+    write_localization_xml(str(russian), [("h1", "1", "Гейл"), ("h2", "1", "Hello"), ("h3", "1", "[1]")])
+    source = FileContents(str(english), [ContentRecord(*r) for r in rows])
+
+    delta = carry_over(source)
+    assert delta.carried == {0: "Гейл", 2: "[1]"}
+    assert delta.untranslated == [1]
+    assert not source.needs_full_write
+    assert list(source) == [("Gale", "Гейл"), ("Hello", ""), ("[1] gold", "[1]")]
+
+
+def test_carry_over_without_russian(tmp_path):
+    english = tmp_path / "Localization" / "English" / "english.xml"
+    write_localization_xml(str(english), [("h1", "1", "Gale")])
+    assert not os.path.exists(tmp_path / "Localization" / "Russian")
+    assert carry_over(FileContents(str(english), [ContentRecord("h1", "1", "Gale")])) is None
@@ -0,0 +1,58 @@
+# tests/test_glossary.py
+
+from glossary import Glossary
+
+TERMS = {
+    "Rage": "Ярость",
+    "Magic Missile": "Волшебная стрела",
+    "Missile": "Снаряд",
+    "Missile Storm": "Буря снарядов",
+    "Fireball": "Огненный шар; огненн",
+}
+
+
+def _found(glossary, text):
+    return [(glossary.terms[term_id].source, text[start:end]) for term_id, start, end in glossary.find(text)]
+
+
+def test_terms_match_whole_words_only():
+    glossary = Glossary(TERMS)
+    assert _found(glossary, "Courage and outrage") == []
+    assert _found(glossary, "Rage, then rage!") == [("Rage", "Rage"), ("Rage", "rage")]
+    assert _found(glossary, "Fireballs") == []
+
+
+def test_overlapping_terms_take_leftmost_longest():
+    glossary = Glossary(TERMS)
+    assert _found(glossary, "Cast Magic Missile now") == [("Magic Missile", "Magic Missile")]
+    # «Magic Missile» и «Missile Storm» пересекаются: берётся левое
+    assert _found(glossary, "Magic Missile Storm") == [("Magic Missile", "Magic Missile")]
+    assert _found(glossary, "A Missile Storm and a Missile") == [
+        ("Missile Storm", "Missile Storm"), ("Missile", "Missile"),
+    ]
+
+
+def test_matching_ignores_case_and_markup():
+    glossary = Glossary(TERMS)
+    text = 'Cast &lt;LSTag Tooltip="Rage"&gt;FIREBALL&lt;/LSTag&gt; with magic   missile'
+    assert _found(glossary, text) == [("Fireball", "FIREBALL"), ("Magic Missile", "magic   missile")]
+
+
+def test_missing_terms_accept_any_alternative_case_insensitively():
+    glossary = Glossary(TERMS)
+    assert glossary.missing_terms("Fireball!", "ОГНЕННОГО ШАРА") == []
+    assert [t.source for t in glossary.missing_terms("Fireball and Rage", "Шар и гнев")] == \
+        ["Fireball", "Rage"]
+
+
+def test_pretranslate_uses_first_alternative_and_keeps_the_rest():
+    glossary = Glossary(TERMS)
+    assert glossary.pretranslate("Cast Fireball, then Magic Missile.") == \
+        "Cast Огненный шар, then Волшебная стрела."
+    assert glossary.pretranslate("Courage") == "Courage"
+
+
+def test_empty_terms_and_translations_are_ignored():
+    glossary = Glossary({"": "Пусто", "Shield": " ; ", "Shield Bash": "Удар щитом"})
+    assert [t.source for t in glossary.terms] == ["Shield Bash"]
+    assert _found(glossary, "Shield only") == []
@@ -0,0 +1,69 @@
+# tests/test_loca_format.py
+
+import pytest
+
+from loca_format import (
+    HEADER, LocaFormatError, iter_loca_contents, write_loca, write_translated_loca
+)
+from quick_index import quick_scan_file
+from xml_extractor import ContentRecord
+
+RECORDS = [
+    ContentRecord("h1", "1", "Fireball"),
+    ContentRecord("h2", "3", "Fish &amp; chips &lt;br&gt;"),
+    ContentRecord(None, "1", "No key"),
+    ContentRecord("h4", "2", ""),
+    ContentRecord("h5", "1", "Привет"),
+]
+
+
+def test_write_read_round_trip(tmp_path):
+    path = str(tmp_path / "english.loca")
+    write_loca(path, RECORDS)
+    assert list(iter_loca_contents(path)) == RECORDS
+
+
+def test_translated_copy_replaces_only_given_keys(tmp_path):
+    source = str(tmp_path / "english.loca")
+    output = str(tmp_path / "russian.loca")
+    write_loca(source, RECORDS)
+
+    replaced = write_translated_loca(source, output, {"h1": "Огненный шар", "#2": "Без ключа", "h4": ""})
+
+    assert replaced == 2
+    texts = [r.text for r in iter_loca_contents(output)]
+    assert texts == ["Огненный шар", "Fish &amp; chips &lt;br&gt;", "Без ключа", "", "Привет"]
+
+
+def test_quick_scan_counts_entries_uids_and_translations(tmp_path):
+    path = str(tmp_path / "russian.loca")
+    write_loca(path, RECORDS)
+    stats = quick_scan_file(path, count_translated=True)
+    assert stats.error is None
+    assert (stats.entries, stats.uids, stats.translated) == (5, 4, 1)
+
+
+def test_bad_signature(tmp_path):
+    path = tmp_path / "english.loca"
+    write_loca(str(path), RECORDS)
+    data = bytearray(path.read_bytes())
+    data[:4] = b"LOCX"
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(LocaFormatError):
+        list(iter_loca_contents(str(path)))
+    assert quick_scan_file(str(path)).error
+
+
+@pytest.mark.parametrize("keep", [0, HEADER.size - 1, HEADER.size + 10, -3])
+def test_truncated_file(tmp_path, keep):
+    path = tmp_path / "english.loca"
+    write_loca(str(path), RECORDS)
+    data = path.read_bytes()
+    path.write_bytes(data[:keep])
+
+    with pytest.raises(LocaFormatError):
+        list(iter_loca_contents(str(path)))
+    stats = quick_scan_file(str(path))
+    # Пустой файл — не ошибка быстрой сводки, просто ноль записей
+    assert stats.error or (keep == 0 and stats.entries == 0)
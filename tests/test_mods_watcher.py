@@ -0,0 +1,46 @@
+# tests/test_mods_watcher.py
+
+import os
+import time
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt5.QtCore")
+
+from benchmarks.synthetic_mods import write_localization_xml  # noqa: E402
+from mod_scanner import scan_mod  # noqa: E402
+from mods_watcher import ModsWatcher  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def _wait_for(app, predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not predicate():
+        app.processEvents()
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_russian_created_after_scan_is_detected(app, tmp_path):
+    mod = tmp_path / "UnpackedMods" / "SomeMod"
+    localization = mod / "Localization"
+    write_localization_xml(str(localization / "English" / "english.xml"), [("h1", "1", "Hello")])
+
+    manifests = {"SomeMod": scan_mod(str(mod), "SomeMod")}
+    watcher = ModsWatcher(str(tmp_path / "UnpackedMods"), manifests, debounce_ms=50)
+    changes = []
+    watcher.mod_changed.connect(lambda manifest, added, removed, modified: changes.append((manifest, added)))
+
+    # Сначала пустая папка Russian, файл — позже, после обработки первого события
+    os.makedirs(localization / "Russian")
+    _wait_for(app, lambda: str(localization / "Russian") in watcher._watcher.directories())
+    russian = localization / "Russian" / "russian.xml"
+    write_localization_xml(str(russian), [("h1", "1", "Привет")])
+
+    assert _wait_for(app, lambda: any(str(russian) in added for _, added in changes))
+    assert changes[-1][0].russian.path == str(russian)
+    watcher.stop()
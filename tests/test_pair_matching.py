@@ -0,0 +1,36 @@
+# tests/test_pair_matching.py
+
+import sqlite3
+
+from pair_matching import exact_pair_updates, fuzzy_pair_updates, import_pairs_file
+
+
+def test_empty_translation_does_not_block_fuzzy_match():
+    contents = [["Hello there", ""], ["Fire bolt", ""]]
+    # Так выглядят пары из диалога импорта: непереведённые строки с пустым переводом
+    pairs = {"Hello there": "", "Fire bolt": "", "Hello there!": "Привет!"}
+
+    assert exact_pair_updates(contents, pairs) == {}
+    assert fuzzy_pair_updates(contents, pairs) == {0: "Привет!"}
+
+
+def test_exact_match_wins_over_fuzzy():
+    contents = [["Fire bolt", ""], ["Fire bolts", ""]]
+    pairs = {"Fire bolt": "Огненный снаряд"}
+
+    exact = exact_pair_updates(contents, pairs)
+    assert exact == {0: "Огненный снаряд"}
+    assert fuzzy_pair_updates(contents, pairs, skip_rows=exact) == {1: "Огненный снаряд"}
+
+
+class LockedMemory:
+    def store_many(self, pairs, origin):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_memory_error_is_reported(tmp_path):
+    path = tmp_path / "pairs.txt"
+    path.write_text("Fire bolt|Огненный снаряд\n", encoding="utf-8")
+
+    result = import_pairs_file(str(path), [["Fire bolt", ""]], memory=LockedMemory())
+    assert "database is locked" in result.error
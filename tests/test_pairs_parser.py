@@ -0,0 +1,35 @@
+# tests/test_pairs_parser.py
+
+from pairs_parser import load_pairs_file, parse_translation_pairs, split_text_pairs
+
+TEXT = "\n".join([
+    "Fireball|Огненный шар",
+    "Untranslated|",
+    "Blank |   ",
+    "|Без оригинала",
+    "Shield|Щит",
+])
+
+
+def test_empty_translations_are_skipped():
+    assert parse_translation_pairs(TEXT) == {"Fireball": "Огненный шар", "Shield": "Щит"}
+
+
+def test_file_and_dialog_give_same_pairs(tmp_path):
+    pipe = tmp_path / "pairs.txt"
+    pipe.write_text(TEXT, encoding="utf-8")
+    csv_file = tmp_path / "pairs.csv"
+    csv_file.write_text("Fireball,Огненный шар\nUntranslated,\nShield,Щит\n", encoding="utf-8")
+
+    expected = parse_translation_pairs(TEXT)
+    assert load_pairs_file(str(pipe)) == expected
+    assert load_pairs_file(str(csv_file)) == expected
+
+
+def test_splitter_and_import_agree():
+    text = "Hello 5 | Привет 5\nFire | Огонь Ice | Лёд\nUntranslated|"
+    pairs = split_text_pairs(text)
+    assert pairs == [("Hello 5", "Привет 5"), ("Fire", "Огонь"), ("Ice", "Лёд")]
+    # Вывод разделителя, вставленный в диалог импорта, даёт те же пары
+    splitted = "\n".join(f"{english} | {russian}" for english, russian in pairs)
+    assert parse_translation_pairs(splitted) == parse_translation_pairs(text) == dict(pairs)
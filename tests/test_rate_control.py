@@ -0,0 +1,105 @@
+# tests/test_rate_control.py
+
+import pytest
+
+import rate_control
+from rate_control import (
+    BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN, AdaptiveRateController
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_control.time, "monotonic", clock)
+    # Без случайного разброса: задержка ровно base_backoff * 2^(n-1)
+    monkeypatch.setattr(rate_control.random, "uniform", lambda a, b: b)
+    return clock
+
+
+def test_additive_increase_after_a_round_of_successes(clock):
+    controller = AdaptiveRateController(max_concurrency=8)
+    controller.limit = 3
+    for _ in range(2):
+        controller.on_success(0.1)
+    assert controller.limit == 3
+    controller.on_success(0.1)
+    assert controller.limit == 4
+    for _ in range(100):
+        controller.on_success(0.1)
+    assert controller.limit == 8
+
+
+def test_multiplicative_decrease_and_backoff(clock):
+    controller = AdaptiveRateController(max_concurrency=8, min_concurrency=2, base_backoff=1.0)
+    controller.on_failure()
+    assert controller.limit == 4
+    assert controller.delay() == pytest.approx(1.0)
+    assert not controller.can_submit(0)
+
+    controller.on_failure()
+    assert controller.limit == 2
+    assert controller.delay() == pytest.approx(2.0)
+    controller.on_failure()
+    assert controller.limit == 2  # не ниже min_concurrency
+
+    clock.now += 10
+    assert controller.can_submit(1) and not controller.can_submit(2)
+
+
+def test_slow_responses_shrink_the_limit(clock):
+    controller = AdaptiveRateController(max_concurrency=4, target_latency=1.0)
+    controller.on_success(2.5)
+    assert controller.limit == 3
+    # Медленный по среднему ответ лимит не растит
+    for _ in range(3):
+        controller.on_success(1.5)
+    assert controller.limit == 3
+
+
+def test_breaker_opens_probes_and_closes(clock):
+    controller = AdaptiveRateController(max_concurrency=4, failure_threshold=3,
+                                        base_backoff=0.1, cooldown=30.0)
+    for _ in range(3):
+        controller.on_failure()
+    assert controller.state == BREAKER_OPEN and controller.breaker_trips == 1
+    clock.now += 29
+    assert controller.delay() > 0 and controller.state == BREAKER_OPEN
+
+    clock.now += 2
+    assert controller.delay() == 0 and controller.state == BREAKER_HALF_OPEN
+    # В полуоткрытом состоянии уходит один пробный запрос
+    assert controller.can_submit(0) and not controller.can_submit(1)
+
+    controller.on_success(0.1)
+    assert controller.state == BREAKER_CLOSED and controller.consecutive_failures == 0
+
+
+def test_failed_probe_reopens_with_doubled_cooldown(clock):
+    controller = AdaptiveRateController(max_concurrency=4, failure_threshold=2, base_backoff=0.1,
+                                        cooldown=30.0, max_cooldown=50.0)
+    controller.on_failure()
+    controller.on_failure()
+    clock.now += 31
+    controller.delay()
+    assert controller.state == BREAKER_HALF_OPEN
+
+    controller.on_failure()
+    assert controller.state == BREAKER_OPEN and controller.breaker_trips == 2
+    assert controller.delay() == pytest.approx(50.0)  # 60 с ограничены max_cooldown
+
+    clock.now += 51
+    controller.delay()
+    controller.on_success(0.1)
+    # После закрытия пауза снова начинается с исходной
+    controller.on_failure()
+    controller.on_failure()
+    assert controller.delay() == pytest.approx(30.0)
@@ -0,0 +1,78 @@
+# tests/test_search_index.py
+
+import glob
+
+from benchmarks.synthetic_mods import SyntheticConfig, generate_unpacked_mods
+from mod_loader import ModLoader
+from search_index import COLUMN_ORIGINAL, COLUMN_TRANSLATION, SearchIndex, tokenize
+
+
+def _rows(hits):
+    return [(h.path, h.row, h.column) for h in hits]
+
+
+def test_tokenize_drops_markup_and_folds_case():
+    assert tokenize('Deal &lt;LSTag Tooltip="Damage"&gt;Damage&lt;/LSTag&gt; &amp; FLEE') == \
+        ["deal", "damage", "flee"]
+
+
+def test_terms_are_prefixes_joined_with_and():
+    index = SearchIndex()
+    index.add_file("a.xml", "A", ["Fireball deals fire damage", "Fire Bolt", "Ice Storm"])
+    index.add_file("b.xml", "B", ["Firewall"])
+
+    hits, total = index.search("fire")
+    # Попадание — ячейка, а не слово; порядок — по файлам и строкам
+    assert total == 3
+    assert _rows(hits) == [("a.xml", 0, 0), ("a.xml", 1, 0), ("b.xml", 0, 0)]
+    assert index.search("fire", limit=1) == (hits[:1], 3)
+    hits, total = index.search("fire dam")
+    assert _rows(hits) == [("a.xml", 0, COLUMN_ORIGINAL)] and total == 1
+    # Однобуквенный терм ищется только как целое слово
+    assert index.search("f") == ([], 0)
+
+
+def test_translations_are_searchable_per_column():
+    index = SearchIndex()
+    index.add_file("a.xml", "A", ["Fireball", "Ice Storm"])
+    index.update_translations("a.xml", {0: "Огненный шар"})
+
+    hits, _ = index.search("огнен")
+    assert _rows(hits) == [("a.xml", 0, COLUMN_TRANSLATION)]
+    assert index.search("огнен", columns=[COLUMN_ORIGINAL]) == ([], 0)
+
+    index.update_translations("a.xml", {0: ""})
+    assert index.search("огнен") == ([], 0)
+
+
+def test_readding_file_replaces_it_unless_asked_to_keep():
+    index = SearchIndex()
+    index.add_file("a.xml", "A", ["Fireball"])
+    index.update_translations("a.xml", {0: "Огненный шар"})
+
+    index.add_file("a.xml", "A", ["Fireball"], replace=False)
+    assert index.search("шар")[1] == 1
+
+    index.add_file("a.xml", "A", ["Frost ray"])
+    assert index.search("шар") == ([], 0)
+    assert index.search("fireball") == ([], 0)
+    assert index.search("frost")[1] == 1
+
+    index.remove_file("a.xml")
+    assert "a.xml" not in index and index.search("frost") == ([], 0)
+
+
+def test_loader_keeps_translations_of_files_indexed_by_the_gui(tmp_path):
+    generate_unpacked_mods(str(tmp_path), SyntheticConfig(mods=2, strings_per_file=20, russian_fraction=0))
+    unpacked = str(tmp_path / "UnpackedMods")
+    path = sorted(glob.glob(unpacked + "/*/Localization/English/english.xml"))[0]
+
+    index = SearchIndex()
+    # Файл открыт в GUI до того, как до него дошёл загрузчик
+    index.add_file(path, "SyntheticMod0000", ["placeholder"] * 20)
+    index.update_translations(path, {0: "Несохранённая правка"})
+
+    ModLoader(unpacked, search_index=index).run(lambda manifests: None)
+
+    assert index.file_count == 2
+    assert _rows(index.search("несохранённая")[0]) == [(path, 0, COLUMN_TRANSLATION)]
@@ -0,0 +1,78 @@
+# tests/test_suggestions.py
+
+import random
+
+import Levenshtein
+
+from fuzzy_index import FuzzyIndex, match_rows, similarity
+from suggestion_service import SuggestionService
+
+PAIRS = [
+    ("Deal 1d6 fire damage.", "Наносит 1d6 урона огнём."),
+    ("Deal 1d8 fire damage.", "Наносит 1d8 урона огнём."),
+    ("Deal 1d6 cold damage.", "Наносит 1d6 урона холодом."),
+    ("Deal 1d6 cold damage to the target.", "Наносит цели 1d6 урона холодом."),
+    ("Open the door", "Открыть дверь"),
+    ("Untranslated", ""),
+]
+
+
+def _service():
+    service = SuggestionService()
+    service.add_pairs(PAIRS)
+    return service
+
+
+def test_exact_match_comes_first_then_by_similarity():
+    suggestions = _service().suggest("Deal 1d6 fire damage.")
+    assert [s.source for s in suggestions] == [
+        "Deal 1d6 fire damage.", "Deal 1d8 fire damage.", "Deal 1d6 cold damage.",
+    ]
+    assert [s.score for s in suggestions] == [1.0, 0.95, 0.8]
+
+
+def test_min_score_and_limit():
+    service = _service()
+    assert [s.source for s in service.suggest("Deal 1d6 fire damage.", min_score=0.9)] == \
+        ["Deal 1d6 fire damage.", "Deal 1d8 fire damage."]
+    # Сходство длинной строки ≈ 0.47: видна только с порогом ниже умолчания
+    assert len(service.suggest("Deal 1d6 fire damage.", min_score=0.4)) == 4
+    assert len(service.suggest("Deal 1d6 fire damage.", limit=1)) == 1
+    assert service.suggest("Close the window") == []
+    assert service.suggest("  ") == []
+
+
+def test_pairs_without_translation_are_skipped_and_repeats_replace():
+    service = _service()
+    assert len(service) == 5
+    assert service.suggest("Untranslated") == []
+    assert service.add_pairs([("Open  the door", "Открыть двери")]) == 0
+    assert service.suggest("Open the door")[0].target == "Открыть двери"
+
+
+def _brute_force(strings, text, max_distance):
+    distances = ((Levenshtein.distance(text, s), sid) for sid, s in enumerate(strings))
+    return sorted((d, sid) for d, sid in distances if d <= max_distance)
+
+
+def test_fuzzy_index_matches_brute_force():
+    rng = random.Random(7)
+    words = ["fire", "bolt", "ice", "storm", "deal", "damage", "to", "the", "target"]
+    strings = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 5))) for _ in range(300)]
+    index = FuzzyIndex(strings)
+    for text in strings[:40] + ["fire bolts", "dael damage", "x"]:
+        for max_distance in (0, 1, 3):
+            assert index.query(text, max_distance) == _brute_force(strings, text, max_distance)
+
+
+def test_match_rows_prefers_closest_then_earliest_pair():
+    pairs = {
+        "Fire Bolt": "Огненный снаряд",
+        "Fire Bolts": "Огненные снаряды",
+        "Fire Boat": "Огненная лодка",
+        "Fire Bold": "",
+    }
+    rows = {0: "Fire Bolt", 1: "Fire Bolz", 2: "Fire Bol", 3: "Water Bolt"}
+    assert match_rows(pairs, rows, max_distance=1) == {
+        0: "Fire Bolt", 1: "Fire Bolt", 2: "Fire Bolt",
+    }
@@ -0,0 +1,53 @@
+# tests/test_translation_engine.py
+
+import sqlite3
+
+from glossary import Glossary
+from translation_engine import FakeTranslateBackend, TranslationEngine
+from translation_memory import ORIGIN_IMPORT, TranslationMemory
+
+
+def test_pretranslation_reaches_backend_only(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite"))
+    memory.store_many([("Known Fireball text", "Известный перевод")], ORIGIN_IMPORT)
+    glossary = Glossary({"Fireball": "Огненный шар"})
+    engine = TranslationEngine(FakeTranslateBackend(request_latency=0), memory=memory,
+                               prepare=glossary.pretranslate)
+
+    results = {}
+    engine.run([(0, "Cast Fireball"), (1, "Known Fireball text")], results.update)
+
+    assert results == {0: "[ru] Cast Огненный шар", 1: "Известный перевод"}
+    # В память записан перевод под исходным текстом, а не под подставленным
+    assert memory.lookup("Cast Fireball") == "[ru] Cast Огненный шар"
+    assert memory.lookup("Cast Огненный шар") is None
+    memory.close()
+
+
+class LockedMemory:
+    """Память переводов, в которую не удаётся записать первый пакет."""
+
+    def __init__(self):
+        self.stored = []
+
+    def lookup_many(self, texts):
+        return {}
+
+    def store_many(self, pairs, origin):
+        pairs = list(pairs)
+        if not self.stored:
+            self.stored.append(None)
+            raise sqlite3.OperationalError("database is locked")
+        self.stored.extend(pairs)
+
+
+def test_storage_error_fails_batch_and_job_continues():
+    engine = TranslationEngine(FakeTranslateBackend(request_latency=0), batch_size=1,
+                               max_concurrency=1, memory=LockedMemory())
+    results = {}
+    stats = engine.run([(0, "One"), (1, "Two"), (2, "Three")], results.update)
+
+    assert stats.done == 3
+    assert stats.failed == 1
+    assert "OperationalError" in stats.errors[0][1]
+    assert len(results) == 2
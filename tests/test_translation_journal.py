@@ -0,0 +1,57 @@
+# tests/test_translation_journal.py
+
+import json
+
+from translation_journal import TranslationJournal
+
+
+def _journal(tmp_path, **kwargs):
+    return TranslationJournal(str(tmp_path / "jobs" / "english.jsonl"), "english.xml", **kwargs)
+
+
+def test_resume_after_restart(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append_many([("Hello", "Привет"), ("World", "Мир")])
+    journal.append_many([("Hello", "Здравствуй")])
+    journal.close()
+
+    resumed = _journal(tmp_path)
+    assert len(resumed) == 2
+    assert resumed.lookup_many(["Hello", "World", "New"]) == {"Hello": "Здравствуй", "World": "Мир"}
+
+
+def test_torn_last_line_is_skipped_and_not_glued_to_next_entry(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append_many([("Hello", "Привет")])
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"text": "World", "tar')
+
+    resumed = _journal(tmp_path)
+    assert resumed.lookup_many(["Hello", "World"]) == {"Hello": "Привет"}
+    resumed.append_many([("World", "Мир")])
+    resumed.close()
+
+    lines = open(journal.path, encoding="utf-8").read().splitlines()
+    assert json.loads(lines[-1]) == {"text": "World", "target": "Мир"}
+    assert _journal(tmp_path).lookup_many(["Hello", "World"]) == {"Hello": "Привет", "World": "Мир"}
+
+
+def test_journal_for_other_language_starts_over(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append_many([("Hello", "Привет")])
+    journal.close()
+
+    other = _journal(tmp_path, dest="de")
+    assert len(other) == 0
+    other.append_many([("Hello", "Hallo")])
+    other.close()
+    assert _journal(tmp_path, dest="de").lookup_many(["Hello"]) == {"Hello": "Hallo"}
+
+
+def test_discard_removes_the_file(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append_many([("Hello", "Привет")])
+    journal.discard()
+    assert len(_journal(tmp_path)) == 0
+    assert not (tmp_path / "jobs" / "english.jsonl").exists()
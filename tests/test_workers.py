@@ -0,0 +1,36 @@
+# tests/test_workers.py
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt5.QtCore")
+
+from translation_engine import FakeTranslateBackend, TranslationEngine  # noqa: E402
+from workers import TranslationWorker  # noqa: E402
+
+
+class BrokenMemory:
+    """Память переводов, запись в которую падает."""
+
+    def lookup_many(self, texts):
+        return {}
+
+    def store_many(self, pairs, origin):
+        raise RuntimeError("disk full")
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_translation_worker_reports_exception(app):
+    engine = TranslationEngine(FakeTranslateBackend(request_latency=0), memory=BrokenMemory())
+    worker = TranslationWorker(engine, [(0, "Hello")])
+    finished = []
+    worker.finished_with_stats.connect(finished.append)
+
+    # run() в текущем потоке: сигнал доставляется сразу
+    worker.run()
+
+    assert len(finished) == 1
+    assert finished[0].error == "RuntimeError: disk full"
@@ -0,0 +1,53 @@
+# tests/test_xml_extractor.py
+
+import pytest
+
+from xml_extractor import iter_contents
+
+CONTENTS = [
+    "Plain text",
+    "  Padded  ",
+    "Fish &amp; chips",
+    "&lt;LSTag Tooltip=\"Damage\"&gt;Damage&lt;/LSTag&gt; dealt",
+    "Say \"hi\" &apos;now&apos; &gt; later",
+    "<b>Bold only</b>",
+    "<b><i>Deep</i></b>",
+    "Text <b>and tag</b>",
+    "<br/>",
+    "<![CDATA[Raw <b>markup</b> & more]]>",
+    "",
+    "   ",
+    "<!-- note -->",
+    "Привет, мир",
+]
+
+
+def _xml(contents):
+    rows = "\n".join(
+        f'    <content contentuid="h{i}" version="{i + 1}">{text}</content>'
+        for i, text in enumerate(contents)
+    )
+    return f'<?xml version="1.0" encoding="utf-8"?>\n<contentList>\n{rows}\n</contentList>\n'
+
+
+def _soup_texts(xml):
+    """Прежний разбор через BeautifulSoup (до перехода на iterparse)."""
+    bs4 = pytest.importorskip("bs4")
+    soup = bs4.BeautifulSoup(xml, "xml")
+    return [c.decode_contents().strip() if c.string else "" for c in soup.find_all("content")]
+
+
+@pytest.mark.parametrize("text", CONTENTS)
+def test_matches_beautifulsoup_decode_contents(tmp_path, text):
+    path = tmp_path / "english.xml"
+    xml = _xml([text])
+    path.write_text(xml, encoding="utf-8")
+    assert [r.text for r in iter_contents(str(path))] == _soup_texts(xml)
+
+
+def test_records_keep_order_and_attributes(tmp_path):
+    path = tmp_path / "english.xml"
+    path.write_text(_xml(CONTENTS), encoding="utf-8")
+    records = list(iter_contents(str(path)))
+    assert [(r.contentuid, r.version) for r in records] == \
+        [(f"h{i}", str(i + 1)) for i in range(len(CONTENTS))]
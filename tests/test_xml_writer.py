@@ -0,0 +1,71 @@
+# tests/test_xml_writer.py
+
+import pytest
+
+from file_contents import content_key
+from xml_extractor import iter_contents
+from xml_writer import MissingContentError, patch_translated_xml, write_translated_xml
+
+SOURCE = """<?xml version="1.0" encoding="utf-8"?>
+<contentList>
+  <content contentuid="h1" version="1">Hello</content>
+  <content contentuid="h2" version="3">Deal &lt;LSTag Tooltip="Attack"&gt;damage&lt;/LSTag&gt; now</content>
+  <content version="2">No uid</content>
+  <content contentuid="h4" version="5">Untouched</content>
+</contentList>
+"""
+
+
+def _by_key(path):
+    return {content_key(r.contentuid, i): r for i, r in enumerate(iter_contents(path))}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "english.xml"
+    path.write_text(SOURCE, encoding="utf-8")
+    return str(path)
+
+
+def test_write_round_trip(source, tmp_path):
+    output = str(tmp_path / "russian.xml")
+    translations = {
+        "h1": "Привет",
+        "h2": 'Нанести &lt;LSTag Tooltip="Attack"&gt;урон&lt;/LSTag&gt; сейчас',
+        "#2": "Без uid",
+        "h4": "  ",
+    }
+    assert write_translated_xml(source, output, translations) == 3
+
+    before, after = _by_key(source), _by_key(output)
+    assert list(after) == list(before)
+    assert {key: r.text for key, r in after.items()} == {
+        "h1": "Привет",
+        "h2": translations["h2"],
+        "#2": "Без uid",
+        "h4": "Untouched",
+    }
+    assert [(r.contentuid, r.version) for r in after.values()] == \
+        [(r.contentuid, r.version) for r in before.values()]
+    assert open(output, encoding="utf-8").read().endswith("</contentList>\n")
+
+
+def test_patch_updates_only_given_keys(source, tmp_path):
+    output = str(tmp_path / "russian.xml")
+    write_translated_xml(source, output, {"h1": "Привет"})
+
+    assert patch_translated_xml(output, {"h4": "Не тронуто"}) == 1
+    texts = {key: r.text for key, r in _by_key(output).items()}
+    assert texts["h1"] == "Привет"
+    assert texts["h4"] == "Не тронуто"
+    assert texts["#2"] == "No uid"
+
+
+def test_patch_missing_key_keeps_file(source, tmp_path):
+    output = str(tmp_path / "russian.xml")
+    write_translated_xml(source, output, {"h1": "Привет"})
+    original = open(output, "rb").read()
+
+    with pytest.raises(MissingContentError):
+        patch_translated_xml(output, {"h1": "Здравствуй", "missing": "Нет"})
+    assert open(output, "rb").read() == original
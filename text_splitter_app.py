@@ -1,13 +1,14 @@
 # text_splitter_app.py
 
 import sys
-import re
 import pyperclip
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QTextEdit, QPushButton, QVBoxLayout, QLabel, QMessageBox
 )
 
+from pairs_parser import split_text_pairs
+
 
 class TextSplitterApp(QWidget):
     def __init__(self):
@@ -57,19 +58,10 @@ class TextSplitterApp(QWidget):
 
     def process_text(self, input_data: str) -> list:
         """
-        Использует регэксп для поиска пар:
-        (латиница, цифры, знаки) | (кириллица, знаки).
+        Разбивает текст на пары `english | russian` по одной в строке.
+        Тот же разбор, что при импорте пар (см. pairs_parser.parse_pair_line).
         """
-        pattern = re.compile(
-            r'([a-zA-Z0-9\s\.\,\!\?\'\(\)]+)\s*\|\s*([\u0400-\u04FF\s\.\,\!\?\'\(\)]+)'
-        )
-        matches = pattern.findall(input_data)
-        result_lines = []
-        for match in matches:
-            english_part = match[0].strip()
-            russian_part = match[1].strip()
-            result_lines.append(f"{english_part} | {russian_part}")
-        return result_lines
+        return [f"{english} | {russian}" for english, russian in split_text_pairs(input_data)]
 
     def copy_to_clipboard(self):
         """
@@ -0,0 +1,201 @@
+# tracing.py
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+# Путь для Chrome trace (chrome://tracing, Perfetto): включает трассировку при старте
+TRACE_ENV = "BG3LOC_TRACE"
+# Путь для дампа cProfile (pstats) главного потока
+PROFILE_ENV = "BG3LOC_PROFILE"
+# Отчёт о времени запуска: путь к файлу или "-" для stderr
+STARTUP_REPORT_ENV = "BG3LOC_STARTUP_REPORT"
+
+
+class _NullSpan:
+    """Пустой span: возвращается, когда трассировка выключена."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add(self, name: str, value=1):
+        pass
+
+    def set(self, name: str, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Именованный интервал со счётчиками (files, bytes, rows, cache_hits...)."""
+    __slots__ = ("tracer", "name", "counters", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, counters: dict):
+        self.tracer = tracer
+        self.name = name
+        self.counters = counters
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.counters["error"] = exc_type.__name__
+        self.tracer._record(self.name, self.start, end, self.counters)
+        return False
+
+    def add(self, name: str, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value):
+        self.counters[name] = value
+
+
+class Tracer:
+    """
+    Сборщик span'ов для всех потоков. Выключенный трейсер почти ничего
+    не стоит: span() сразу возвращает общий пустой объект.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._events = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._profiler = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._events = []
+        self._origin = time.perf_counter()
+
+    def span(self, name: str, **counters):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, counters)
+
+    def _record(self, name: str, start: float, end: float, counters: dict):
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": counters,
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def export_chrome_trace(self, path: str):
+        """Сохраняет события в формате Chrome trace-event JSON."""
+        with self._lock:
+            events = list(self._events)
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+             "args": {"name": thread_names.get(tid, str(tid))}}
+            for tid in {e["tid"] for e in events}
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"},
+                      f, ensure_ascii=False)
+
+    # ---------- cProfile (профилирует поток, в котором запущен) ----------
+    @property
+    def profiling(self) -> bool:
+        return self._profiler is not None
+
+    def start_profile(self):
+        if self._profiler is None:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self, path: str):
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        self._profiler.dump_stats(path)
+        self._profiler = None
+
+
+tracer = Tracer()
+
+
+def span(name: str, **counters):
+    """Span глобального трейсера: `with span("extract", path=p) as s: s.add("rows")`."""
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return Span(tracer, name, counters)
+
+
+def record_span(name: str, start: float, **counters):
+    """Записывает уже завершившийся интервал (start — значение time.perf_counter())."""
+    if tracer.enabled:
+        tracer._record(name, start, time.perf_counter(), counters)
+
+
+class StartupTimer:
+    """Отметки этапов запуска приложения: импорты, создание окна, первый показ."""
+
+    def __init__(self, started: float = None):
+        self.started = time.perf_counter() if started is None else started
+        self.stages = []  # (название, начало, конец)
+        self._last = self.started
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.stages.append((name, self._last, now))
+        record_span("startup." + name, self._last)
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def report(self) -> str:
+        lines = [f"{name:<24}{(end - start) * 1000:9.1f} мс" for name, start, end in self.stages]
+        lines.append(f"{'итого до первого окна':<24}{self.total * 1000:9.1f} мс")
+        return "\n".join(lines)
+
+    def write_report_from_env(self):
+        target = os.environ.get(STARTUP_REPORT_ENV)
+        if not target:
+            return
+        if target == "-":
+            print(self.report(), file=sys.stderr)
+            return
+        with open(target, "a", encoding="utf-8") as f:
+            f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n" + self.report() + "\n\n")
+
+
+def configure_from_env():
+    """Включает трассировку и профилирование по переменным окружения."""
+    trace_path = os.environ.get(TRACE_ENV)
+    if trace_path:
+        tracer.enable()
+        atexit.register(tracer.export_chrome_trace, trace_path)
+    profile_path = os.environ.get(PROFILE_ENV)
+    if profile_path:
+        tracer.start_profile()
+        atexit.register(tracer.stop_profile, profile_path)
@@ -0,0 +1,259 @@
+# translation_engine.py
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Hashable, List, Sequence, Tuple
+
+from rate_control import AdaptiveRateController
+from tracing import span
+from translation_memory import ORIGIN_MT
+
+
+# ---------- Бэкенды перевода ----------
+class TranslationBackend:
+    """
+    Интерфейс бэкенда: переводит пакет сегментов за один запрос.
+    Метод должен быть потокобезопасным — движок вызывает его
+    из нескольких потоков одновременно.
+    """
+    name = "base"
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        raise NotImplementedError
+
+
+class GoogleTranslateBackend(TranslationBackend):
+    """Google Translate через googletrans; клиент свой у каждого потока."""
+    name = "google"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _translator(self):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            from googletrans import Translator
+            translator = self._local.translator = Translator()
+        return translator
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        results = self._translator().translate(list(texts), src=src, dest=dest)
+        return [r.text for r in results]
+
+
+class FakeTranslateBackend(TranslationBackend):
+    """
+    Локальный бэкенд для тестов и бенчмарков: имитирует задержку
+    запроса и возвращает текст с префиксом языка.
+    """
+    name = "fake"
+
+    def __init__(self, request_latency: float = 0.05, per_segment_latency: float = 0.0):
+        self.request_latency = request_latency
+        self.per_segment_latency = per_segment_latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.request_latency + self.per_segment_latency * len(texts))
+        return [f"[{dest}] {t}" for t in texts]
+
+
+# ---------- Движок пакетного перевода ----------
+class EngineStats:
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.requests = 0
+        self.memory_hits = 0
+        self.resumed = 0  # взято из журнала прерванного задания
+        self.retries = 0
+        self.breaker_trips = 0
+        self.concurrency = 0  # текущий лимит одновременных запросов
+        self.errors = []  # (ключи сегментов, текст ошибки) после всех повторов
+        self.error = None  # задание прервано исключением (см. TranslationWorker)
+        self.cancelled = False
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def failed(self) -> int:
+        return sum(len(keys) for keys, _ in self.errors)
+
+    @property
+    def rate(self) -> float:
+        """Сегментов в секунду с начала работы."""
+        elapsed = self.elapsed or (time.perf_counter() - self.started)
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+
+Segment = Tuple[Hashable, str]
+
+
+class TranslationEngine:
+    """
+    Переводит сегменты пакетами. Одинаковые тексты отправляются один раз,
+    а найденные в журнале задания (journal) или в памяти переводов
+    (memory) не отправляются вовсе. Число одновременных запросов и паузы
+    между ними задаёт AdaptiveRateController: при ошибках и медленных
+    ответах отправка замедляется, неудачный пакет повторяется до
+    max_retries раз. Результаты отдаются через on_batch по мере
+    готовности и сразу дописываются в журнал; cancel() останавливает
+    отправку новых запросов. Если задан prepare, в бэкенд уходит
+    prepare(текст), а журнал и память по-прежнему ключуются исходным текстом.
+    """
+
+    def __init__(self, backend: TranslationBackend, batch_size: int = 25,
+                 max_batch_chars: int = 4500, max_concurrency: int = 4,
+                 src: str = "en", dest: str = "ru", memory=None, journal=None,
+                 max_retries: int = 4, rate_controller: AdaptiveRateController = None,
+                 prepare: Callable[[str], str] = None):
+        self.backend = backend
+        self.prepare = prepare
+        self.memory = memory
+        self.journal = journal
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.rate_controller = rate_controller
+        self.src = src
+        self.dest = dest
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _translate(self, batch: List[str]):
+        """Перевод пакета и время ответа (для подстройки скорости)."""
+        started = time.perf_counter()
+        if self.prepare is not None:
+            batch = [self.prepare(text) for text in batch]
+        with span("translate.request", backend=self.backend.name,
+                  segments=len(batch), chars=sum(len(t) for t in batch)):
+            translated = self.backend.translate_batch(batch, self.src, self.dest)
+        if len(translated) != len(batch):
+            raise ValueError(f"Переводчик вернул {len(translated)} строк вместо {len(batch)}")
+        return translated, time.perf_counter() - started
+
+    def make_batches(self, texts: Sequence[str]) -> List[List[str]]:
+        """Режет уникальные тексты на пакеты по числу сегментов и символов."""
+        batches, batch, chars = [], [], 0
+        for text in texts:
+            if batch and (len(batch) >= self.batch_size
+                          or chars + len(text) > self.max_batch_chars):
+                batches.append(batch)
+                batch, chars = [], 0
+            batch.append(text)
+            chars += len(text)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _take_known(self, source, keys_by_text: dict, stats: EngineStats,
+                    on_batch: Callable[[List[Segment]], None]) -> int:
+        """Отдаёт сегменты, чьи тексты уже переведены в source (журнал или память)."""
+        known = source.lookup_many(keys_by_text)
+        if not known:
+            return 0
+        results = []
+        for text, target in known.items():
+            results.extend((k, target) for k in keys_by_text.pop(text))
+        stats.done += len(results)
+        on_batch(results)
+        return len(results)
+
+    def run(self, segments: Sequence[Segment],
+            on_batch: Callable[[List[Segment]], None],
+            on_progress: Callable[[EngineStats], None] = None) -> EngineStats:
+        """
+        Переводит сегменты (ключ, текст). on_batch получает список
+        (ключ, перевод) для каждого завершённого пакета.
+        """
+        self._cancel.clear()
+        keys_by_text = {}
+        for key, text in segments:
+            keys_by_text.setdefault(text, []).append(key)
+
+        stats = EngineStats(len(segments))
+
+        # Сначала журнал прерванного задания, затем память переводов:
+        # в сеть уходят только промахи
+        if self.journal is not None:
+            stats.resumed = self._take_known(self.journal, keys_by_text, stats, on_batch)
+        if self.memory is not None and keys_by_text:
+            with span("translate.memory_lookup", texts=len(keys_by_text)) as s:
+                stats.memory_hits = self._take_known(self.memory, keys_by_text, stats, on_batch)
+                s.set("cache_hits", stats.memory_hits)
+        if stats.done and on_progress is not None:
+            on_progress(stats)
+
+        controller = self.rate_controller or AdaptiveRateController(self.max_concurrency)
+        queue = deque((batch, 0) for batch in self.make_batches(list(keys_by_text)))
+
+        with ThreadPoolExecutor(max_workers=controller.max_concurrency) as pool:
+            in_flight = {}
+
+            while in_flight or (queue and not self._cancel.is_set()):
+                while queue and not self._cancel.is_set() and controller.can_submit(len(in_flight)):
+                    batch, attempt = queue.popleft()
+                    in_flight[pool.submit(self._translate, batch)] = (batch, attempt)
+                stats.concurrency = controller.limit
+
+                if not in_flight:
+                    # Пауза после ошибок: ждём небольшими шагами, чтобы отмена срабатывала сразу
+                    self._cancel.wait(min(max(controller.delay(), 0.01), 0.5))
+                    continue
+
+                timeout = controller.delay() if queue else None
+                finished, _ = wait(list(in_flight), timeout=timeout or None,
+                                   return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch, attempt = in_flight.pop(future)
+                    stats.requests += 1
+                    try:
+                        translated, latency = future.result()
+                    except Exception as e:
+                        controller.on_failure()
+                        if self._cancel.is_set():
+                            continue  # не ошибка: пакет переведётся при продолжении задания
+                        if attempt < self.max_retries:
+                            stats.retries += 1
+                            queue.appendleft((batch, attempt + 1))
+                            continue
+                        keys = [k for text in batch for k in keys_by_text[text]]
+                        stats.errors.append((keys, f"{type(e).__name__}: {e}"))
+                        stats.done += len(keys)
+                    else:
+                        controller.on_success(latency)
+                        results = []
+                        for text, target in zip(batch, translated):
+                            results.extend((k, target) for k in keys_by_text[text])
+                        # Переполненный диск или занятая база не останавливают задание:
+                        # пакет попадает в отчёт об ошибках и переведётся при повторном запуске
+                        try:
+                            if self.journal is not None:
+                                self.journal.append_many(zip(batch, translated))
+                            if self.memory is not None:
+                                self.memory.store_many(zip(batch, translated), ORIGIN_MT)
+                        except (OSError, sqlite3.Error) as e:
+                            stats.errors.append(([k for k, _ in results], f"{type(e).__name__}: {e}"))
+                        else:
+                            on_batch(results)
+                        stats.done += len(results)
+                    stats.breaker_trips = controller.breaker_trips
+                    if on_progress is not None:
+                        on_progress(stats)
+
+        stats.cancelled = self._cancel.is_set()
+        stats.elapsed = time.perf_counter() - stats.started
+        return stats
@@ -0,0 +1,114 @@
+# translation_journal.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+# Папка журналов автоперевода; лежит рядом с папкой UnpackedMods
+JOURNAL_DIR_NAME = "bg3localith_jobs"
+JOURNAL_FORMAT_VERSION = 1
+
+
+class TranslationJournal:
+    """
+    Журнал задания автоперевода (JSONL): первая строка — заголовок
+    задания, далее по строке на каждый переведённый текст. Записи
+    дописываются и сбрасываются на диск после каждого пакета, поэтому
+    после сбоя или отмены задание продолжается с того же места.
+    Переводы привязаны к тексту оригинала, а не к номеру строки,
+    так что журнал остаётся верным и после правки исходного файла.
+    """
+
+    def __init__(self, path: str, source_path: str, src: str = "en", dest: str = "ru"):
+        self.path = path
+        self.source_path = source_path
+        self.src = src
+        self.dest = dest
+        self._done: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        # Последняя строка оборвана сбоем: следующая запись начнётся с новой строки
+        self._torn_tail = False
+        self._load()
+
+    @classmethod
+    def for_source(cls, main_folder: str, source_path: str, src: str = "en", dest: str = "ru"):
+        digest = hashlib.blake2b(
+            f"{os.path.normcase(os.path.abspath(source_path))}|{src}|{dest}".encode("utf-8"),
+            digest_size=8,
+        ).hexdigest()
+        name = f"{os.path.splitext(os.path.basename(source_path))[0]}-{digest}.jsonl"
+        return cls(os.path.join(main_folder, JOURNAL_DIR_NAME, name), source_path, src, dest)
+
+    def _load(self):
+        """Читает готовые переводы; оборванная последняя строка пропускается."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            header = None
+            line = ""
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if header is None:
+                    header = entry
+                    if (header.get("format") != JOURNAL_FORMAT_VERSION
+                            or header.get("src") != self.src or header.get("dest") != self.dest):
+                        self._done = {}
+                        break
+                    continue
+                if "text" in entry and "target" in entry:
+                    self._done[entry["text"]] = entry["target"]
+            self._torn_tail = bool(line) and not line.endswith("\n")
+        if header is None or not self._done:
+            # Пустой или чужой журнал начинается заново
+            os.remove(self.path)
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def lookup_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        with self._lock:
+            return {t: self._done[t] for t in texts if t in self._done}
+
+    def append_many(self, pairs: Iterable[Tuple[str, str]]):
+        """Дописывает пары (оригинал, перевод) и сбрасывает их на диск."""
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                is_new = not os.path.exists(self.path)
+                self._file = open(self.path, "a", encoding="utf-8")
+                if self._torn_tail and not is_new:
+                    self._file.write("\n")
+                if is_new:
+                    self._write({
+                        "format": JOURNAL_FORMAT_VERSION, "source": self.source_path,
+                        "src": self.src, "dest": self.dest, "created": time.time(),
+                    })
+            for text, target in pairs:
+                self._done[text] = target
+                self._write({"text": text, "target": target})
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def discard(self):
+        """Задание завершено: журнал больше не нужен."""
+        self.close()
+        with self._lock:
+            self._done = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
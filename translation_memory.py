@@ -0,0 +1,109 @@
+# translation_memory.py
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# Имя файла памяти переводов; лежит рядом с папкой UnpackedMods
+MEMORY_FILE_NAME = "bg3localith_tm.sqlite"
+
+# Происхождение перевода
+ORIGIN_MT = "mt"          # машинный перевод
+ORIGIN_IMPORT = "import"  # импортированные пары
+ORIGIN_MANUAL = "manual"  # сохранено из таблицы
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# SQLite ограничивает число параметров в одном запросе
+_LOOKUP_CHUNK = 500
+
+
+def normalize_source(text: str) -> str:
+    """Ключ памяти: текст без крайних пробелов, пробельные серии схлопнуты."""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class TranslationMemory:
+    """
+    Постоянная память переводов (SQLite): нормализованный оригинал →
+    перевод, его происхождение и время последнего изменения.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            " source TEXT PRIMARY KEY,"
+            " target TEXT NOT NULL,"
+            " origin TEXT NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def for_main_folder(cls, main_folder: str) -> "TranslationMemory":
+        return cls(os.path.join(main_folder, MEMORY_FILE_NAME))
+
+    def lookup(self, text: str) -> Optional[str]:
+        return self.lookup_many([text]).get(text)
+
+    def lookup_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        """Переводы для найденных текстов: {исходный текст: перевод}."""
+        by_key = {}
+        for text in texts:
+            by_key.setdefault(normalize_source(text), []).append(text)
+        keys = [k for k in by_key if k]
+
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                for source, target in self._conn.execute(
+                        f"SELECT source, target FROM memory WHERE source IN ({placeholders})", chunk):
+                    for text in by_key[source]:
+                        found[text] = target
+        self.hits += len(found)
+        self.misses += sum(len(v) for v in by_key.values()) - len(found)
+        return found
+
+    def store_many(self, pairs: Iterable[Tuple[str, str]], origin: str):
+        """
+        Записывает пары (оригинал, перевод). Существующая запись
+        обновляется только если перевод действительно изменился.
+        """
+        now = time.time()
+        rows = []
+        for source, target in pairs:
+            key = normalize_source(source)
+            target = target.strip()
+            if key and target:
+                rows.append((key, target, origin, now))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO memory (source, target, origin, updated) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(source) DO UPDATE SET"
+                " target = excluded.target, origin = excluded.origin, updated = excluded.updated"
+                " WHERE memory.target != excluded.target",
+                rows,
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
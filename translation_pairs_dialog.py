@@ -1,12 +1,12 @@
 # translation_pairs_dialog.py
 
-import re
-
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QTextEdit, QRadioButton, QDialogButtonBox
 )
 from PyQt5.QtCore import QSettings
 
+from pairs_parser import parse_translation_pairs, split_text_pairs
+
 
 class TranslationPairsDialog(QDialog):
     def __init__(self, parent=None, initial_text=""):
@@ -51,37 +51,15 @@ class TranslationPairsDialog(QDialog):
         Повторяет логику из TextSplitterApp:
         ищет пары вида `english|russian` и делает переносы.
         """
-        pattern = re.compile(r'([a-zA-Z0-9\s\.\,\!\?\'\(\)]+)\s*\|\s*([\u0400-\u04FF\s\.\,\!\?\'\(\)]+)')
-        matches = pattern.findall(input_data)
-        result_lines = []
-        for match in matches:
-            english_part = match[0].strip()
-            russian_part = match[1].strip()
-            result_lines.append(f"{english_part}|{russian_part}")
-        return "\n".join(result_lines)
+        return "\n".join(f"{english}|{russian}" for english, russian in split_text_pairs(input_data))
 
     def get_pairs(self) -> dict:
         """
         Собирает все пары (оригинал|перевод) из текстового поля.
-        Если все пары были в одной строке, process_text_for_splitting
-        разносит их построчно.
+        Если в строке несколько пар, они разбираются по отдельности
+        (см. pairs_parser.parse_pair_line).
         """
-        text_input = self.text_edit.toPlainText().strip()
-        splitted = self.process_text_for_splitting(text_input)
-        if splitted:
-            text_input = splitted
-
-        lines = text_input.split('\n')
-        translation_map = {}
-        for line in lines:
-            line = line.strip()
-            if '|' in line:
-                parts = line.split('|', 1)
-                original = parts[0].strip()
-                translated = parts[1].strip()
-                if original:
-                    translation_map[original] = translated
-        return translation_map
+        return parse_translation_pairs(self.text_edit.toPlainText())
 
     def get_import_method(self) -> str:
         """
@@ -0,0 +1,136 @@
+# translation_table_model.py
+
+from PyQt5.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, pyqtSignal
+)
+
+from file_contents import FileContents
+
+COLUMN_ORIGINAL = 0
+COLUMN_TRANSLATION = 1
+
+
+class TranslationTableModel(QAbstractTableModel):
+    """
+    Модель таблицы "Оригинал | Перевод" поверх FileContents файла
+    (того же объекта, что лежит в кэше содержимого). Представление
+    запрашивает только видимые ячейки, ничего не копируется.
+    """
+
+    # Номера строк, перевод которых изменился (правкой или пакетно)
+    translations_changed = pyqtSignal(list)
+
+    HEADERS = ["Оригинал", "Перевод"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._contents = FileContents(None)
+
+    def set_contents(self, contents: FileContents):
+        self.beginResetModel()
+        self._contents = contents
+        self.endResetModel()
+
+    def contents(self) -> FileContents:
+        return self._contents
+
+    # ---------- Интерфейс QAbstractTableModel ----------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._contents)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ToolTipRole and index.column() == COLUMN_TRANSLATION:
+            previous = self._contents.previous.get(index.row())
+            if previous:
+                return f"{self._contents.translation(index.row())}\n\nПрежний перевод: {previous}"
+        if role in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole):
+            if index.column() == COLUMN_ORIGINAL:
+                return self._contents.original(index.row())
+            return self._contents.translation(index.row())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        # Колонка оригинала только для чтения
+        if index.column() == COLUMN_TRANSLATION:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() != COLUMN_TRANSLATION:
+            return False
+        row = index.row()
+        value = value or ""
+        if self._contents.translation(row) == value:
+            return False
+        self._contents.set_translation(row, value)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        self.translations_changed.emit([row])
+        return True
+
+    # ---------- Доступ по номеру строки ----------
+    def original(self, row: int) -> str:
+        return self._contents.original(row)
+
+    def translation(self, row: int) -> str:
+        return self._contents.translation(row)
+
+    def set_translations(self, updates: dict):
+        """
+        Пакетно записывает переводы {строка: текст} и сообщает
+        представлению одним dataChanged на весь затронутый диапазон.
+        """
+        changed = []
+        for row, text in updates.items():
+            if self._contents.translation(row) != text:
+                self._contents.set_translation(row, text)
+                changed.append(row)
+        if not changed:
+            return
+        top = self.index(min(changed), COLUMN_TRANSLATION)
+        bottom = self.index(max(changed), COLUMN_TRANSLATION)
+        self.dataChanged.emit(top, bottom, [Qt.DisplayRole, Qt.EditRole])
+        self.translations_changed.emit(changed)
+
+
+class TranslationFilterProxyModel(QSortFilterProxyModel):
+    """Фильтр строк таблицы по подстроке и по отсутствию перевода."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self._only_untranslated = False
+
+    def set_filter_text(self, text: str):
+        self._needle = text.casefold()
+        self.invalidateFilter()
+
+    def set_only_untranslated(self, enabled: bool):
+        self._only_untranslated = enabled
+        self.invalidateFilter()
+
+    def is_filtering(self) -> bool:
+        return bool(self._needle) or self._only_untranslated
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.is_filtering():
+            return True
+        model = self.sourceModel()
+        orig, trans = model.original(source_row), model.translation(source_row)
+        if self._only_untranslated and trans.strip():
+            return False
+        if self._needle:
+            return self._needle in orig.casefold() or self._needle in trans.casefold()
+        return True
@@ -1,26 +1,72 @@
 # translator_app.py
 
+import json
 import os
 import sys
 
-# Сторонние библиотеки
-from googletrans import Translator
-from bs4 import BeautifulSoup
-from lxml import etree
-from Levenshtein import distance as lev_distance
-
 # PyQt5
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QSplitter, QVBoxLayout, QHBoxLayout, QTreeWidget,
-    QTreeWidgetItem, QTableWidget, QTableWidgetItem, QPushButton, QFileDialog,
-    QMessageBox, QHeaderView, QAbstractItemView, QProgressBar
+    QTreeWidgetItem, QTableView, QPushButton, QFileDialog, QLineEdit, QCheckBox,
+    QMessageBox, QHeaderView, QAbstractItemView, QProgressBar, QAction
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QCoreApplication, QSettings, QTimer
 from PyQt5.QtGui import QKeyEvent
 
 # Наши внутренние модули
 from translation_pairs_dialog import TranslationPairsDialog
 from utils import remove_amp
+from mod_loader import ModLoader
+from mods_watcher import ModsWatcher
+from mod_scanner import LocalizationFile
+from parse_cache import ParseCache, load_records
+from search_index import SearchIndex
+from delta import carry_over, is_translation
+from loca_format import is_loca
+from search_panel import SearchPanel
+from suggestion_service import SuggestionService
+from suggestion_panel import SuggestionPanel
+from xml_writer import (
+    write_translated_file, patch_translated_xml, russian_output_path, MissingContentError
+)
+from file_contents import FileContents
+from contents_cache import ContentsCache
+from fuzzy_index import DEFAULT_MAX_DISTANCE
+from pair_matching import exact_pair_updates, fuzzy_pair_updates
+from translation_memory import TranslationMemory, ORIGIN_IMPORT, ORIGIN_MANUAL
+from translation_engine import GoogleTranslateBackend, TranslationEngine
+from translation_journal import TranslationJournal
+from rate_control import AdaptiveRateController
+from workers import (
+    TranslationWorker, ModLoaderWorker, ModRefreshWorker, PairsImportWorker, GlossaryCheckWorker
+)
+from glossary import Glossary, GlossaryJob
+from glossary_panel import GlossaryPanel
+from quick_index import quick_index_mod
+from tracing import span, tracer
+from translation_table_model import (
+    TranslationTableModel, TranslationFilterProxyModel, COLUMN_ORIGINAL, COLUMN_TRANSLATION
+)
+
+
+# Колонки дерева модов
+TREE_COLUMN_NAME = 0
+TREE_COLUMN_STRINGS = 1
+TREE_COLUMN_SIZE = 2
+TREE_COLUMN_TRANSLATED = 3
+# Числовое значение колонки для сортировки (текст «12.3 МБ» и «57%» сортируется неверно)
+TREE_SORT_ROLE = Qt.UserRole + 1
+
+
+class ModTreeItem(QTreeWidgetItem):
+    """Узел дерева модов: числовые колонки сортируются по значению."""
+
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn() if self.treeWidget() else TREE_COLUMN_NAME
+        mine, theirs = self.data(column, TREE_SORT_ROLE), other.data(column, TREE_SORT_ROLE)
+        if mine is not None and theirs is not None:
+            return mine < theirs
+        return super().__lt__(other)
 
 
 class TranslatorApp(QMainWindow):
@@ -49,16 +95,32 @@ class TranslatorApp(QMainWindow):
         self.import_pairs_button.clicked.connect(self.import_translation_pairs)
         self.buttons_layout.addWidget(self.import_pairs_button)
 
+        self.import_file_button = QPushButton("Пары из файла", self)
+        self.import_file_button.clicked.connect(self.import_pairs_from_file)
+        self.buttons_layout.addWidget(self.import_file_button)
+
         self.translate_button = QPushButton("Применить перевод", self)
         self.translate_button.clicked.connect(self.apply_translation)
         self.buttons_layout.addWidget(self.translate_button)
 
+        self.autosave_checkbox = QCheckBox("Автосохранение", self)
+        self.buttons_layout.addWidget(self.autosave_checkbox)
+
+        self.watch_checkbox = QCheckBox("Следить за папкой", self)
+        self.buttons_layout.addWidget(self.watch_checkbox)
+
         self.main_layout.addLayout(self.buttons_layout)
 
-        # 2) Прогресс-бар
+        # 2) Прогресс-бар и отмена загрузки модов
+        self.progress_layout = QHBoxLayout()
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.main_layout.addWidget(self.progress_bar)
+        self.progress_layout.addWidget(self.progress_bar)
+        self.cancel_load_button = QPushButton("Отменить загрузку", self)
+        self.cancel_load_button.setVisible(False)
+        self.cancel_load_button.clicked.connect(self.cancel_loading)
+        self.progress_layout.addWidget(self.cancel_load_button)
+        self.main_layout.addLayout(self.progress_layout)
 
         # 3) Разделитель для структуры слева (дерево) и таблицы справа
         self.splitter = QSplitter()
@@ -66,47 +128,309 @@ class TranslatorApp(QMainWindow):
 
         # 3.1) Дерево слева
         self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Моды и XML файлы"])
+        self.tree.setHeaderLabels(["Моды и XML файлы", "Строк", "Размер", "Перевод"])
+        self.tree.header().setSectionResizeMode(TREE_COLUMN_NAME, QHeaderView.Stretch)
+        self.tree.header().setStretchLastSection(False)
+        for column in (TREE_COLUMN_STRINGS, TREE_COLUMN_SIZE, TREE_COLUMN_TRANSLATED):
+            self.tree.header().setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        # Моды приходят от загрузчика в порядке готовности, дерево сортирует их само
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(0, Qt.AscendingOrder)
         self.tree.itemSelectionChanged.connect(self.on_tree_selection_changed)
         self.splitter.addWidget(self.tree)
 
-        # 3.2) Таблица справа
-        self.table = QTableWidget()
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["Оригинал", "Перевод"])
+        # 3.2) Таблица справа: модель поверх содержимого файла + фильтр
+        self.table_panel = QWidget()
+        self.table_layout = QVBoxLayout(self.table_panel)
+        self.table_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.filter_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Фильтр по оригиналу и переводу...")
+        self.filter_layout.addWidget(self.filter_edit)
+        self.untranslated_checkbox = QCheckBox("Только без перевода")
+        self.filter_layout.addWidget(self.untranslated_checkbox)
+        self.table_layout.addLayout(self.filter_layout)
+
+        self.table_model = TranslationTableModel(self)
+        self.proxy_model = TranslationFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.table_model)
+        self.filter_edit.textChanged.connect(self.proxy_model.set_filter_text)
+        self.untranslated_checkbox.toggled.connect(self.proxy_model.set_only_untranslated)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy_model)
         self.table.verticalHeader().setVisible(False)
+        # Фиксированная высота строк: представление не измеряет все строки
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setWordWrap(False)
         self.table.setEditTriggers(
             QAbstractItemView.DoubleClicked | 
             QAbstractItemView.EditKeyPressed | 
             QAbstractItemView.AnyKeyPressed
         )
-        self.splitter.addWidget(self.table)
+        self.table_layout.addWidget(self.table)
+        self.splitter.addWidget(self.table_panel)
 
         # Клик по ячейке "Оригинал" копирует текст в "Перевод"
-        self.table.itemDoubleClicked.connect(self.on_table_item_double_clicked)
+        self.table.doubleClicked.connect(self.on_table_item_double_clicked)
+        # Правки перевода сразу попадают в кэш содержимого файла
+        self.table_model.translations_changed.connect(self.on_translations_changed)
+
+        # 4) Панель поиска по всем модам (Ctrl+F)
+        self.search_index = SearchIndex()
+        self.search_panel = SearchPanel(self.search_index, self)
+        self.search_panel.result_activated.connect(self.jump_to_row)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.search_panel)
+
+        # 5) Подсказки переводов для текущей строки из всех загруженных модов
+        self.suggestions = SuggestionService()
+        self.suggestion_panel = SuggestionPanel(self.suggestions, self)
+        self.suggestion_panel.suggestion_chosen.connect(self.apply_suggestion)
+        self.suggestion_panel.visibilityChanged.connect(lambda _: self.show_suggestions())
+        self.addDockWidget(Qt.RightDockWidgetArea, self.suggestion_panel)
+        self.table.selectionModel().currentChanged.connect(self.on_current_cell_changed)
+        self.suggestion_row = None  # строка, для которой показаны подсказки
+
+        # 6) Результаты проверки глоссария — вкладкой рядом с поиском
+        self.glossary_panel = GlossaryPanel(self)
+        self.glossary_panel.issue_activated.connect(
+            lambda path, row: self.jump_to_row(path, row, COLUMN_TRANSLATION)
+        )
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.glossary_panel)
+        self.tabifyDockWidget(self.search_panel, self.glossary_panel)
+        self.search_panel.raise_()
 
         # ---------- Логика состояния ----------
         self.main_folder = None
-        self.mods_data = {}
+        self.mods_data = {}  # имя мода -> ModManifest
         self.current_mod_name = None
         self.current_xml_path = None
-        self.current_contents = []
+        self.current_contents = FileContents(None)
+        self.last_scan_stats = None
+
+        # Разобранные XML держим в LRU-кэше, бюджет настраивается через QSettings
+        self.settings = QSettings("MyCompany", "MyApp")
+        self.parse_cache = None  # ParseCache рядом с UnpackedMods, открывается в load_mods
+        self.translation_memory = None  # TranslationMemory рядом с UnpackedMods
+
+        # Автосохранение: сохраняем изменённые строки через паузу после правки
+        self.autosave_checkbox.setChecked(self.settings.value("autosave", "false") == "true")
+        self.autosave_checkbox.toggled.connect(
+            lambda checked: self.settings.setValue("autosave", "true" if checked else "false")
+        )
+        # Слежение за UnpackedMods: изменения подхватываются без полной перезагрузки
+        self.mods_watcher = None
+        self.watch_checkbox.setChecked(self.settings.value("watch_folder", "false") == "true")
+        self.watch_checkbox.toggled.connect(self.on_watch_toggled)
+
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(1500)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.contents_cache = ContentsCache(
+            max_entries=int(self.settings.value("cache_max_entries", 32)),
+            max_bytes=int(self.settings.value("cache_max_mb", 256)) * 1024 * 1024,
+        )
+
+        # Переводчик Googletrans создаётся при первом автопереводе (см. get_translation_backend)
+        self.translation_backend = None
+        self.translation_worker = None
+        self.loader_worker = None
+        self.translation_job = None  # (путь файла, его содержимое, журнал) текущего автоперевода
+        self.pairs_import_worker = None
+        self.pairs_import_job = None  # (путь файла таблицы, его содержимое)
+        # Глоссарий читается из файла (QSettings glossary_path) при первом использовании
+        self.glossary = None
+        self.glossary_worker = None
+        # Моды, изменившиеся на диске, переиндексируются в фоне по одному
+        self.refresh_worker = None
+        self.refresh_queue = []  # (манифест, добавленные и изменённые пути, удалённые пути)
+
+        self.create_view_menu()
+        self.create_glossary_menu()
+        self.create_debug_menu()
+
+    def create_view_menu(self):
+        menu = self.menuBar().addMenu("Вид")
+        menu.addAction(self.search_panel.toggleViewAction())
+        menu.addAction(self.suggestion_panel.toggleViewAction())
+        menu.addAction(self.glossary_panel.toggleViewAction())
+
+    # ---------- Меню "Глоссарий": единообразие терминов ----------
+    def create_glossary_menu(self):
+        menu = self.menuBar().addMenu("Глоссарий")
+
+        load_action = QAction("Загрузить глоссарий...", self)
+        load_action.triggered.connect(self.select_glossary_file)
+        menu.addAction(load_action)
+
+        self.glossary_check_action = QAction("Проверить все моды", self)
+        self.glossary_check_action.triggered.connect(self.check_glossary)
+        menu.addAction(self.glossary_check_action)
+
+        menu.addSeparator()
+        self.glossary_pretranslate_action = QAction(
+            "Подставлять термины перед автопереводом", self, checkable=True
+        )
+        self.glossary_pretranslate_action.setChecked(
+            self.settings.value("glossary_pretranslate", "false") == "true"
+        )
+        self.glossary_pretranslate_action.toggled.connect(
+            lambda checked: self.settings.setValue("glossary_pretranslate", "true" if checked else "false")
+        )
+        menu.addAction(self.glossary_pretranslate_action)
 
-        # Переводчик Googletrans (вместо моделей transformer)
-        self.translator = Translator()
+    def select_glossary_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Файл глоссария", "",
+            "Глоссарий: Термин|Перевод (*.txt *.csv *.tsv);;Все файлы (*)"
+        )
+        if not path:
+            return
+        self.settings.setValue("glossary_path", path)
+        self.glossary = None
+        if self.get_glossary() is not None:
+            self.statusBar().showMessage(f"Глоссарий загружен: {len(self.glossary)} терминов", 5000)
+
+    def get_glossary(self):
+        """Глоссарий из файла, выбранного ранее; None, если файла нет или он не читается."""
+        if self.glossary is None:
+            path = self.settings.value("glossary_path", "")
+            if not path or not os.path.exists(path):
+                return None
+            try:
+                self.glossary = Glossary.from_file(path)
+            except (OSError, ValueError) as e:
+                QMessageBox.critical(self, "Ошибка", f"Не удалось прочитать глоссарий: {str(e)}")
+                return None
+        return self.glossary
+
+    def check_glossary(self):
+        """Проверяет переводы всех загруженных модов; открытые файлы — вместе с несохранёнными правками."""
+        if self.glossary_worker is not None:
+            self.glossary_worker.cancel()
+            return
+        glossary = self.get_glossary()
+        if glossary is None:
+            self.select_glossary_file()
+            glossary = self.get_glossary()
+            if glossary is None:
+                return
+        if not self.mods_data:
+            QMessageBox.warning(self, "Ошибка", "Сначала выберите папку модов.")
+            return
 
-    # ---------- Логика автоперевода ----------
-    def translate_single_sentence(self, sentence: str) -> str:
-        """
-        Переводит один текст через Google Translate (en→ru).
-        """
+        jobs = []
+        for manifest in self.mods_data.values():
+            if manifest.english is None:
+                continue
+            path = manifest.english.path
+            jobs.append(GlossaryJob(
+                path, manifest.name,
+                manifest.russian.path if manifest.russian is not None else None,
+                self.contents_cache.get(path),
+            ))
+
+        self.glossary_panel.show()
+        self.glossary_panel.raise_()
+        self.glossary_panel.set_status(f"Проверка {len(jobs)} файлов по {len(glossary)} терминам...")
+        self.glossary_check_action.setText("Остановить проверку глоссария")
+        worker = GlossaryCheckWorker(glossary, jobs, self.parse_cache, self)
+        worker.progress.connect(
+            lambda done, total: self.glossary_panel.set_status(f"Проверено файлов: {done} из {total}...")
+        )
+        worker.finished_with_report.connect(self.on_glossary_check_finished)
+        self.glossary_worker = worker
+        worker.start()
+
+    def on_glossary_check_finished(self, report):
+        self.glossary_worker.wait()
+        self.glossary_worker = None
+        self.glossary_check_action.setText("Проверить все моды")
+        self.glossary_panel.show_report(report)
+
+    # ---------- Меню "Отладка": трассировка и профилирование ----------
+    def create_debug_menu(self):
+        menu = self.menuBar().addMenu("Отладка")
+
+        self.trace_action = QAction("Записывать трассировку", self, checkable=True)
+        self.trace_action.setChecked(tracer.enabled)
+        self.trace_action.toggled.connect(self.on_trace_toggled)
+        menu.addAction(self.trace_action)
+
+        save_trace_action = QAction("Сохранить трассировку (Chrome trace)...", self)
+        save_trace_action.triggered.connect(self.save_trace)
+        menu.addAction(save_trace_action)
+
+        menu.addSeparator()
+        self.profile_action = QAction("Профилировать (cProfile)", self, checkable=True)
+        self.profile_action.setChecked(tracer.profiling)
+        self.profile_action.toggled.connect(self.on_profile_toggled)
+        menu.addAction(self.profile_action)
+
+    def on_trace_toggled(self, checked: bool):
+        if checked:
+            tracer.reset()
+            tracer.enable()
+        else:
+            tracer.disable()
+
+    def save_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить трассировку", "bg3localith_trace.json", "Chrome trace (*.json)"
+        )
+        if not path:
+            return
         try:
-            result = self.translator.translate(sentence, src='en', dest='ru')
-            return result.text
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при переводе: {str(e)}")
-            return ""
+            tracer.export_chrome_trace(path)
+            self.statusBar().showMessage(f"Трассировка сохранена: {path}", 5000)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить трассировку: {str(e)}")
+
+    def on_profile_toggled(self, checked: bool):
+        if checked:
+            tracer.start_profile()
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить профиль", "bg3localith.prof", "pstats (*.prof)"
+        )
+        if path:
+            tracer.stop_profile(path)
+            self.statusBar().showMessage(f"Профиль сохранён: {path}", 5000)
+        else:
+            # Без файла профилирование продолжается
+            self.profile_action.blockSignals(True)
+            self.profile_action.setChecked(True)
+            self.profile_action.blockSignals(False)
+
+    # ---------- Логика автоперевода ----------
+    def get_translation_backend(self) -> GoogleTranslateBackend:
+        """HTTP-клиент переводчика не нужен для открытия окна — создаём его по требованию."""
+        if self.translation_backend is None:
+            self.translation_backend = GoogleTranslateBackend()
+        return self.translation_backend
+
+    def create_translation_engine(self, journal: TranslationJournal = None,
+                                  prepare=None) -> TranslationEngine:
+        max_concurrency = int(self.settings.value("translate_concurrency", 4))
+        controller = AdaptiveRateController(
+            max_concurrency,
+            target_latency=float(self.settings.value("translate_target_latency", 5.0)),
+            failure_threshold=int(self.settings.value("translate_breaker_threshold", 5)),
+            cooldown=float(self.settings.value("translate_breaker_cooldown", 30.0)),
+        )
+        return TranslationEngine(
+            self.get_translation_backend(),
+            batch_size=int(self.settings.value("translate_batch_size", 25)),
+            max_concurrency=max_concurrency,
+            memory=self.translation_memory,
+            journal=journal,
+            max_retries=int(self.settings.value("translate_max_retries", 4)),
+            rate_controller=controller,
+            prepare=prepare,
+        )
 
     # ---------- Управление таблицей (копирование, очистка и т.п.) ----------
     def keyPressEvent(self, event: QKeyEvent):
@@ -115,34 +439,75 @@ class TranslatorApp(QMainWindow):
                 self.copy_selected_cells()
             elif event.key() == Qt.Key_Backspace:  # CTRL + Backspace
                 self.clear_selected_cells()
+            elif event.key() == Qt.Key_F:  # CTRL + F
+                self.search_panel.focus_query()
         super().keyPressEvent(event)
 
     def copy_selected_cells(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        selected = sorted(self.table.selectedIndexes(), key=lambda i: (i.row(), i.column()))
+        if not selected:
             return
 
         from PyQt5.QtWidgets import QApplication
         clipboard = QApplication.clipboard()
         clipboard.clear()
 
-        text = [item.text() for item in selected_items]
+        text = [index.data() or "" for index in selected]
         clipboard.setText("\n".join(text))
 
     def clear_selected_cells(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        rows = self.selected_source_rows(COLUMN_TRANSLATION)
+        if not rows:
             return
+        self.table_model.set_translations({row: "" for row in rows})
 
-        for item in selected_items:
-            item.setText("")
+    def selected_source_rows(self, column: int) -> list:
+        """Номера строк модели для выделенных ячеек указанной колонки."""
+        rows = set()
+        for index in self.table.selectedIndexes():
+            if index.column() == column:
+                rows.add(self.proxy_model.mapToSource(index).row())
+        return sorted(rows)
 
-    def on_table_item_double_clicked(self, item: QTableWidgetItem):
+    def on_table_item_double_clicked(self, index):
         """При двойном клике по ячейке с оригиналом копируем текст в колонку перевода."""
-        row = item.row()
-        if item.column() == 0:  # колонка "Оригинал"
-            original_text = item.text()
-            self.table.setItem(row, 1, QTableWidgetItem(original_text))
+        if index.column() == COLUMN_ORIGINAL:
+            row = self.proxy_model.mapToSource(index).row()
+            self.table_model.set_translations({row: self.table_model.original(row)})
+
+    # ---------- Подсказки переводов ----------
+    def on_current_cell_changed(self, current, previous):
+        self.show_suggestions()
+
+    def show_suggestions(self):
+        """Подсказки для строки текущей ячейки; повторный запрос для той же строки не делается."""
+        index = self.table.currentIndex()
+        if not index.isValid():
+            self.suggestion_row = None
+            self.suggestion_panel.clear()
+            return
+        row = self.proxy_model.mapToSource(index).row()
+        if row == self.suggestion_row and self.suggestion_panel.results.topLevelItemCount():
+            return
+        self.suggestion_row = row
+        self.suggestion_panel.show_for(self.table_model.original(row))
+
+    def apply_suggestion(self, text: str):
+        index = self.table.currentIndex()
+        if not index.isValid():
+            return
+        row = self.proxy_model.mapToSource(index).row()
+        self.table_model.set_translations({row: text})
+
+    def on_translations_changed(self, rows: list):
+        """Изменённые строки помечаются, файл закрепляется в кэше до сохранения."""
+        if not self.current_xml_path:
+            return
+        self.current_contents.mark_dirty(rows)
+        self.index_translations(self.current_contents, rows)
+        self.contents_cache.pin(self.current_xml_path)
+        if self.autosave_checkbox.isChecked():
+            self.autosave_timer.start()
 
     # ---------- Логика работы с директориями и файлами XML ----------
     def select_main_folder(self):
@@ -152,124 +517,405 @@ class TranslatorApp(QMainWindow):
             self.load_mods()
 
     def load_mods(self):
-        from PyQt5.QtWidgets import QApplication, QTreeWidgetItem
+        # Предыдущая загрузка прерывается, прежде чем начать новую
+        if self.loader_worker is not None:
+            self.loader_worker.cancel()
+            self.loader_worker.wait()
+            self.loader_worker = None
+        # Автоперевод, импорт пар и проверка глоссария пишут в хранилища, которые закрываются ниже
+        self.stop_background_workers()
+        self.stop_watching()
 
         self.tree.clear()
         self.mods_data.clear()
+        self.contents_cache.clear()
+        self.search_index.clear()
+        self.suggestions.clear()
+        self.suggestion_row = None
 
         unpacked_mods_path = os.path.join(self.main_folder, "UnpackedMods")
         if not os.path.exists(unpacked_mods_path):
             QMessageBox.critical(self, "Ошибка", f"Папка UnpackedMods не найдена: {self.main_folder}")
             return
 
-        mods = [m for m in os.listdir(unpacked_mods_path)
-                if os.path.isdir(os.path.join(unpacked_mods_path, m))]
+        # Постоянный кэш разбора: неизменённые файлы не парсятся повторно
+        if self.parse_cache is not None:
+            self.parse_cache.close()
+        try:
+            self.parse_cache = ParseCache.for_main_folder(self.main_folder)
+        except Exception:
+            self.parse_cache = None
 
-        if not mods:
-            QMessageBox.information(self, "Нет модов", "В папке UnpackedMods нет доступных модов.")
-            return
+        # Память переводов общая для всех модов и сессий этой папки
+        if self.translation_memory is not None:
+            self.translation_memory.close()
+        try:
+            self.translation_memory = TranslationMemory.for_main_folder(self.main_folder)
+        except Exception:
+            self.translation_memory = None
+
+        # Обход модов и разбор XML идут в фоне, дерево пополняется пачками
+        loader = ModLoader(
+            unpacked_mods_path,
+            parse_cache=self.parse_cache,
+            prefetch=self.settings.value("prefetch_on_load", "true") == "true",
+            search_index=(self.search_index
+                          if self.settings.value("search_index_on_load", "true") == "true" else None),
+            suggestions=(self.suggestions
+                         if self.settings.value("suggestions_on_load", "true") == "true" else None),
+        )
+        worker = ModLoaderWorker(loader, self)
+        worker.mods_discovered.connect(self.on_mods_discovered)
+        worker.progress.connect(self.on_load_progress)
+        worker.finished_with_stats.connect(self.on_load_finished)
+        self.loader_worker = worker
 
-        # Включаем прогресс-бар
         self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, len(mods))
-
-        for i, mod_name in enumerate(mods):
-            mod_path = os.path.join(unpacked_mods_path, mod_name)
-
-            # Ищем english.xml и russian.xml
-            english_xml = self.find_english_xml(mod_path)
-            russian_xml = self.find_russian_xml(mod_path)
-
-            mod_item = QTreeWidgetItem([mod_name])
-            self.tree.addTopLevelItem(mod_item)
-            self.mods_data[mod_name] = {}
-
-            # Добавляем данные по english.xml
-            if english_xml:
-                contents = self.extract_contents(english_xml)
-                if contents:
-                    self.mods_data[mod_name][english_xml] = contents
-                    xml_item = QTreeWidgetItem([os.path.basename(english_xml)])
-                    mod_item.addChild(xml_item)
-
-            # Если есть russian.xml — добавим как отдельный узел
-            if russian_xml:
-                russian_item = QTreeWidgetItem([os.path.basename(russian_xml)])
-                mod_item.addChild(russian_item)
-
-            # Если нет английского, пытаемся загрузить все прочие XML
-            all_xml = self.find_all_xml(mod_path)
-            for x in all_xml:
-                if x not in (english_xml, russian_xml):
-                    contents = self.extract_contents(x)
-                    if contents:
-                        self.mods_data[mod_name][x] = contents
-                        xml_item = QTreeWidgetItem([os.path.basename(x)])
-                        mod_item.addChild(xml_item)
-
-            mod_item.setExpanded(False)
-            self.progress_bar.setValue(i + 1)
-            QApplication.processEvents()
-
-        # Скрываем все ветки
-        for index in range(self.tree.topLevelItemCount()):
-            self.tree.topLevelItem(index).setExpanded(False)
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("Поиск модов...")
+        self.cancel_load_button.setVisible(True)
+        worker.start()
 
-        self.progress_bar.setVisible(False)
-
-    def find_russian_xml(self, mod_path: str) -> str:
+    def stop_background_workers(self):
         """
-        Ищет файл russian.xml внутри папки `Localization/Russian`.
+        Отменяет фоновые задания, работающие с кэшем разбора и памятью
+        переводов, и дожидается их завершения.
         """
-        russian_path = os.path.join(mod_path, "Localization", "Russian")
-        if os.path.exists(russian_path):
-            for file in os.listdir(russian_path):
-                if file.lower() == "russian.xml":
-                    return os.path.join(russian_path, file)
-        return None
+        self.refresh_queue.clear()
+        workers = [w for w in (self.translation_worker, self.pairs_import_worker,
+                               self.glossary_worker, self.refresh_worker)
+                   if w is not None]
+        for worker in workers:
+            worker.cancel()
+        for worker in workers:
+            worker.wait()
+        # Сигналы о завершении уже в очереди: их обработчики снимают задания и закрывают журнал
+        QCoreApplication.sendPostedEvents()
+
+    def cancel_loading(self):
+        if self.loader_worker is not None:
+            self.loader_worker.cancel()
+            self.cancel_load_button.setEnabled(False)
+
+    def on_mods_discovered(self, manifests: list):
+        """Добавляет в дерево пачку модов; XML разбираются при выборе файла."""
+        if self.sender() is not self.loader_worker:
+            return  # запоздавший сигнал отменённой загрузки
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for manifest in manifests:
+                self.add_mod_item(manifest)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+    def add_mod_item(self, manifest) -> QTreeWidgetItem:
+        mod_item = ModTreeItem([manifest.name])
+        self.mods_data[manifest.name] = manifest
+        for xml_file in manifest.files:
+            mod_item.addChild(self.make_file_item(xml_file.path))
+        self.tree.addTopLevelItem(mod_item)
+        mod_item.setExpanded(False)
+        self.annotate_mod_item(mod_item, manifest)
+        return mod_item
+
+    def make_file_item(self, path: str) -> QTreeWidgetItem:
+        xml_item = ModTreeItem([os.path.basename(path)])
+        xml_item.setData(0, Qt.UserRole, path)
+        return xml_item
+
+    # ---------- Быстрая сводка по модам в колонках дерева ----------
+    def set_tree_values(self, item: QTreeWidgetItem, strings, size, percent):
+        """Заполняет колонки «Строк», «Размер», «Перевод»; None — пустая ячейка."""
+        values = [
+            (TREE_COLUMN_STRINGS, strings, None if strings is None else str(strings)),
+            (TREE_COLUMN_SIZE, size, None if size is None else f"{size / 1024:.0f} КБ"),
+            (TREE_COLUMN_TRANSLATED, percent, None if percent is None else f"{percent:.0f}%"),
+        ]
+        for column, value, text in values:
+            item.setText(column, text or "")
+            item.setData(column, TREE_SORT_ROLE, value)
+            item.setTextAlignment(column, Qt.AlignRight | Qt.AlignVCenter)
+
+    def annotate_mod_item(self, mod_item: QTreeWidgetItem, manifest):
+        quick = manifest.quick
+        if quick is None:
+            return
+        self.set_tree_values(mod_item, quick.strings if quick.has_english else None,
+                             quick.bytes, quick.percent)
+        for i in range(mod_item.childCount()):
+            child = mod_item.child(i)
+            path = child.data(0, Qt.UserRole)
+            stats = quick.files.get(path)
+            if stats is None:
+                continue
+            if stats.error:
+                child.setToolTip(TREE_COLUMN_NAME, f"Быстрая сводка не удалась: {stats.error}")
+            # Долю перевода показывают только english (как у мода) и russian
+            if manifest.english is not None and path == manifest.english.path:
+                percent = quick.percent
+            elif manifest.russian is not None and path == manifest.russian.path and stats.entries:
+                percent = stats.translated * 100.0 / stats.entries
+            else:
+                percent = None
+            self.set_tree_values(child, stats.entries, stats.size, percent)
 
-    def find_english_xml(self, mod_path: str) -> str:
+    def refresh_quick_stats(self, manifest):
+        """Пересчитывает сводку мода (миллисекунды: только побайтовый просмотр) и обновляет дерево."""
+        quick_index_mod(manifest)
+        mod_item = self.find_mod_item(manifest.name)
+        if mod_item is not None:
+            self.annotate_mod_item(mod_item, manifest)
+
+    def register_saved_file(self, manifest, output_file: str):
         """
-        Ищет файл english.xml по дереву папок, где есть папка Localization.
+        Обновляет запись о записанном файле в манифесте мода: размер и время
+        для уже известного файла, а первое сохранение добавляет новый файл
+        (russian, если он лежит в Localization/Russian мода) и его узел в дерево.
+        Затем пересчитывает быструю сводку мода.
         """
-        for root, dirs, files in os.walk(mod_path):
-            if "Localization" in root:
-                for file in files:
-                    if file.lower() == "english.xml":
-                        return os.path.join(root, file)
+        try:
+            st = os.stat(output_file)
+        except OSError:
+            return
+        output_file = os.path.normpath(output_file)
+        saved = next((f for f in manifest.files if os.path.normpath(f.path) == output_file), None)
+        if saved is not None:
+            saved.size, saved.mtime_ns = st.st_size, st.st_mtime_ns
+        else:
+            russian_dir = os.path.normpath(os.path.join(manifest.path, "Localization", "Russian"))
+            stem = os.path.splitext(os.path.basename(output_file))[0]
+            if manifest.russian is None and stem == "russian" and os.path.dirname(output_file) == russian_dir:
+                saved = LocalizationFile(output_file, st.st_size, st.st_mtime_ns, "russian")
+                manifest.russian = saved
+            else:
+                saved = LocalizationFile(output_file, st.st_size, st.st_mtime_ns, "other")
+                manifest.others.append(saved)
+            mod_item = self.find_mod_item(manifest.name)
+            if mod_item is not None:
+                mod_item.insertChild(manifest.files.index(saved), self.make_file_item(saved.path))
+        self.refresh_quick_stats(manifest)
+
+    def find_mod_item(self, mod_name: str):
+        for index in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(index)
+            if item.text(0) == mod_name:
+                return item
         return None
 
-    def find_all_xml(self, mod_path: str) -> list:
+    def on_load_progress(self, progress):
+        if self.sender() is not self.loader_worker:
+            return
+        mb = 1024 * 1024
+        if progress.bytes_total:
+            self.progress_bar.setValue(int(progress.bytes_done * 1000 / progress.bytes_total))
+        self.progress_bar.setFormat(
+            f"Моды: {progress.mods_done}/{progress.mods_total}, "
+            f"разобрано {progress.bytes_done / mb:.1f} из {progress.bytes_total / mb:.1f} МБ"
+        )
+
+    def on_load_finished(self, stats):
+        if self.sender() is not self.loader_worker:
+            return
+        cancelled = self.loader_worker.loader.cancelled
+        self.loader_worker.wait()
+        self.loader_worker = None
+        self.last_scan_stats = stats
+        self.progress_bar.setVisible(False)
+        self.progress_bar.resetFormat()
+        self.cancel_load_button.setVisible(False)
+        self.cancel_load_button.setEnabled(True)
+
+        if not cancelled and not stats.error and self.watch_checkbox.isChecked():
+            self.start_watching()
+
+        if stats.error:
+            QMessageBox.critical(self, "Ошибка", f"Загрузка модов прервана: {stats.error}")
+        elif cancelled:
+            self.statusBar().showMessage(f"Загрузка отменена. {stats.summary()}")
+        elif not stats.mods:
+            QMessageBox.information(self, "Нет модов", "В папке UnpackedMods нет доступных модов.")
+        else:
+            self.statusBar().showMessage(stats.summary())
+
+    # ---------- Слежение за изменениями в UnpackedMods ----------
+    def on_watch_toggled(self, checked: bool):
+        self.settings.setValue("watch_folder", "true" if checked else "false")
+        if checked and self.main_folder and self.loader_worker is None:
+            self.start_watching()
+        elif not checked:
+            self.stop_watching()
+
+    def start_watching(self):
+        self.stop_watching()
+        unpacked_mods_path = os.path.join(self.main_folder, "UnpackedMods")
+        self.mods_watcher = ModsWatcher(unpacked_mods_path, self.mods_data, parent=self)
+        self.mods_watcher.mod_added.connect(self.on_watched_mod_added)
+        self.mods_watcher.mod_removed.connect(self.on_watched_mod_removed)
+        self.mods_watcher.mod_changed.connect(self.on_watched_mod_changed)
+
+    def stop_watching(self):
+        if self.mods_watcher is not None:
+            self.mods_watcher.stop()
+            self.mods_watcher.deleteLater()
+            self.mods_watcher = None
+
+    def on_watched_mod_added(self, manifest):
+        self.add_mod_item(manifest)
+        self.queue_mod_refresh(manifest, [f.path for f in manifest.files], [])
+        self.statusBar().showMessage(f"Добавлен мод: {manifest.name}", 5000)
+
+    def on_watched_mod_removed(self, mod_name: str):
+        item = self.find_mod_item(mod_name)
+        if item is not None:
+            for i in range(item.childCount()):
+                # Несохранённые правки (закреплённые записи) остаются в кэше
+                path = item.child(i).data(0, Qt.UserRole)
+                self.contents_cache.discard(path)
+                self.search_index.remove_file(path)
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+        self.statusBar().showMessage(f"Мод удалён: {mod_name}", 5000)
+
+    def on_watched_mod_changed(self, manifest, added: list, removed: list, modified: list):
         """
-        Ищет все файлы *.xml в папках Localization.
+        Точечно обновляет узлы мода и кэш только для изменившихся файлов;
+        разбор и индексация идут в фоне (см. queue_mod_refresh).
         """
-        result = []
-        for root, dirs, files in os.walk(mod_path):
-            if "Localization" in root:
-                for file in files:
-                    if file.lower().endswith(".xml"):
-                        result.append(os.path.join(root, file))
-        return result
-
-    def extract_contents(self, xml_path: str) -> list:
+        mod_item = self.find_mod_item(manifest.name)
+        if mod_item is None:
+            self.add_mod_item(manifest)
+            self.queue_mod_refresh(manifest, [f.path for f in manifest.files], [])
+            return
+
+        for i in reversed(range(mod_item.childCount())):
+            if mod_item.child(i).data(0, Qt.UserRole) in removed:
+                mod_item.removeChild(mod_item.child(i))
+        # Файл, созданный нашим же сохранением, уже добавлен в дерево (register_saved_file)
+        shown = {mod_item.child(i).data(0, Qt.UserRole) for i in range(mod_item.childCount())}
+        for path in added:
+            if path not in shown:
+                mod_item.addChild(self.make_file_item(path))
+
+        for path in modified:
+            contents = self.contents_cache.get(path)
+            if contents is not None and contents.is_dirty:
+                contents.source_changed = True
+                if contents is self.current_contents:
+                    QMessageBox.warning(
+                        self, "Исходный файл изменён",
+                        f"Файл {path} изменился на диске, а в таблице есть несохранённые правки.\n"
+                        "Правки сделаны по прежней версии файла; перед сохранением будет запрошено подтверждение."
+                    )
+        for path in removed + modified:
+            self.contents_cache.discard(path)
+        self.queue_mod_refresh(manifest, added + modified, removed)
+        self.statusBar().showMessage(
+            f"Обновлён мод {manifest.name}: +{len(added)} −{len(removed)} ~{len(modified)}", 5000
+        )
+
+    def queue_mod_refresh(self, manifest, paths: list, removed: list):
+        self.refresh_queue.append((manifest, paths, removed))
+        if self.refresh_worker is None:
+            self.start_next_mod_refresh()
+
+    def start_next_mod_refresh(self):
+        if not self.refresh_queue:
+            return
+        manifest, paths, removed = self.refresh_queue.pop(0)
+        worker = ModRefreshWorker(manifest, paths, removed, self.parse_cache,
+                                  self.search_index, self.suggestions, self)
+        worker.finished_with_manifest.connect(self.on_mod_refresh_finished)
+        self.refresh_worker = worker
+        worker.start()
+
+    def on_mod_refresh_finished(self, manifest, error):
+        paths = self.refresh_worker.paths
+        self.refresh_worker.wait()
+        self.refresh_worker = None
+        # Пока шла индексация, мод мог смениться новым сканом или исчезнуть
+        if self.mods_data.get(manifest.name) is manifest:
+            mod_item = self.find_mod_item(manifest.name)
+            if mod_item is not None:
+                self.annotate_mod_item(mod_item, manifest)
+            # Открытый файл перечитывается (уже из кэша разбора), если в нём нет несохранённых правок
+            if self.current_xml_path in paths and not self.current_contents.is_dirty:
+                self.generate_original_for_translation()
+        if error:
+            self.statusBar().showMessage(f"Не удалось обновить мод {manifest.name}: {error}", 5000)
+        self.start_next_mod_refresh()
+
+    def extract_contents(self, xml_path: str) -> FileContents:
         """
-        Извлекает содержимое <content>...</content> из XML-файла.
+        Извлекает содержимое <content>...</content> из XML-файла
+        потоковым парсером (см. xml_extractor.iter_contents); неизменённые
+        с прошлого запуска файлы берутся из постоянного кэша.
         """
         try:
-            with open(xml_path, 'r', encoding='utf-8') as file:
-                xml_content = file.read()
-
-            soup = BeautifulSoup(xml_content, 'xml')
-            contents = []
-            for c in soup.find_all('content'):
-                if c.string:
-                    original_text = c.decode_contents()
-                    contents.append([original_text.strip(), ""])
-                else:
-                    contents.append(["", ""])
-            return contents
+            contents = FileContents(xml_path, load_records(xml_path, self.parse_cache))
         except Exception:
-            return []
+            return FileContents(xml_path)
+        # Обновлённый исходник: переводы неизменённых записей берутся из russian.xml
+        try:
+            delta = carry_over(contents, self.parse_cache)
+        except Exception:
+            delta = None
+        if delta is not None:
+            self.statusBar().showMessage(f"Сравнение с russian.xml: {delta.summary()}", 8000)
+        if xml_path not in self.search_index:
+            self.search_index.add_file(xml_path, self.mod_name_for_path(xml_path), contents.originals)
+        if contents.translations:
+            self.index_translations(contents, contents.translations)
+        return contents
+
+    def get_contents(self, xml_path: str) -> FileContents:
+        """
+        Возвращает содержимое файла из LRU-кэша, разбирая XML
+        при первом обращении.
+        """
+        contents = self.contents_cache.get(xml_path)
+        if contents is None:
+            contents = self.extract_contents(xml_path)
+            self.contents_cache.put(xml_path, contents)
+        return contents
+
+    # ---------- Поиск по всем модам ----------
+    def mod_name_for_path(self, path: str) -> str:
+        unpacked_mods_path = os.path.join(self.main_folder or "", "UnpackedMods")
+        return os.path.relpath(path, unpacked_mods_path).split(os.sep, 1)[0]
+
+    def index_translations(self, contents: FileContents, rows):
+        self.search_index.update_translations(
+            contents.path, {row: contents.translation(row) for row in rows}
+        )
+
+    def find_file_item(self, path: str):
+        for i in range(self.tree.topLevelItemCount()):
+            mod_item = self.tree.topLevelItem(i)
+            for j in range(mod_item.childCount()):
+                if mod_item.child(j).data(0, Qt.UserRole) == path:
+                    return mod_item.child(j)
+        return None
+
+    def jump_to_row(self, path: str, row: int, column: int):
+        """Открывает файл из результата поиска и выделяет нужную ячейку."""
+        if path != self.current_xml_path:
+            item = self.find_file_item(path)
+            if item is None:
+                self.statusBar().showMessage(f"Файл больше не загружен: {path}", 5000)
+                return
+            self.tree.setCurrentItem(item)  # заполняет таблицу через on_tree_selection_changed
+        if path != self.current_xml_path or row >= self.table_model.rowCount():
+            return
+
+        proxy_index = self.proxy_model.mapFromSource(self.table_model.index(row, column))
+        if not proxy_index.isValid():
+            # Строка скрыта фильтром таблицы — сбрасываем фильтр
+            self.filter_edit.clear()
+            self.untranslated_checkbox.setChecked(False)
+            proxy_index = self.proxy_model.mapFromSource(self.table_model.index(row, column))
+        self.table.scrollTo(proxy_index, QAbstractItemView.PositionAtCenter)
+        self.table.setCurrentIndex(proxy_index)
+        self.table.setFocus()
 
     # ---------- Логика выбора и отображения содержимого XML в таблицу ----------
     def on_tree_selection_changed(self):
@@ -282,15 +928,9 @@ class TranslatorApp(QMainWindow):
 
         # Если кликнули по конкретному XML-файлу, а не по названию мода
         if parent is not None:
-            mod_name = parent.text(0)
-            xml_file_name = item.text(0)
-            # Найдём в self.mods_data полным путём
-            for path_ in self.mods_data[mod_name].keys():
-                if os.path.basename(path_) == xml_file_name:
-                    self.current_mod_name = mod_name
-                    self.current_xml_path = path_
-                    self.generate_original_for_translation()
-                    return
+            self.current_mod_name = parent.text(0)
+            self.current_xml_path = item.data(0, Qt.UserRole)
+            self.generate_original_for_translation()
         else:
             # Кликнули по моду
             self.current_mod_name = None
@@ -298,72 +938,179 @@ class TranslatorApp(QMainWindow):
 
     def generate_original_for_translation(self):
         """
-        Заполняет таблицу "Оригинал | Перевод" данными из self.mods_data,
-        соответствующими текущему пути self.current_xml_path.
+        Заполняет таблицу "Оригинал | Перевод" содержимым файла
+        self.current_xml_path (разбирается при первом обращении).
         """
         if not self.current_xml_path or not self.current_mod_name:
             QMessageBox.warning(self, "Ошибка", "Выберите XML файл слева.")
             return
 
-        self.current_contents = self.mods_data[self.current_mod_name][self.current_xml_path]
-        self.table.clearContents()
-        self.table.setRowCount(len(self.current_contents))
+        from PyQt5.QtWidgets import QApplication
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            self.current_contents = self.get_contents(self.current_xml_path)
+        finally:
+            QApplication.restoreOverrideCursor()
 
-        for i, (orig, trans) in enumerate(self.current_contents):
-            orig_item = QTableWidgetItem(orig)
-            # Запрещаем редактировать колонку оригинала
-            orig_item.setFlags(orig_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(i, 0, orig_item)
-            self.table.setItem(i, 1, QTableWidgetItem(trans))
+        with span("ui.fill_table", rows=len(self.current_contents)):
+            self.table_model.set_contents(self.current_contents)
+        self.table.scrollToTop()
+        self.suggestion_row = None
+        self.show_suggestions()
 
     # ---------- Автоперевод всей таблицы (Google Translate) ----------
     def generate_auto_translation(self):
+        # Повторное нажатие во время работы — отмена
+        if self.translation_worker is not None:
+            self.translation_worker.cancel()
+            self.auto_translate_button.setEnabled(False)
+            return
+
         if not self.current_xml_path or not self.current_mod_name:
             QMessageBox.warning(self, "Ошибка", "Выберите XML файл из дерева слева.")
             return
-        if self.table.rowCount() == 0:
+        if self.table_model.rowCount() == 0:
             QMessageBox.warning(self, "Ошибка", "Сначала выведите оригинал для перевода.")
             return
 
-        from PyQt5.QtWidgets import QApplication
-        row_count = self.table.rowCount()
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, row_count)
+        # Переводятся только пустые строки: перенесённые из russian.xml и правленые не трогаем
+        segments = [
+            (i, orig.strip()) for i, (orig, trans) in enumerate(self.current_contents)
+            if orig.strip() and not trans.strip()
+        ]
+        if not segments:
+            self.statusBar().showMessage("Все строки уже переведены.", 5000)
+            return
 
-        QApplication.setOverrideCursor(Qt.WaitCursor)
+        # Журнал задания: готовые пакеты переживают сбой, отмену и перезапуск
+        journal = None
+        if self.main_folder:
+            try:
+                journal = TranslationJournal.for_source(self.main_folder, self.current_xml_path)
+            except (OSError, ValueError):
+                journal = None
+        if journal is not None and len(journal):
+            self.statusBar().showMessage(
+                f"Продолжение прерванного автоперевода: готово {len(journal)} текстов", 5000
+            )
+
+        self.translation_job = (self.current_xml_path, self.current_contents, journal)
+        # Файл закрепляется на всё задание: иначе, пока пользователь открывает другие
+        # файлы, он вытесняется из кэша и пакеты пишутся в уже забытое содержимое
+        self.pin_job_contents(self.current_xml_path, self.current_contents)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, len(segments))
+        self.progress_bar.setValue(0)
+        self.auto_translate_button.setText("Остановить автоперевод")
+
+        # Термины глоссария подставляются только в текст для переводчика, чтобы он
+        # не выбрал свой вариант; память переводов и журнал ключуются оригиналом
+        glossary = self.get_glossary() if self.glossary_pretranslate_action.isChecked() else None
+        prepare = glossary.pretranslate if glossary is not None else None
+        worker = TranslationWorker(self.create_translation_engine(journal, prepare), segments, self)
+        worker.batch_translated.connect(self.on_auto_translation_batch)
+        worker.progress.connect(self.on_auto_translation_progress)
+        worker.finished_with_stats.connect(self.on_auto_translation_finished)
+        self.translation_worker = worker
+        worker.start()
+
+    def on_auto_translation_batch(self, results: dict):
+        """Результаты пакета пишутся в тот файл, для которого запущен перевод."""
+        path, contents, _ = self.translation_job
+        if path == self.current_xml_path and contents is self.current_contents:
+            self.table_model.set_translations(results)
+            return
+        contents.set_translations(results)
+        contents.mark_dirty(results)
+        self.index_translations(contents, results)
+
+    def pin_job_contents(self, path: str, contents: FileContents):
+        """Закрепляет содержимое файла в кэше на время фоновой работы с ним."""
+        if self.contents_cache.get(path) is not contents:
+            self.contents_cache.put(path, contents)
+        self.contents_cache.pin(path)
+
+    def unpin_job_contents(self, path: str, contents: FileContents):
+        """Снимает закрепление после задания, если сохранять нечего."""
+        if not contents.is_dirty and not self.is_job_contents(contents):
+            self.contents_cache.unpin(path)
+
+    def is_job_contents(self, contents: FileContents) -> bool:
+        """В содержимое файла ещё пишет фоновое задание (автоперевод или импорт пар)."""
+        return any(job is not None and job[1] is contents
+                   for job in (self.translation_job, self.pairs_import_job))
+
+    def on_auto_translation_progress(self, done: int, total: int, rate: float, concurrency: int):
+        self.progress_bar.setFormat(f"%v / %m — {rate:.1f} сегм/с, запросов параллельно: {concurrency}")
+        self.progress_bar.setValue(done)
+
+    def on_auto_translation_finished(self, stats):
+        self.translation_worker.wait()
+        self.translation_worker = None
+        path, contents, journal = self.translation_job
+        self.translation_job = None
+        self.unpin_job_contents(path, contents)
+        self.progress_bar.setVisible(False)
+        self.progress_bar.resetFormat()
+        self.auto_translate_button.setText("Автоперевод")
+        self.auto_translate_button.setEnabled(True)
+
+        summary = f"Переведено: {stats.done - stats.failed} из {stats.total} " \
+                  f"за {stats.elapsed:.1f} с ({stats.rate:.1f} сегм/с), " \
+                  f"из журнала: {stats.resumed}, из памяти переводов: {stats.memory_hits}, " \
+                  f"запросов: {stats.requests}, повторов: {stats.retries}"
+        if stats.error:
+            summary = f"Автоперевод прерван ошибкой (можно продолжить): {stats.error}. " + summary
+        elif stats.cancelled:
+            summary = "Автоперевод остановлен (можно продолжить). " + summary
+
+        # Журнал нужен, пока задание не завершено целиком
+        if journal is not None:
+            if stats.cancelled or stats.errors or stats.error:
+                journal.close()
+            else:
+                journal.discard()
+
+        if stats.errors:
+            report_path = self.write_translation_failures(path, contents, stats, journal)
+            summary += f". Не переведено {stats.failed} строк"
+            if report_path:
+                summary += f", отчёт: {report_path}"
+        self.statusBar().showMessage(summary)
+
+    def write_translation_failures(self, path: str, contents: FileContents, stats, journal) -> str:
+        """Сохраняет непереведённые из-за ошибок строки в JSON рядом с журналом задания."""
+        failures = []
+        for keys, error in stats.errors:
+            for row in keys:
+                failures.append({
+                    "row": row + 1,
+                    "contentuid": contents.uids[row] if row < len(contents) else None,
+                    "original": contents.original(row) if row < len(contents) else "",
+                    "error": error,
+                })
+        report_path = (os.path.splitext(journal.path)[0] if journal is not None
+                       else os.path.splitext(path)[0]) + ".failures.json"
         try:
-            for i in range(row_count):
-                original_item = self.table.item(i, 0)
-                if original_item:
-                    original_text = original_item.text().strip()
-                    if original_text:
-                        translated_text = self.translate_single_sentence(original_text)
-                        self.table.setItem(i, 1, QTableWidgetItem(translated_text))
-
-                self.progress_bar.setValue(i + 1)
-                QApplication.processEvents()
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при автопереводе: {str(e)}")
-        finally:
-            QApplication.restoreOverrideCursor()
-            self.progress_bar.setVisible(False)
+            os.makedirs(os.path.dirname(report_path), exist_ok=True)
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump({"source": path, "breaker_trips": stats.breaker_trips,
+                           "failures": failures}, f, ensure_ascii=False, indent=2)
+        except OSError:
+            return ""
+        return report_path
 
     # ---------- Импорт пар перевода из диалогового окна ----------
     def import_translation_pairs(self):
         if not self.current_xml_path or not self.current_mod_name:
             QMessageBox.warning(self, "Ошибка", "Сначала выберите XML-файл из дерева слева.")
             return
-        if self.table.rowCount() == 0:
+        if self.table_model.rowCount() == 0:
             QMessageBox.warning(self, "Ошибка", "Сначала выведите оригинал для перевода, чтобы были строки для сопоставления.")
             return
 
         # Собираем строки, у которых перевод пустой, чтобы предложить импорт
-        pairs_text = []
-        for i in range(self.table.rowCount()):
-            original = self.table.item(i, 0).text()
-            translation = self.table.item(i, 1).text() if self.table.item(i, 1) else ""
-            if not translation.strip():
-                pairs_text.append(f"{original}|")
+        pairs_text = [f"{orig}|" for orig, trans in self.current_contents if not trans.strip()]
 
         if not pairs_text:
             QMessageBox.information(self, "Нет пустых переводов", "Все переводы уже заполнены.")
@@ -376,87 +1123,214 @@ class TranslatorApp(QMainWindow):
             import_method = dialog.get_import_method()
 
             if pairs:
-                from PyQt5.QtWidgets import QApplication
-                row_count = self.table.rowCount()
-                self.progress_bar.setVisible(True)
-                self.progress_bar.setRange(0, row_count)
-
-                # Пробуем применить пары напрямую
-                for i in range(row_count):
-                    original = self.table.item(i, 0).text()
-                    translation = self.table.item(i, 1).text() if self.table.item(i, 1) else ""
-                    if not translation.strip() and original in pairs:
-                        cleaned_translation = remove_amp(pairs[original]).strip()
-                        self.table.setItem(i, 1, QTableWidgetItem(cleaned_translation))
-
-                    self.progress_bar.setValue(i + 1)
-                    QApplication.processEvents()
+                # Пробуем применить пары напрямую, одним пакетом
+                self.table_model.set_translations(exact_pair_updates(self.current_contents, pairs))
+                if self.translation_memory is not None:
+                    self.translation_memory.store_many(
+                        ((orig, remove_amp(trans)) for orig, trans in pairs.items()), ORIGIN_IMPORT
+                    )
 
                 # Если выбран метод "levenshtein", применяем fuzzy-сопоставление
                 if import_method == 'levenshtein':
                     self.apply_levenshtein_matching(pairs)
 
                 QMessageBox.information(self, "Готово", "Пары перевода применены к таблице.")
-                self.progress_bar.setVisible(False)
             else:
                 QMessageBox.information(self, "Нет пар", "Пары не найдены или неправильный формат.")
 
+    # ---------- Импорт пар из файла (в фоне, без текстового поля) ----------
+    def import_pairs_from_file(self):
+        # Повторное нажатие во время импорта — отмена
+        if self.pairs_import_worker is not None:
+            self.pairs_import_worker.cancel()
+            self.import_file_button.setEnabled(False)
+            return
+        if not self.current_xml_path or self.table_model.rowCount() == 0:
+            QMessageBox.warning(self, "Ошибка", "Сначала выберите XML-файл из дерева слева.")
+            return
+
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Файл пар перевода", "",
+            "Пары перевода (*.txt *.csv *.tsv);;Все файлы (*)"
+        )
+        if not path:
+            return
+
+        self.pairs_import_job = (self.current_xml_path, self.current_contents)
+        self.pin_job_contents(self.current_xml_path, self.current_contents)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("Чтение пар...")
+        self.import_file_button.setText("Остановить импорт")
+
+        worker = PairsImportWorker(
+            path, self.current_contents,
+            use_levenshtein=self.settings.value("import_method", "basic") == "levenshtein",
+            max_distance=int(self.settings.value("levenshtein_max_distance", DEFAULT_MAX_DISTANCE)),
+            memory=self.translation_memory,
+            parent=self,
+        )
+        worker.progress.connect(self.on_pairs_import_progress)
+        worker.finished_with_result.connect(self.on_pairs_import_finished)
+        self.pairs_import_worker = worker
+        worker.start()
+
+    def on_pairs_import_progress(self, progress):
+        if progress.bytes_total:
+            self.progress_bar.setValue(int(progress.bytes_done * 1000 / progress.bytes_total))
+        self.progress_bar.setFormat(
+            f"Пары: {progress.pairs}, прочитано {progress.bytes_done / (1024 * 1024):.1f} "
+            f"из {progress.bytes_total / (1024 * 1024):.1f} МБ"
+        )
+
+    def on_pairs_import_finished(self, result):
+        self.pairs_import_worker.wait()
+        self.pairs_import_worker = None
+        path, contents = self.pairs_import_job
+        self.pairs_import_job = None
+        self.progress_bar.setVisible(False)
+        self.progress_bar.resetFormat()
+        self.import_file_button.setText("Пары из файла")
+        self.import_file_button.setEnabled(True)
+
+        self.apply_pairs_import(path, contents, result)
+        # Заполненный файл остаётся закреплённым до сохранения (он помечен изменённым)
+        self.unpin_job_contents(path, contents)
+
+    def apply_pairs_import(self, path: str, contents: FileContents, result):
+        if result.error:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось импортировать пары: {result.error}")
+            return
+        if result.cancelled:
+            self.statusBar().showMessage("Импорт пар отменён.", 5000)
+            return
+
+        # Строки, заполненные вручную за время импорта, не перезаписываются
+        updates = {row: text for row, text in result.updates.items() if not contents.translation(row).strip()}
+        if path == self.current_xml_path and contents is self.current_contents:
+            self.table_model.set_translations(updates)
+        elif updates:
+            contents.set_translations(updates)
+            contents.mark_dirty(updates)
+            self.index_translations(contents, updates)
+        self.statusBar().showMessage(
+            f"Импорт пар: {result.pairs} пар, заполнено строк {len(updates)} "
+            f"(точно: {len(result.exact)}, по Левенштейну: {len(result.fuzzy)}) "
+            f"за {result.elapsed:.1f} с"
+        )
+
     def apply_levenshtein_matching(self, pairs: dict):
         """
         Применяем перевод для строк, которые похожи на оригинал
-        с учётом расстояния Левенштейна.
+        с учётом расстояния Левенштейна. Похожие строки ищутся по индексу
+        (см. fuzzy_index), а не перебором всех пар со всеми строками.
         """
-        for original, translation in pairs.items():
-            for i in range(self.table.rowCount()):
-                comparison = self.table.item(i, 0).text().strip()
-                # Если расстояние Левенштейна <= 3, считаем, что строки похожи
-                if lev_distance(original, comparison) <= 3:
-                    current_translation = self.table.item(i, 1).text()
-                    if not current_translation.strip():
-                        cleaned_translation = remove_amp(translation).strip()
-                        self.table.setItem(i, 1, QTableWidgetItem(cleaned_translation))
+        max_distance = int(self.settings.value("levenshtein_max_distance", DEFAULT_MAX_DISTANCE))
+        # Сопоставляем только строки, которые ещё без перевода
+        self.table_model.set_translations(
+            fuzzy_pair_updates(self.current_contents, pairs, max_distance)
+        )
 
     # ---------- Сохранение перевода в russian.xml ----------
     def apply_translation(self):
         if not self.current_xml_path or not self.current_mod_name:
             QMessageBox.warning(self, "Ошибка", "Выберите XML файл из дерева слева.")
             return
-        if self.table.rowCount() == 0:
+        if self.table_model.rowCount() == 0:
             QMessageBox.warning(self, "Ошибка", "Нет данных для применения перевода.")
             return
 
-        # Обновляем self.current_contents из таблицы
-        for i in range(self.table.rowCount()):
-            trans = self.table.item(i, 1).text() if self.table.item(i, 1) else ""
-            cleaned_trans = remove_amp(trans).strip()
-            self.current_contents[i][1] = cleaned_trans
+        contents = self.current_contents
+        if contents.source_changed:
+            answer = QMessageBox.question(
+                self, "Исходный файл изменён",
+                "Исходный файл изменился на диске после начала правок. Перевод запишется по новой "
+                "версии файла: правки строк, которых в ней нет или которые сместились, будут потеряны.\n\n"
+                "Сохранить всё равно?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No,
+            )
+            if answer != QMessageBox.Yes:
+                return
 
-        # Применяем перевод к исходному XML
         try:
-            parser = etree.XMLParser(remove_blank_text=True)
-            tree = etree.parse(self.current_xml_path, parser)
-            root = tree.getroot()
-
-            contents_elems = root.findall('.//content')
-            for i, c_elem in enumerate(contents_elems):
-                if i < len(self.current_contents):
-                    if self.current_contents[i][1].strip():
-                        c_elem.text = self.current_contents[i][1]
-
-            # Сохраняем результат в папке Russian
-            localization_dir = os.path.join(os.path.dirname(self.current_xml_path), "..", "Russian")
-            os.makedirs(localization_dir, exist_ok=True)
-            output_file = os.path.join(localization_dir, "russian.xml")
-
-            tree.write(output_file, encoding="utf-8", xml_declaration=True, pretty_print=True)
-
-            # Удаляем "amp;" из итогового файла (если где-то затесалось)
-            with open(output_file, 'r', encoding='utf-8') as file:
-                content = file.read()
-            content = content.replace("amp;", "")
-            with open(output_file, 'w', encoding='utf-8') as file:
-                file.write(content)
-
+            output_file = self.save_contents(contents)
             QMessageBox.information(self, "Сохранено", f"Перевод сохранён в: {output_file}")
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка при сохранении перевода: {str(e)}")
+            return
+        if contents.source_changed and contents is self.current_contents:
+            # Правки сохранены: таблица перечитывается по новой версии исходника
+            contents.source_changed = False
+            self.contents_cache.discard(contents.path)
+            self.generate_original_for_translation()
+
+    def autosave(self):
+        """Тихое сохранение текущего файла; ошибки показываются в строке состояния."""
+        if not self.current_xml_path or not self.current_contents.is_dirty:
+            return
+        if self.current_contents.source_changed:
+            self.statusBar().showMessage(
+                "Автосохранение пропущено: исходный файл изменился на диске, сохраните вручную."
+            )
+            return
+        try:
+            output_file = self.save_contents(self.current_contents)
+            self.statusBar().showMessage(f"Автосохранение: {output_file}", 3000)
+        except Exception as e:
+            self.statusBar().showMessage(f"Ошибка автосохранения: {str(e)}")
+
+    def save_contents(self, contents: FileContents) -> str:
+        """
+        Сохраняет перевод файла в russian.xml. Если russian.xml уже есть
+        и соответствует исходнику, в нём обновляются только изменённые строки
+        (по contentuid); иначе он целиком генерируется из исходного файла.
+        """
+        # Чистим только изменённые строки: остальные уже чистые
+        cleaned = {row: remove_amp(contents.translation(row)).strip() for row in contents.dirty}
+        if contents is self.current_contents:
+            self.table_model.set_translations(cleaned)
+        else:
+            contents.set_translations(cleaned)
+            self.index_translations(contents, cleaned)
+
+        output_file = russian_output_path(contents.path)
+        updates = contents.dirty_updates()
+        with span("save.contents", path=output_file, dirty=len(updates)) as s:
+            # После обновления исходника (см. delta.py) russian.xml пересобирается целиком
+            # .loca всегда пересобирается целиком: это один быстрый последовательный проход
+            can_patch = (os.path.exists(output_file) and not contents.needs_full_write
+                         and not is_loca(output_file))
+            patched = False
+            if can_patch and not updates:
+                patched = True
+            elif can_patch:
+                try:
+                    patch_translated_xml(output_file, updates)
+                    patched = True
+                except MissingContentError:
+                    patched = False
+            if not patched:
+                write_translated_file(contents.path, output_file, contents.translations_by_key())
+                contents.needs_full_write = False
+            s.set("patched", patched)
+
+        if self.translation_memory is not None:
+            self.translation_memory.store_many(
+                ((contents.original(row), contents.translation(row)) for row in contents.dirty), ORIGIN_MANUAL
+            )
+        # Сохранённые переводы сразу доступны как подсказки для других строк и модов
+        self.suggestions.add_pairs(
+            (contents.original(row), contents.translation(row)) for row in contents.dirty
+            if is_translation(contents.original(row), contents.translation(row))
+        )
+
+        contents.clear_dirty()
+        # Доля перевода в дереве пересчитывается по только что записанному файлу
+        manifest = self.mods_data.get(self.mod_name_for_path(contents.path))
+        if manifest is not None:
+            self.register_saved_file(manifest, output_file)
+        self.contents_cache.update_size(contents.path)
+        if not self.is_job_contents(contents):
+            self.contents_cache.unpin(contents.path)
+        return output_file
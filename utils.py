@@ -1,5 +1,19 @@
 # utils.py
 
+
+def escape_xml(text: str) -> str:
+    """
+    Экранирует &, < и > как xml.sax.saxutils.escape. Свой вариант, потому что
+    xml.sax.saxutils тянет urllib и http.client и заметно удлиняет запуск.
+    """
+    return text.replace("&", "&amp;").replace(">", "&gt;").replace("<", "&lt;")
+
+
+def unescape_xml(text: str) -> str:
+    """Обратное к escape_xml (как xml.sax.saxutils.unescape)."""
+    return text.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+
+
 def remove_amp(text: str) -> str:
     """
     Удаляет все вхождения 'amp;' из строки, чтобы избежать проблем
@@ -0,0 +1,194 @@
+# workers.py
+
+import copy
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from glossary import GlossaryReport, check_workspace
+from mod_loader import ModLoader, reindex_mod
+from mod_scanner import ScanStats
+from pair_matching import PairsImportResult, import_pairs_file
+from translation_engine import EngineStats, TranslationEngine
+
+
+# Воркеры всегда отдают сигнал завершения, а исключение записывают в итог
+# задания: необработанное исключение в QThread.run завершает всё приложение
+# (qFatal), а GUI остался бы заблокированным в ожидании сигнала.
+def describe_error(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
+
+
+class TranslationWorker(QThread):
+    """
+    Запускает TranslationEngine в отдельном потоке. Результаты приходят
+    в GUI-поток через сигналы (queued connection), поток GUI не блокируется.
+    """
+
+    # {ключ: перевод} для очередного завершённого пакета
+    batch_translated = pyqtSignal(dict)
+    # готово, всего, сегментов в секунду, текущий лимит одновременных запросов
+    progress = pyqtSignal(int, int, float, int)
+    # EngineStats по завершении
+    finished_with_stats = pyqtSignal(object)
+
+    def __init__(self, engine: TranslationEngine, segments: list, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.segments = segments
+
+    def cancel(self):
+        self.engine.cancel()
+
+    def run(self):
+        stats = EngineStats(len(self.segments))
+        try:
+            stats = self.engine.run(
+                self.segments,
+                on_batch=lambda results: self.batch_translated.emit(dict(results)),
+                on_progress=lambda s: self.progress.emit(s.done, s.total, s.rate, s.concurrency),
+            )
+        except Exception as e:
+            stats.error = describe_error(e)
+        finally:
+            self.finished_with_stats.emit(stats)
+
+
+class ModLoaderWorker(QThread):
+    """
+    Запускает ModLoader в отдельном потоке: манифесты модов приходят
+    в GUI пачками, прогресс — по разобранным байтам.
+    """
+
+    # список ModManifest
+    mods_discovered = pyqtSignal(list)
+    # LoadProgress (байты могут не помещаться в int Qt, поэтому object)
+    progress = pyqtSignal(object)
+    # ScanStats по завершении
+    finished_with_stats = pyqtSignal(object)
+
+    def __init__(self, loader: ModLoader, parent=None):
+        super().__init__(parent)
+        self.loader = loader
+
+    def cancel(self):
+        self.loader.cancel()
+
+    def run(self):
+        stats = ScanStats()
+        try:
+            stats = self.loader.run(
+                on_manifests=lambda batch: self.mods_discovered.emit(list(batch)),
+                on_progress=lambda p: self.progress.emit(copy.copy(p)),
+            )
+        except Exception as e:
+            stats.error = describe_error(e)
+        finally:
+            self.finished_with_stats.emit(stats)
+
+
+class ModRefreshWorker(QThread):
+    """
+    Переиндексирует изменившийся на диске мод (см. mod_loader.reindex_mod)
+    в отдельном потоке, чтобы события ModsWatcher не подвешивали GUI.
+    """
+
+    # ModManifest, текст ошибки или None
+    finished_with_manifest = pyqtSignal(object, object)
+
+    def __init__(self, manifest, paths: list, removed: list, parse_cache=None,
+                 search_index=None, suggestions=None, parent=None):
+        super().__init__(parent)
+        self.manifest = manifest
+        self.paths = paths
+        self.removed = removed
+        self.parse_cache = parse_cache
+        self.search_index = search_index
+        self.suggestions = suggestions
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        error = None
+        try:
+            reindex_mod(self.manifest, self.paths, self.removed, self.parse_cache,
+                        self.search_index, self.suggestions,
+                        is_cancelled=lambda: self._cancelled)
+        except Exception as e:
+            error = describe_error(e)
+        finally:
+            self.finished_with_manifest.emit(self.manifest, error)
+
+
+class PairsImportWorker(QThread):
+    """
+    Читает файл пар и сопоставляет его со строками таблицы в отдельном
+    потоке; GUI получает прогресс по байтам и готовые переводы одним пакетом.
+    """
+
+    # PairsReadProgress (копия)
+    progress = pyqtSignal(object)
+    # PairsImportResult по завершении
+    finished_with_result = pyqtSignal(object)
+
+    def __init__(self, path: str, contents, use_levenshtein: bool = False,
+                 max_distance: int = 3, memory=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.contents = contents
+        self.use_levenshtein = use_levenshtein
+        self.max_distance = max_distance
+        self.memory = memory
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        result = PairsImportResult(self.path)
+        try:
+            result = import_pairs_file(
+                self.path, self.contents,
+                use_levenshtein=self.use_levenshtein,
+                max_distance=self.max_distance,
+                memory=self.memory,
+                on_progress=lambda p: self.progress.emit(copy.copy(p)),
+                is_cancelled=lambda: self._cancelled,
+            )
+        except Exception as e:
+            result.error = describe_error(e)
+        finally:
+            self.finished_with_result.emit(result)
+
+
+class GlossaryCheckWorker(QThread):
+    """Проверяет переводы всех модов по глоссарию в отдельном потоке."""
+
+    # проверено файлов, всего файлов
+    progress = pyqtSignal(int, int)
+    # GlossaryReport по завершении
+    finished_with_report = pyqtSignal(object)
+
+    def __init__(self, glossary, jobs: list, parse_cache=None, parent=None):
+        super().__init__(parent)
+        self.glossary = glossary
+        self.jobs = jobs
+        self.parse_cache = parse_cache
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        report = GlossaryReport()
+        try:
+            report = check_workspace(
+                self.glossary, self.jobs, self.parse_cache,
+                on_progress=self.progress.emit,
+                is_cancelled=lambda: self._cancelled,
+            )
+        except Exception as e:
+            report.error = describe_error(e)
+        finally:
+            self.finished_with_report.emit(report)
@@ -0,0 +1,77 @@
+# xml_extractor.py
+
+import time
+from collections import namedtuple
+from typing import Iterator
+
+from tracing import record_span
+from utils import escape_xml
+
+# Одна запись <content>: атрибуты и внутренняя разметка в том виде,
+# в каком её возвращал BeautifulSoup decode_contents().
+ContentRecord = namedtuple("ContentRecord", ["contentuid", "version", "text"])
+
+
+def _has_single_string(elem) -> bool:
+    """
+    Аналог проверки Tag.string из BeautifulSoup: у элемента ровно один
+    дочерний узел, и это непустой текст (или тег с единственной строкой).
+    """
+    children = (1 if elem.text else 0) + len(elem)
+    children += sum(1 for child in elem if child.tail)
+    if children != 1:
+        return False
+    if elem.text:
+        return True
+    child = elem[0]
+    if not isinstance(child.tag, str):
+        # Комментарий в BeautifulSoup — тоже строка
+        return bool(child.text)
+    return _has_single_string(child)
+
+
+def inner_markup(elem) -> str:
+    """
+    Внутренняя разметка элемента, как decode_contents(): текст
+    экранируется (&, <, >), дочерние теги сериализуются как есть.
+    """
+    # Сюда попадают только элементы из iter_contents, lxml к этому моменту уже загружен
+    from lxml import etree
+
+    parts = [escape_xml(elem.text)] if elem.text else []
+    for child in elem:
+        parts.append(etree.tostring(child, encoding="unicode", with_tail=False))
+        if child.tail:
+            parts.append(escape_xml(child.tail))
+    return "".join(parts)
+
+
+def iter_contents(xml_path: str) -> Iterator[ContentRecord]:
+    """
+    Потоково читает <content> через lxml.etree.iterparse и выдаёт
+    ContentRecord(contentuid, version, text). Уже обработанные элементы
+    удаляются из дерева, поэтому память не растёт с размером файла.
+    """
+    # lxml грузится при первом разборе, а не при импорте модуля
+    from lxml import etree
+
+    started = time.perf_counter()
+    rows = 0
+    context = etree.iterparse(
+        xml_path, events=("end",), tag="content", huge_tree=True, recover=True
+    )
+    for _, elem in context:
+        rows += 1
+        if _has_single_string(elem):
+            text = inner_markup(elem).strip()
+        else:
+            text = ""
+        yield ContentRecord(elem.get("contentuid"), elem.get("version"), text)
+
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+    del context
+    record_span("extract.iterparse", started, path=xml_path, rows=rows)
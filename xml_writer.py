@@ -0,0 +1,156 @@
+# xml_writer.py
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Mapping
+
+from file_contents import content_key
+from loca_format import LOCA_EXTENSION, is_loca, write_translated_loca
+from tracing import span
+from utils import unescape_xml
+
+INDENT = "  "
+
+
+def russian_output_path(xml_path: str) -> str:
+    """
+    Путь russian.xml в папке Russian рядом с папкой исходного файла
+    (russian.loca, если исходник — .loca).
+    """
+    localization_dir = os.path.join(os.path.dirname(xml_path), "..", "Russian")
+    name = "russian" + (LOCA_EXTENSION if is_loca(xml_path) else ".xml")
+    return os.path.normpath(os.path.join(localization_dir, name))
+
+
+@contextmanager
+def atomic_output(output_path: str):
+    """
+    Открывает временный файл рядом с output_path и по успешному
+    завершению атомарно подменяет им целевой файл (os.replace).
+    При ошибке целевой файл остаётся нетронутым.
+    """
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".bg3loc-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def set_translated_text(elem, text: str):
+    """
+    Записывает перевод в элемент. В таблице текст хранится в экранированном
+    виде (&lt;LSTag&gt; и т.п.), поэтому он разэкранируется и сериализатор
+    экранирует его ровно один раз — без последующей чистки "amp;".
+    """
+    elem.text = unescape_xml(text)
+
+
+class MissingContentError(KeyError):
+    """В файле нет записей <content> с некоторыми из обновляемых ключей."""
+
+
+def _rewrite_xml(source_path: str, output_path: str, translations: Mapping[str, str],
+                 strict: bool) -> int:
+    """
+    Один потоковый проход по source_path с записью в output_path:
+    в <content> подставляется translations[ключ], если перевод непустой.
+    При strict=True отсутствие любого ключа в файле — MissingContentError,
+    и output_path не изменяется.
+    """
+    from lxml import etree
+
+    replaced = 0
+    index = 0
+    content_depth = 0
+    found = set()
+
+    with span("save.rewrite_xml", path=output_path, updates=len(translations)) as s, \
+            atomic_output(output_path) as f:
+        with etree.xmlfile(f, encoding="utf-8") as xf:
+            xf.write_declaration()
+            open_elements = []
+            context = etree.iterparse(
+                source_path, events=("start", "end"), huge_tree=True, remove_blank_text=True
+            )
+            for event, elem in context:
+                is_content = elem.tag == "content"
+                if event == "start":
+                    if is_content or content_depth:
+                        content_depth += is_content
+                        continue
+                    # Контейнер (contentList и т.п.): открываем его в выходном файле
+                    if open_elements:
+                        xf.write("\n" + INDENT * len(open_elements))
+                    element = xf.element(elem.tag, dict(elem.attrib))
+                    element.__enter__()
+                    open_elements.append(element)
+                    continue
+
+                if is_content:
+                    content_depth -= 1
+                    if content_depth:
+                        continue
+                    key = content_key(elem.get("contentuid"), index)
+                    text = translations.get(key)
+                    if text is not None:
+                        found.add(key)
+                        if text.strip():
+                            set_translated_text(elem, text)
+                            replaced += 1
+                    index += 1
+                    xf.write("\n" + INDENT * len(open_elements))
+                    xf.write(elem, with_tail=False)
+                elif content_depth:
+                    continue
+                else:
+                    xf.write("\n" + INDENT * (len(open_elements) - 1))
+                    open_elements.pop().__exit__(None, None, None)
+
+                # Обработанное больше не нужно: держим в памяти только текущий элемент
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+            del context
+        # Корневой элемент уже закрыт, xmlfile не пишет вне элементов
+        f.write(b"\n")
+
+        s.set("rows", index)
+        s.set("replaced", replaced)
+        if strict and len(found) != len(translations):
+            raise MissingContentError(sorted(set(translations) - found)[:10])
+    return replaced
+
+
+def write_translated_xml(source_path: str, output_path: str, translations: Mapping[str, str]) -> int:
+    """
+    Пишет output_path по исходному файлу source_path, подставляя переводы
+    по ключу contentuid. Возвращает число подставленных переводов.
+    """
+    return _rewrite_xml(source_path, output_path, translations, strict=False)
+
+
+def write_translated_file(source_path: str, output_path: str, translations: Mapping[str, str]) -> int:
+    """write_translated_xml или write_translated_loca — по формату исходника."""
+    if is_loca(source_path):
+        return write_translated_loca(source_path, output_path, translations)
+    return write_translated_xml(source_path, output_path, translations)
+
+
+def patch_translated_xml(path: str, updates: Mapping[str, str]) -> int:
+    """
+    Обновляет в уже существующем переводе только записи из updates.
+    Если каких-то ключей в файле нет, бросает MissingContentError,
+    а файл остаётся прежним.
+    """
+    return _rewrite_xml(path, path, updates, strict=True)